@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+bench_codegen.py
+Full-tree codegen time with one codegen.py process per Ai.xml, as CMake
+runs it, against one codegen.py --batch process fed every file as a job
+(cold, then with a warm model cache). Every mode writes into the same
+output directories, which are compared byte for byte with the per-file
+run together with each file's exit status.
+
+Then the tree is generated again over its own outputs, as an unchanged
+rebuild does, with and without --no-write-if-changed: output files given
+a new modification time are what make and ninja rebuild downstream.
+
+Needs BUILD_ROOT and a PYTHONPATH with the compiled Cheetah templates, as
+codegen.py itself does.
+
+Usage: python3 Autocoders/Python/bench/bench_codegen.py [--root DIR]
+           [--limit N] [--keep]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+CODEGEN = str(Path(__file__).resolve().parent.parent / "bin" / "codegen.py")
+
+
+def find_xml(root):
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        found.extend(
+            os.path.join(dirpath, name)
+            for name in sorted(filenames)
+            if name.endswith("Ai.xml")
+        )
+    return found
+
+
+def jobs_for(xml_files, out_dir):
+    return [
+        {"id": n, "args": ["-b", "-p", os.path.join(out_dir, str(n)), xml]}
+        for n, xml in enumerate(xml_files)
+    ]
+
+
+def fresh_outputs(jobs):
+    for job in jobs:
+        shutil.rmtree(job["args"][2], ignore_errors=True)
+        os.makedirs(job["args"][2])
+
+
+def snapshot(out_dir):
+    files = {}
+    for path in sorted(Path(out_dir).rglob("*")):
+        if path.is_file():
+            files[str(path.relative_to(out_dir))] = path.read_bytes()
+    return files
+
+
+def run_single(jobs, env):
+    statuses = {}
+    for job in jobs:
+        proc = subprocess.run(
+            [sys.executable, CODEGEN] + job["args"],
+            cwd=job["args"][2],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        statuses[job["id"]] = proc.returncode & 0xFF
+    return statuses
+
+
+def run_batch(jobs, env):
+    lines = "".join(json.dumps(dict(job, cwd=job["args"][2])) + "\n" for job in jobs)
+    proc = subprocess.run(
+        [sys.executable, CODEGEN, "--batch", "-"],
+        input=lines,
+        env=env,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    results = [json.loads(line) for line in proc.stdout.splitlines()]
+    return {result["id"]: result["status"] for result in results}
+
+
+def mtimes(out_dir):
+    return {
+        str(path): path.stat().st_mtime_ns
+        for path in Path(out_dir).rglob("*")
+        if path.is_file()
+    }
+
+
+def regenerate(jobs, env, out_dir, extra_args=()):
+    """Seconds and number of output files touched by a batch run over them"""
+    jobs = [dict(job, args=job["args"] + list(extra_args)) for job in jobs]
+    for path in Path(out_dir).rglob("*"):
+        if path.is_file():
+            os.utime(path, ns=(0, 0))
+    start = time.perf_counter()
+    run_batch(jobs, env)
+    seconds = time.perf_counter() - start
+    return seconds, sum(1 for mtime in mtimes(out_dir).values() if mtime)
+
+
+def timed(mode, jobs, env, out_dir):
+    fresh_outputs(jobs)
+    start = time.perf_counter()
+    statuses = mode(jobs, env)
+    return time.perf_counter() - start, statuses, snapshot(out_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument(
+        "--root",
+        default=os.environ.get("BUILD_ROOT", "."),
+        help="Tree to collect *Ai.xml from (def: $BUILD_ROOT)",
+    )
+    parser.add_argument("--limit", type=int, default=0, help="Only the first N files")
+    parser.add_argument("--keep", action="store_true", help="Keep the output tree")
+    args = parser.parse_args()
+
+    xml_files = find_xml(args.root)
+    if args.limit:
+        xml_files = xml_files[: args.limit]
+    work = tempfile.mkdtemp(prefix="bench_codegen_")
+    out_dir = os.path.join(work, "out")
+    jobs = jobs_for(xml_files, out_dir)
+    env = dict(os.environ)
+    # the output directories must lie under a build root for -b
+    env["BUILD_ROOT"] = os.pathsep.join(
+        filter(None, [os.environ.get("BUILD_ROOT"), os.path.realpath(work)])
+    )
+    env.pop("FPRIME_AC_MODEL_CACHE_DIR", None)
+    cached_env = dict(env, FPRIME_AC_MODEL_CACHE_DIR=os.path.join(work, "models"))
+
+    try:
+        single, statuses, files = timed(run_single, jobs, env, out_dir)
+        print(f"{len(jobs)} Ai.xml files under {args.root}")
+        print(
+            f"  {sum(1 for s in statuses.values() if s == 0)} generated, "
+            f"{sum(1 for s in statuses.values() if s)} failed, "
+            f"{len(files)} output files"
+        )
+        print(f"  one process per file    {single:7.2f} s")
+        runs = (
+            ("batch", run_batch, env),
+            ("batch, model cache cold", run_batch, cached_env),
+            ("batch, model cache warm", run_batch, cached_env),
+        )
+        for name, mode, mode_env in runs:
+            seconds, mode_statuses, mode_files = timed(mode, jobs, mode_env, out_dir)
+            same = mode_statuses == statuses and mode_files == files
+            differing = sorted(
+                path
+                for path in set(files) | set(mode_files)
+                if files.get(path) != mode_files.get(path)
+            ) + [
+                f"status of {xml_files[n]}"
+                for n in statuses
+                if statuses[n] != mode_statuses.get(n)
+            ]
+            print(
+                f"  {name:<24}{seconds:7.2f} s  x{single / seconds:5.1f}  "
+                + ("identical" if same else f"DIFFERS: {differing[:5]}")
+            )
+        print("regenerated over unchanged outputs")
+        for name, extra_args in (
+            ("--no-write-if-changed", ["--no-write-if-changed"]),
+            ("write if changed", []),
+        ):
+            seconds, touched = regenerate(jobs, cached_env, out_dir, extra_args)
+            print(
+                f"  {name:<24}{seconds:7.2f} s  "
+                f"{touched} of {len(files)} output files touched"
+            )
+    finally:
+        if args.keep:
+            print(f"outputs kept in {work}")
+        else:
+            shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
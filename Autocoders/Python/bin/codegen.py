@@ -6,7 +6,13 @@
 # from XML definition files.
 #
 # ===============================================================================
+import collections
+import concurrent.futures
+import contextlib
+import copy
 import glob
+import io
+import json
 import logging
 import os
 import sys
@@ -15,7 +21,13 @@ import traceback
 from optparse import OptionParser
 
 # Meta-model for Component only generation
-from fprime_ac.models import CompFactory, PortFactory, Serialize, TopoFactory
+from fprime_ac.models import (
+    CompFactory,
+    ModelParser,
+    PortFactory,
+    Serialize,
+    TopoFactory,
+)
 
 # Parsers to read the XML
 from fprime_ac.parsers import (
@@ -31,14 +43,18 @@ from fprime_ac.utils import (
     EnumGenerator,
     Logger,
     TopDictGenerator,
+    model_cache,
+    output_writer,
+    validator_cache,
 )
+from fprime_ac.utils import buildroot
 from fprime_ac.utils.buildroot import get_build_roots, search_for_file, set_build_roots
 from fprime_ac.utils.version import get_fprime_version, get_project_version
 from lxml import etree
 
 # Generators to produce the code
 try:
-    from fprime_ac.generators import GenFactory
+    from fprime_ac.generators import GenFactory, formatters
 except ImportError as ime:
     print("[ERROR] Cheetah templates need to be generated.\n\t", ime, file=sys.stderr)
     sys.exit(1)
@@ -64,9 +80,6 @@ CONFIG = ConfigManager.ConfigManager.getInstance()
 # Build a default log file name
 SYS_TIME = time.gmtime()
 
-# Deployment name from topology XML only
-DEPLOYMENT = None
-
 # Version label for now
 class Version:
     id = "0.1"
@@ -283,6 +296,60 @@ def pinit():
         action="store_true",
         default=False,
     )
+
+    parser.add_option(
+        "--validation-timing",
+        dest="validation_timing",
+        help="Report XML validator compile and per-file validation time",
+        action="store_true",
+        default=False,
+    )
+
+    parser.add_option(
+        "--no-validator-cache",
+        dest="validator_cache",
+        help="Compile XML validators on every use instead of once per process",
+        action="store_false",
+        default=True,
+    )
+
+    parser.add_option(
+        "--model-cache",
+        dest="model_cache",
+        type="string",
+        help="Directory caching parsed XML models between runs (def: $%s)"
+        % model_cache.CACHE_DIR_ENV,
+        action="store",
+        default=os.environ.get(model_cache.CACHE_DIR_ENV),
+    )
+
+    parser.add_option(
+        "--no-write-if-changed",
+        dest="write_if_changed",
+        help="Rewrite every generated file, also those whose content is unchanged",
+        action="store_false",
+        default=True,
+    )
+
+    parser.add_option(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type="int",
+        help="Generate the XML files in N parallel processes, 0 for one per CPU (def: 1)",
+        action="store",
+        default=1,
+    )
+
+    parser.add_option(
+        "--batch",
+        dest="batch",
+        type="string",
+        metavar="FILE",
+        help="Run the codegen jobs listed as JSON lines in FILE ('-' for stdin) in this process",
+        action="store",
+        default=None,
+    )
     #    author = os.environ['USER']
     #    parser.add_option("-a", "--author", dest="author", type="string",
     #        help="Specify the new FSW author (def: %s)." % author,
@@ -299,6 +366,7 @@ def pinit():
 
 def generate_topology(the_parsed_topology_xml, xml_filename, opt):
     DEBUG.debug(f"Topology xml type description file: {xml_filename}")
+    deployment = the_parsed_topology_xml.get_deployment()
     generator = TopoFactory.TopoFactory.getInstance()
     if not (opt.default_topology_dict or opt.xml_topology_dict):
         generator.set_generate_ID(False)
@@ -369,13 +437,13 @@ def generate_topology(the_parsed_topology_xml, xml_filename, opt):
         #
         if opt.default_topology_dict:
             for build_root in get_build_roots():
-                if not os.path.exists(os.path.join(build_root, DEPLOYMENT)):
+                if not os.path.exists(os.path.join(build_root, deployment)):
                     continue
-                os.environ["DICT_DIR"] = os.path.join(build_root, DEPLOYMENT, "py_dict")
+                os.environ["DICT_DIR"] = os.path.join(build_root, deployment, "py_dict")
                 break
             else:
                 raise FileNotFoundError(
-                    f"{DEPLOYMENT} not found in any of: {get_build_roots()}"
+                    f"{deployment} not found in any of: {get_build_roots()}"
                 )
             dict_dir = os.environ["DICT_DIR"]
             PRINT.info(f"Removing old instanced topology dictionaries in: {dict_dir}")
@@ -439,10 +507,10 @@ def generate_topology(the_parsed_topology_xml, xml_filename, opt):
                 "Ai.xml", "Dictionary.xml"
             )
             PRINT.info(f"Generating XML dictionary {fileName}")
-            fd = open(
-                fileName, "wb"
-            )  # Note: binary forces the same encoding of the source files
-            fd.write(etree.tostring(topology_dict, pretty_print=True))
+            # Note: bytes force the same encoding of the source files
+            output_writer.get_writer().commit(
+                fileName, etree.tostring(topology_dict, pretty_print=True)
+            )
 
     initFiles = generator.create("initFiles")
     # startSource = generator.create("startSource")
@@ -472,8 +540,6 @@ def generate_topology(the_parsed_topology_xml, xml_filename, opt):
 def generate_component_instance_dictionary(
     the_parsed_component_xml, opt, topology_model
 ):
-    global DEPLOYMENT
-
     #
     parsed_port_xml_list = []
     parsed_serializable_xml_list = []
@@ -489,7 +555,7 @@ def generate_component_instance_dictionary(
 
     for port_file in port_type_files_list:
         port_file = search_for_file("Port", port_file)
-        xml_parser_obj = XmlPortsParser.XmlPortsParser(port_file)
+        xml_parser_obj = model_cache.parse(XmlPortsParser.XmlPortsParser, port_file)
         # print xml_parser_obj.get_args()
         parsed_port_xml_list.append(xml_parser_obj)
         del xml_parser_obj
@@ -499,8 +565,8 @@ def generate_component_instance_dictionary(
     )
     for serializable_file in serializable_type_files_list:
         serializable_file = search_for_file("Serializable", serializable_file)
-        xml_parser_obj = XmlSerializeParser.XmlSerializeParser(
-            serializable_file
+        xml_parser_obj = model_cache.parse(
+            XmlSerializeParser.XmlSerializeParser, serializable_file
         )  # Telemetry/Params can only use generated serializable types
         # check to make sure that the serializables don't have things that channels and parameters can't have
         # can't have external non-xml members
@@ -657,7 +723,7 @@ def generate_component(
 
     for port_file in port_type_files_list:
         port_file = search_for_file("Port", port_file)
-        xml_parser_obj = XmlPortsParser.XmlPortsParser(port_file)
+        xml_parser_obj = model_cache.parse(XmlPortsParser.XmlPortsParser, port_file)
         # print xml_parser_obj.get_args()
         parsed_port_xml_list.append(xml_parser_obj)
         del xml_parser_obj
@@ -671,8 +737,8 @@ def generate_component(
     )
     for serializable_file in serializable_type_files_list:
         serializable_file = search_for_file("Serializable", serializable_file)
-        xml_parser_obj = XmlSerializeParser.XmlSerializeParser(
-            serializable_file
+        xml_parser_obj = model_cache.parse(
+            XmlSerializeParser.XmlSerializeParser, serializable_file
         )  # Telemetry/Params can only use generated serializable types
         # check to make sure that the serializables don't have things that channels and parameters can't have
         # can't have external non-xml members
@@ -1173,22 +1239,253 @@ def generate_dependency_file(filename, target_file, subst_path, parser, the_type
     dep_file.close()
 
 
-def main():
+def generate_file(xml_filename, opt, working_dir):
+    """
+    Generates the files of one XML file into working_dir, and its dependency
+    file when requested. Returns True unless the file failed to generate.
+    Uses no module globals and returns to the directory it was called in,
+    so files can be generated in any order and in separate processes.
+    """
+    starting_directory = os.getcwd()
+    os.chdir(working_dir)
+    try:
+        return _generate_file(xml_filename, opt)
+    finally:
+        os.chdir(starting_directory)
+
+
+def _generate_file(xml_filename, opt):
+    ok = True
+    dependency_parser = None
+    xml_type = XmlParser.XmlParser(xml_filename)()
+
+    if xml_type == "component":
+        DEBUG.info("Detected Component XML so Generating Component C++ Files...")
+        the_parsed_component_xml = model_cache.parse(
+            XmlComponentParser.XmlComponentParser, xml_filename
+        )
+        generate_component(
+            the_parsed_component_xml, os.path.basename(xml_filename), opt
+        )
+        dependency_parser = the_parsed_component_xml
+    elif xml_type == "interface":
+        DEBUG.info("Detected Port type XML so Generating Port type C++ Files...")
+        the_parsed_port_xml = model_cache.parse(
+            XmlPortsParser.XmlPortsParser, xml_filename
+        )
+        generate_port(the_parsed_port_xml, os.path.basename(xml_filename))
+        dependency_parser = the_parsed_port_xml
+    elif xml_type == "serializable":
+        DEBUG.info("Detected Serializable XML so Generating Serializable C++ Files...")
+        the_serial_xml = model_cache.parse(
+            XmlSerializeParser.XmlSerializeParser, xml_filename
+        )
+        generate_serializable(the_serial_xml, opt)
+        dependency_parser = the_serial_xml
+    elif xml_type in ("assembly", "deployment"):
+        DEBUG.info("Detected Topology XML so Generating Topology C++ Files...")
+        the_parsed_topology_xml = model_cache.parse(
+            XmlTopologyParser.XmlTopologyParser, xml_filename
+        )
+        print(
+            "Found assembly or deployment named: %s\n"
+            % the_parsed_topology_xml.get_deployment()
+        )
+        generate_topology(the_parsed_topology_xml, os.path.basename(xml_filename), opt)
+        dependency_parser = the_parsed_topology_xml
+    elif xml_type == "enum":
+        DEBUG.info("Detected Enum XML so Generating hpp, cpp, and py files...")
+        curdir = os.getcwd()
+        if EnumGenerator.generate_enum(xml_filename):
+            PRINT.info(f"Completed generating files for {xml_filename} Enum XML....")
+        else:
+            ok = False
+        os.chdir(curdir)
+    elif xml_type == "array":
+        DEBUG.info("Detected Array XML so Generating hpp, cpp, and py files...")
+        curdir = os.getcwd()
+        if ArrayGenerator.generate_array(xml_filename):
+            PRINT.info(f"Completed generating files for {xml_filename} Array XML...")
+        else:
+            ok = False
+        os.chdir(curdir)
+    else:
+        PRINT.info("Invalid XML found...this format not supported")
+        ok = False
+
+    if opt.dependency_file is not None and dependency_parser is not None:
+        if opt.build_root_flag:
+            generate_dependency_file(
+                opt.dependency_file,
+                os.path.basename(xml_filename),
+                list(get_build_roots())[0],
+                dependency_parser,
+                xml_type,
+            )
+    return ok
+
+
+FileResult = collections.namedtuple(
+    "FileResult", ["xml_filename", "ok", "output", "seconds", "written", "unchanged"]
+)
+
+
+def generate_file_job(xml_filename, opt, working_dir):
+    """
+    generate_file() in a worker process of generate_parallel(): set up as
+    main() sets up a codegen process, with the file's output and any
+    exception captured into its FileResult.
+    """
+    start_time = time.perf_counter()
+    output = io.StringIO()
+    ok = False
+    reset_process_state()
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        try:
+            ConfigManager.ConfigManager.getInstance()
+            configure_logging(opt)
+            if opt.build_root_flag:
+                set_build_roots(os.environ.get("BUILD_ROOT"))
+            ok = generate_file(xml_filename, opt, working_dir)
+        except SystemExit as exc:
+            if isinstance(exc.code, str):
+                print(exc.code, file=sys.stderr)
+            ok = not exc.code
+        except Exception as exc:
+            print(exc, file=sys.stderr)
+            traceback.print_exc(file=sys.stdout)
+    writer = output_writer.get_writer()
+    written, unchanged = writer.written, writer.unchanged
+    reset_process_state()
+    return FileResult(
+        xml_filename,
+        ok,
+        output.getvalue(),
+        time.perf_counter() - start_time,
+        written,
+        unchanged,
+    )
+
+
+def generate_parallel(xml_filenames, opt, working_dir):
+    """
+    Generates the XML files in opt.jobs worker processes. Returns their
+    FileResults in xml_filenames order, whatever order they finished in.
+    """
+    jobs = opt.jobs or os.cpu_count()
+    # the dependency file is written for the last XML file only, as the
+    # sequential loop leaves it
+    no_dependency = copy.copy(opt)
+    no_dependency.dependency_file = None
+    last = len(xml_filenames) - 1
+    # files of the same name write the same outputs: they stay in one task,
+    # in order, so the last one wins as it does sequentially
+    groups = collections.OrderedDict()
+    for n, xml_filename in enumerate(xml_filenames):
+        groups.setdefault(os.path.basename(xml_filename), []).append(n)
+    results = [None] * len(xml_filenames)
+    with concurrent.futures.ProcessPoolExecutor(jobs) as pool:
+        futures = [
+            (
+                group,
+                pool.submit(
+                    generate_files_job,
+                    [
+                        (xml_filenames[n], opt if n == last else no_dependency)
+                        for n in group
+                    ],
+                    working_dir,
+                ),
+            )
+            for group in groups.values()
+        ]
+        for group, future in futures:
+            for n, result in zip(group, future.result()):
+                results[n] = result
+    writer = output_writer.get_writer()
+    for result in results:
+        writer.written.extend(result.written)
+        writer.unchanged.extend(result.unchanged)
+    return results
+
+
+def generate_files_job(files, working_dir):
+    return [
+        generate_file_job(xml_filename, opt, working_dir) for xml_filename, opt in files
+    ]
+
+
+def report_results(results):
+    """
+    Writes the captured output of every file, then the per-file timings and
+    the files that failed, all in input order. Returns True if one failed.
+    """
+    for result in results:
+        sys.stdout.write(result.output)
+    PRINT.info("Generation time per file:")
+    for result in results:
+        PRINT.info(
+            "  %8.3f s  %-6s %s"
+            % (result.seconds, "ok" if result.ok else "FAILED", result.xml_filename)
+        )
+    failed = [result.xml_filename for result in results if not result.ok]
+    if failed:
+        PRINT.info(f"ERROR: {len(failed)} of {len(results)} XML files failed:")
+        for xml_filename in failed:
+            PRINT.info(f"  {xml_filename}")
+    return bool(failed)
+
+
+def configure_logging(opt):
+    """
+    Connects the loggers and sets up the validator and model caches and
+    the output writer from the command line options.
+    """
+    log_level = opt.logger.upper()
+    log_level_dict = {
+        "QUIET": None,
+        "DEBUG": logging.DEBUG,
+        "INFO": logging.INFO,
+        "WARNING": logging.WARN,
+        "ERROR": logging.ERROR,
+        "CRITICAL": logging.CRITICAL,
+    }
+
+    if log_level_dict[log_level] is None:
+        stdout_enable = False
+    else:
+        stdout_enable = True
+
+    log_fd = opt.logger_output
+    # For now no log file
+
+    Logger.connectDebugLogger(log_level_dict[log_level], log_fd, stdout_enable)
+    Logger.connectOutputLogger(log_fd)
+    validator_cache.get_cache().enabled = opt.validator_cache
+    model_cache.get_cache().cache_dir = opt.model_cache
+    output_writer.get_writer().enabled = opt.write_if_changed
+
+
+def main(argv=None):
     """
     Main program.
     """
     global ERROR  # prevent local creation of variable
     global VERBOSE  # prevent local creation of variable
     global GEN_TEST_CODE  # indicate if test code should be generated
-    global DEPLOYMENT  # deployment set in topology xml only and used to install new instance dicts
 
     ERROR = False
     # Sets up the initial (singleton) instance
     ConfigManager.ConfigManager.getInstance()
     Parser = pinit()
-    (opt, args) = Parser.parse_args()
+    (opt, args) = Parser.parse_args(argv)
     VERBOSE = opt.verbose_flag
 
+    if opt.batch is not None:
+        if args:
+            Parser.error("--batch takes its XML files from the job list")
+        sys.exit(run_batch(opt.batch))
+
     # Check that the specified working directory exists. Remember, the
     # default working directory is the current working directory which
     # always exists. We are basically only checking for when the user
@@ -1197,7 +1494,7 @@ def main():
     if not os.path.exists(opt.work_path):
         Parser.error(f"Specified path does not exist ({opt.work_path})!")
 
-    working_dir = opt.work_path
+    working_dir = os.path.abspath(opt.work_path)
 
     # Get the current working directory so that we can return to it when
     # the program completes. We always want to return to the place where
@@ -1209,26 +1506,7 @@ def main():
     # print os.getcwd()
 
     # Configure the logging.
-    log_level = opt.logger.upper()
-    log_level_dict = {
-        "QUIET": None,
-        "DEBUG": logging.DEBUG,
-        "INFO": logging.INFO,
-        "WARNING": logging.WARN,
-        "ERROR": logging.ERROR,
-        "CRITICAL": logging.CRITICAL,
-    }
-
-    if log_level_dict[log_level] is None:
-        stdout_enable = False
-    else:
-        stdout_enable = True
-
-    log_fd = opt.logger_output
-    # For now no log file
-
-    Logger.connectDebugLogger(log_level_dict[log_level], log_fd, stdout_enable)
-    Logger.connectOutputLogger(log_fd)
+    configure_logging(opt)
     #
     #  Parse the input Component XML file and create internal meta-model
     #
@@ -1250,75 +1528,18 @@ def main():
         else:
             set_build_roots(os.environ.get("BUILD_ROOT"))
 
-    for xml_filename in xml_filenames:
-
-        xml_type = XmlParser.XmlParser(xml_filename)()
-
-        if xml_type == "component":
-            DEBUG.info("Detected Component XML so Generating Component C++ Files...")
-            the_parsed_component_xml = XmlComponentParser.XmlComponentParser(
-                xml_filename
-            )
-            generate_component(
-                the_parsed_component_xml, os.path.basename(xml_filename), opt
-            )
-            dependency_parser = the_parsed_component_xml
-        elif xml_type == "interface":
-            DEBUG.info("Detected Port type XML so Generating Port type C++ Files...")
-            the_parsed_port_xml = XmlPortsParser.XmlPortsParser(xml_filename)
-            generate_port(the_parsed_port_xml, os.path.basename(xml_filename))
-            dependency_parser = the_parsed_port_xml
-        elif xml_type == "serializable":
-            DEBUG.info(
-                "Detected Serializable XML so Generating Serializable C++ Files..."
-            )
-            the_serial_xml = XmlSerializeParser.XmlSerializeParser(xml_filename)
-            generate_serializable(the_serial_xml, opt)
-            dependency_parser = the_serial_xml
-        elif xml_type in ("assembly", "deployment"):
-            DEBUG.info("Detected Topology XML so Generating Topology C++ Files...")
-            the_parsed_topology_xml = XmlTopologyParser.XmlTopologyParser(xml_filename)
-            DEPLOYMENT = the_parsed_topology_xml.get_deployment()
-            print("Found assembly or deployment named: %s\n" % DEPLOYMENT)
-            generate_topology(
-                the_parsed_topology_xml, os.path.basename(xml_filename), opt
-            )
-            dependency_parser = the_parsed_topology_xml
-        elif xml_type == "enum":
-            DEBUG.info("Detected Enum XML so Generating hpp, cpp, and py files...")
-            curdir = os.getcwd()
-            if EnumGenerator.generate_enum(xml_filename):
-                ERROR = False
-                PRINT.info(
-                    f"Completed generating files for {xml_filename} Enum XML...."
-                )
-            else:
-                ERROR = True
-            os.chdir(curdir)
-        elif xml_type == "array":
-            DEBUG.info("Detected Array XML so Generating hpp, cpp, and py files...")
-            curdir = os.getcwd()
-            if ArrayGenerator.generate_array(xml_filename):
-                ERROR = False
-                PRINT.info(
-                    f"Completed generating files for {xml_filename} Array XML..."
-                )
-            else:
+    if opt.jobs != 1 and len(xml_filenames) > 1:
+        ERROR = report_results(generate_parallel(xml_filenames, opt, working_dir))
+    else:
+        for xml_filename in xml_filenames:
+            if not generate_file(xml_filename, opt, working_dir):
                 ERROR = True
-            os.chdir(curdir)
-        else:
-            PRINT.info("Invalid XML found...this format not supported")
-            ERROR = True
 
-        if opt.dependency_file is not None:
-            if opt.build_root_flag:
-                generate_dependency_file(
-                    opt.dependency_file,
-                    os.path.basename(xml_filename),
-                    list(get_build_roots())[0],
-                    dependency_parser,
-                    xml_type,
-                )
+    if opt.validation_timing:
+        PRINT.info(validator_cache.get_cache().report())
+    if opt.model_cache:
+        DEBUG.info(model_cache.get_cache().report())
+    PRINT.info(output_writer.get_writer().report())
 
     # Always return to directory where we started.
     os.chdir(starting_directory)
@@ -1329,6 +1550,121 @@ def main():
         sys.exit(0)
 
 
+def run_batch(job_file):
+    """
+    Runs codegen jobs one after another in this process, keeping the
+    imported generators and the validator and model caches warm between
+    them. Each line of job_file ('-' reads stdin) is a JSON object:
+
+        {"args": ["-b", "FooComponentAi.xml"], "cwd": "...", "env": {...}, "id": ...}
+
+    where args are the command line of a single-file run and cwd, env and
+    id are optional. A JSON list is taken as args alone. Every job is
+    answered as soon as it finishes by a JSON line on stdout holding its
+    id, exit status, captured output and run time, so a build tool can
+    keep the process open and feed it jobs. Returns 0 when all jobs
+    succeeded.
+    """
+    jobs = sys.stdin if job_file == "-" else open(job_file)
+    responses = sys.stdout
+    failed = 0
+    try:
+        for line in jobs:
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+                if isinstance(job, list):
+                    job = {"args": job}
+                result = run_job(job)
+            except (ValueError, KeyError, TypeError) as exc:
+                result = {
+                    "status": 2,
+                    "output": f"ERROR: Bad job {line.strip()}: {exc}\n",
+                }
+            if result["status"]:
+                failed += 1
+            responses.write(json.dumps(result) + "\n")
+            responses.flush()
+    finally:
+        if jobs is not sys.stdin:
+            jobs.close()
+    return 1 if failed else 0
+
+
+def run_job(job):
+    """
+    Runs main() on one job of run_batch() as a separate codegen process
+    would: from a fresh configuration, factories, build roots and loggers,
+    in the job's directory and environment, with its output captured.
+    """
+    args = [str(arg) for arg in job["args"]]
+    env = {str(key): str(value) for key, value in job.get("env", {}).items()}
+    start_time = time.perf_counter()
+    starting_directory = os.getcwd()
+    saved_env = {key: os.environ.get(key) for key in env}
+    output = io.StringIO()
+    status = 0
+    os.environ.update(env)
+    reset_process_state()
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            try:
+                os.chdir(job.get("cwd", starting_directory))
+                main(args)
+            except SystemExit as exc:
+                if exc.code is None or isinstance(exc.code, int):
+                    status = (exc.code or 0) & 0xFF
+                else:
+                    print(exc.code, file=sys.stderr)
+                    status = 1
+            except Exception as exc:
+                print(exc, file=sys.stderr)
+                traceback.print_exc(file=sys.stdout)
+                status = 0xFF
+    finally:
+        os.chdir(starting_directory)
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        reset_process_state()
+    return {
+        "id": job.get("id"),
+        "status": status,
+        "output": output.getvalue(),
+        "seconds": time.perf_counter() - start_time,
+    }
+
+
+def reset_process_state():
+    """
+    Drops the state a codegen run leaves behind in this process (singletons,
+    build roots, log handlers, globals) so the next batch job starts clean.
+    The validator and model caches are kept: they check their own inputs.
+    """
+    global ERROR, VERBOSE
+    ERROR = False
+    VERBOSE = False
+    output_writer.get_writer().reset_stats()
+    for singleton in (
+        ConfigManager.ConfigManager,
+        CompFactory.CompFactory,
+        PortFactory.PortFactory,
+        TopoFactory.TopoFactory,
+        ModelParser.ModelParser,
+        formatters.Formatters,
+    ):
+        setattr(singleton, f"_{singleton.__name__}__instance", None)
+    buildroot.BUILD_ROOTS = set()
+    for name in ("output", "debug"):
+        logger = logging.getLogger(name)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+
+
 if __name__ == "__main__":
     try:
         main()
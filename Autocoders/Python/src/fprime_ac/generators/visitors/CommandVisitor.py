@@ -31,7 +31,7 @@ from fprime_ac.models import Command, Parameter
 #
 # from Cheetah import Template
 # from fprime_ac.utils import version
-from fprime_ac.utils import ConfigManager, DictTypeConverter
+from fprime_ac.utils import ConfigManager, DictTypeConverter, output_writer
 
 #
 # Import precompiled templates here
@@ -107,7 +107,7 @@ class CommandVisitor(AbstractVisitor.AbstractVisitor):
 
             if len(obj.get_opcodes()) == 1:
                 pyfile = "{}/{}.py".format(output_dir, obj.get_mnemonic())
-                fd = open(pyfile, "w")
+                fd = output_writer.open_output(pyfile)
                 if fd is None:
                     raise Exception(f"Could not open {pyfile} file.")
                 self.__fp1.append(fd)
@@ -117,7 +117,7 @@ class CommandVisitor(AbstractVisitor.AbstractVisitor):
                     pyfile = "%s/%s_%d.py" % (output_dir, obj.get_mnemonic(), inst)
                     inst += 1
                     DEBUG.info(f"Open file: {pyfile}")
-                    fd = open(pyfile, "w")
+                    fd = output_writer.open_output(pyfile)
                     if fd is None:
                         raise Exception(f"Could not open {pyfile} file.")
                     DEBUG.info(f"Completed {pyfile} open")
@@ -133,13 +133,13 @@ class CommandVisitor(AbstractVisitor.AbstractVisitor):
                 if len(obj.get_set_opcodes()) != len(obj.get_save_opcodes()):
                     raise Exception("set/save opcode quantities do not match!")
                 pyfile = "{}/{}_PRM_SET.py".format(output_dir, self.__stem)
-                fd = open(pyfile, "w")
+                fd = output_writer.open_output(pyfile)
                 if fd is None:
                     raise Exception(f"Could not open {pyfile} file.")
                 self.__fp1.append(fd)
 
                 pyfile = "{}/{}_PRM_SAVE.py".format(output_dir, self.__stem)
-                fd = open(pyfile, "w")
+                fd = output_writer.open_output(pyfile)
                 if fd is None:
                     raise Exception(f"Could not open {pyfile} file.")
                 self.__fp2.append(fd)
@@ -148,7 +148,7 @@ class CommandVisitor(AbstractVisitor.AbstractVisitor):
                 for opcode in obj.get_set_opcodes():
                     pyfile = "%s/%s_%d_PRM_SET.py" % (output_dir, self.__stem, inst)
                     DEBUG.info(f"Open file: {pyfile}")
-                    fd = open(pyfile, "w")
+                    fd = output_writer.open_output(pyfile)
                     if fd is None:
                         raise Exception(f"Could not open {pyfile} file.")
                     self.__fp1.append(fd)
@@ -156,7 +156,7 @@ class CommandVisitor(AbstractVisitor.AbstractVisitor):
 
                     pyfile = "%s/%s_%d_PRM_SAVE.py" % (output_dir, self.__stem, inst)
                     DEBUG.info(f"Open file: {pyfile}")
-                    fd = open(pyfile, "w")
+                    fd = output_writer.open_output(pyfile)
                     if fd is None:
                         raise Exception(f"Could not open {pyfile} file.")
                     self.__fp2.append(fd)
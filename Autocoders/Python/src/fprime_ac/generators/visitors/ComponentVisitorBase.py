@@ -27,7 +27,7 @@ from fprime_ac.models import ModelParser
 #
 # Python extension modules and custom interfaces
 #
-from fprime_ac.utils import ConfigManager
+from fprime_ac.utils import ConfigManager, output_writer
 
 #
 # Global logger init. below.
@@ -864,7 +864,7 @@ class ComponentVisitorBase(AbstractVisitor.AbstractVisitor):
         Open the file for writing
         """
         DEBUG.info("Open file: %s" % filename)
-        self.__fp = open(filename, "w")
+        self.__fp = output_writer.open_output(filename)
         if self.__fp is None:
             raise Exception("Could not open file %s") % filename
         DEBUG.info("Completed")
@@ -30,7 +30,7 @@ from fprime_ac.generators.visitors import AbstractVisitor
 #
 # from Cheetah import Template
 # from fprime_ac.utils import version
-from fprime_ac.utils import ConfigManager, DictTypeConverter
+from fprime_ac.utils import ConfigManager, DictTypeConverter, output_writer
 
 #
 # Import precompiled templates here
@@ -100,7 +100,7 @@ class EventVisitor(AbstractVisitor.AbstractVisitor):
 
         if len(obj.get_ids()) == 1:
             pyfile = "{}/{}.py".format(output_dir, obj.get_name())
-            fd = open(pyfile, "w")
+            fd = output_writer.open_output(pyfile)
             if fd is None:
                 raise Exception(f"Could not open {pyfile} file.")
             self.__fp.append(fd)
@@ -110,7 +110,7 @@ class EventVisitor(AbstractVisitor.AbstractVisitor):
                 pyfile = "%s/%s_%d.py" % (output_dir, obj.get_name(), inst)
                 inst += 1
                 DEBUG.info(f"Open file: {pyfile}")
-                fd = open(pyfile, "w")
+                fd = output_writer.open_output(pyfile)
                 if fd is None:
                     raise Exception(f"Could not open {pyfile} file.")
                 DEBUG.info(f"Completed {pyfile} open")
@@ -31,7 +31,7 @@ from fprime_ac.models import Command, Parameter
 #
 # from Cheetah import Template
 # from fprime_ac.utils import version
-from fprime_ac.utils import ConfigManager, DictTypeConverter
+from fprime_ac.utils import ConfigManager, DictTypeConverter, output_writer
 
 #
 # Import precompiled templates here
@@ -97,7 +97,7 @@ class InstanceCommandVisitor(AbstractVisitor.AbstractVisitor):
         if not (os.path.isdir(output_dir)):
             os.makedirs(output_dir)
             init_file = os.path.join(output_dir, "__init__.py")
-            open(init_file, "w+").close()
+            output_writer.open_output(init_file).close()
 
         try:
             instance_obj_list = topology_model.get_base_id_dict()[
@@ -137,7 +137,7 @@ class InstanceCommandVisitor(AbstractVisitor.AbstractVisitor):
                     fname = "{}_{}".format(instance_obj[0], obj.get_mnemonic())
                 pyfile = "{}/{}.py".format(output_dir, fname)
                 DEBUG.info("Open file: {}".format(pyfile))
-                fd = open(pyfile, "w")
+                fd = output_writer.open_output(pyfile)
                 if fd is None:
                     raise Exception("Could not open {} file.".format(pyfile))
                 DEBUG.info("Completed {} open".format(pyfile))
@@ -163,7 +163,7 @@ class InstanceCommandVisitor(AbstractVisitor.AbstractVisitor):
                     fname = "{}_{}".format(instance_obj[0], self.__stem)
                 pyfile = "{}/{}_PRM_SET.py".format(output_dir, fname)
                 DEBUG.info("Open file: {}".format(pyfile))
-                fd = open(pyfile, "w")
+                fd = output_writer.open_output(pyfile)
                 if fd is None:
                     raise Exception("Could not open {} file.".format(pyfile))
                 self.__fp1[fname] = fd
@@ -171,7 +171,7 @@ class InstanceCommandVisitor(AbstractVisitor.AbstractVisitor):
 
                 pyfile = "{}/{}_PRM_SAVE.py".format(output_dir, fname)
                 DEBUG.info("Open file: {}".format(pyfile))
-                fd = open(pyfile, "w")
+                fd = output_writer.open_output(pyfile)
                 if fd is None:
                     raise Exception("Could not open {} file.".format(pyfile))
                 self.__fp2[fname] = fd
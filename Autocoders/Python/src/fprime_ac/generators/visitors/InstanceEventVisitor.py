@@ -30,7 +30,7 @@ from fprime_ac.generators.visitors import AbstractVisitor
 #
 # from Cheetah import Template
 # from fprime_ac.utils import version
-from fprime_ac.utils import ConfigManager, DictTypeConverter
+from fprime_ac.utils import ConfigManager, DictTypeConverter, output_writer
 
 #
 # Import precompiled templates here
@@ -95,7 +95,7 @@ class InstanceEventVisitor(AbstractVisitor.AbstractVisitor):
         if not (os.path.isdir(output_dir)):
             os.makedirs(output_dir)
             init_file = os.path.join(output_dir, "__init__.py")
-            open(init_file, "w+").close()
+            output_writer.open_output(init_file).close()
 
         self.__fp = {}
 
@@ -126,7 +126,7 @@ class InstanceEventVisitor(AbstractVisitor.AbstractVisitor):
 
             pyfile = "{}/{}.py".format(output_dir, fname)
             DEBUG.info("Open file: {}".format(pyfile))
-            fd = open(pyfile, "w")
+            fd = output_writer.open_output(pyfile)
             if fd is None:
                 raise Exception("Could not open {} file.".format(pyfile))
             DEBUG.info("Completed {} open".format(pyfile))
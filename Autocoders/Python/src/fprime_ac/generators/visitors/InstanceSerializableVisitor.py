@@ -30,7 +30,7 @@ from fprime_ac.generators.visitors import AbstractVisitor
 #
 # from Cheetah import Template
 # from fprime_ac.utils import version
-from fprime_ac.utils import ConfigManager, DictTypeConverter
+from fprime_ac.utils import ConfigManager, DictTypeConverter, output_writer
 
 #
 # Import precompiled templates here
@@ -184,11 +184,11 @@ class InstanceSerializableVisitor(AbstractVisitor.AbstractVisitor):
         pyfile = output_dir + "/" + obj.get_name() + ".py"
 
         # make empty __init__.py
-        open("{}/{}".format(output_dir, "__init__.py"), "w").close()
+        output_writer.open_output("{}/{}".format(output_dir, "__init__.py")).close()
 
         # Open file for writing here...
         DEBUG.info(f"Open file: {pyfile}")
-        self.__fp = open(pyfile, "w")
+        self.__fp = output_writer.open_output(pyfile)
         if self.__fp is None:
             raise Exception("Could not open %s file.") % pyfile
         DEBUG.info("Completed")
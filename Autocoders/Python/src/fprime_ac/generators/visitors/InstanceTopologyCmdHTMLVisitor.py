@@ -29,7 +29,7 @@ from fprime_ac.models import ModelParser
 #
 # from Cheetah import Template
 # from fprime_ac.utils import version
-from fprime_ac.utils import ConfigManager
+from fprime_ac.utils import ConfigManager, output_writer
 
 #
 # Import precompiled templates here
@@ -114,7 +114,7 @@ class InstanceTopologyCmdHTMLVisitor(AbstractVisitor.AbstractVisitor):
                     # Open file for writing here...
                     DEBUG.info("Open file: %s" % filename)
                     try:
-                        self.__fp_dict[name] = open(filename, "w")
+                        self.__fp_dict[name] = output_writer.open_output(filename)
                         DEBUG.info("Completed")
                     except OSError:
                         PRINT.info("Could not open %s file." % filename)
@@ -28,7 +28,7 @@ from fprime_ac.models import ModelParser
 #
 # from Cheetah import Template
 # from fprime_ac.utils import version
-from fprime_ac.utils import ConfigManager
+from fprime_ac.utils import ConfigManager, output_writer
 
 #
 # Import precompiled templates here
@@ -127,7 +127,7 @@ class InstanceTopologyCppVisitor(AbstractVisitor.AbstractVisitor):
             #
             # Open file for writing here...
             DEBUG.info("Open file: %s" % filename)
-            self.__fp = open(filename, "w")
+            self.__fp = output_writer.open_output(filename)
             if self.__fp is None:
                 raise Exception("Could not open %s file.") % filename
             DEBUG.info("Completed")
@@ -27,7 +27,7 @@ from fprime_ac.generators.visitors import AbstractVisitor
 #
 # from Cheetah import Template
 # from fprime_ac.utils import version
-from fprime_ac.utils import ConfigManager, TypesList
+from fprime_ac.utils import ConfigManager, TypesList, output_writer
 
 #
 # Import precompiled templates here
@@ -194,7 +194,7 @@ class PortCppVisitor(AbstractVisitor.AbstractVisitor):
 
         # Open file for writing here...
         DEBUG.info("Open file: %s" % filename)
-        self.__fp = open(filename, "w")
+        self.__fp = output_writer.open_output(filename)
         if self.__fp is None:
             raise Exception("Could not open %s file.") % filename
         DEBUG.info("Completed")
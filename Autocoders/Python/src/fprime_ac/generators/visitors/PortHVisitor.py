@@ -29,7 +29,7 @@ from fprime_ac.generators.visitors import AbstractVisitor
 #
 # from Cheetah import Template
 # from fprime_ac.utils import version
-from fprime_ac.utils import ConfigManager, TypesList
+from fprime_ac.utils import ConfigManager, TypesList, output_writer
 
 #
 # Import precompiled templates here
@@ -254,7 +254,7 @@ class PortHVisitor(AbstractVisitor.AbstractVisitor):
 
         # Open file for writing here...
         DEBUG.info("Open file: %s" % filename)
-        self.__fp = open(filename, "w")
+        self.__fp = output_writer.open_output(filename)
         if self.__fp is None:
             raise Exception("Could not open %s file.") % filename
         DEBUG.info("Completed")
@@ -22,12 +22,12 @@ import os
 import sys
 
 from fprime_ac.parsers import XmlParser
-from fprime_ac.utils import ConfigManager
+from fprime_ac.utils import ConfigManager, validator_cache
 from fprime_ac.utils.exceptions import (
     FprimeRngXmlValidationException,
     FprimeXmlException,
 )
-from lxml import etree, isoschematron
+from lxml import etree
 
 #
 # Python extension modules and custom interfaces
@@ -105,10 +105,9 @@ class XmlArrayParser(object):
         fd.close()  # Close the file, which is only used for the parsing above
 
         # Validate against current schema. if more are imported later in the process, they will be reevaluated
-        relax_file_handler = open(ROOTDIR + self.Config.get("schema", "array"), "r")
-        relax_parsed = etree.parse(relax_file_handler)
-        relax_file_handler.close()
-        relax_compiled = etree.RelaxNG(relax_parsed)
+        relax_compiled = validator_cache.get_validator(
+            "schema", ROOTDIR + self.Config.get("schema", "array")
+        )
 
         # 2/3 conversion
         if not relax_compiled.validate(element_tree):
@@ -187,16 +186,10 @@ class XmlArrayParser(object):
             )
             raise FprimeXmlException(msg)
 
-        # Create proper xml validator tool
-        validator_file_handler = open(
-            ROOTDIR + self.Config.get(validator_type, validator_name), "r"
+        # Compiled validator, shared by every parser in this process
+        validator_compiled = validator_cache.get_validator(
+            validator_type, ROOTDIR + self.Config.get(validator_type, validator_name)
         )
-        validator_parsed = etree.parse(validator_file_handler)
-        validator_file_handler.close()
-        if validator_type == "schema":
-            validator_compiled = etree.RelaxNG(validator_parsed)
-        elif validator_type == "schematron":
-            validator_compiled = isoschematron.Schematron(validator_parsed)
 
         # Validate XML file
         if not validator_compiled.validate(parsed_xml_tree):
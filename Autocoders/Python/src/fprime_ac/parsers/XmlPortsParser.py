@@ -20,7 +20,7 @@ import logging
 import os
 import sys
 
-from fprime_ac.utils import ConfigManager
+from fprime_ac.utils import ConfigManager, validator_cache
 from fprime_ac.utils.exceptions import FprimeRngXmlValidationException
 from lxml import etree
 
@@ -75,10 +75,9 @@ class XmlPortsParser:
         fd.close()  # Close the file, which is only used for the parsing above
 
         # Validate against schema
-        relax_file_handler = open(ROOTDIR + self.__config.get("schema", "interface"))
-        relax_parsed = etree.parse(relax_file_handler)
-        relax_file_handler.close()
-        relax_compiled = etree.RelaxNG(relax_parsed)
+        relax_compiled = validator_cache.get_validator(
+            "schema", ROOTDIR + self.__config.get("schema", "interface")
+        )
 
         # 2/3 conversion
         if not relax_compiled.validate(element_tree):
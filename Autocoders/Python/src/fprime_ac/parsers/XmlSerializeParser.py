@@ -21,7 +21,7 @@ import logging
 import os
 import sys
 
-from fprime_ac.utils import ConfigManager
+from fprime_ac.utils import ConfigManager, validator_cache
 from fprime_ac.utils.buildroot import (
     BuildRootCollisionException,
     BuildRootMissingException,
@@ -116,10 +116,7 @@ class XmlSerializeParser:
                 str(bre),
             )
             raise OSError(stri)
-        file_handler = open(rng_file)
-        relax_parsed = etree.parse(file_handler)
-        file_handler.close()
-        relax_compiled = etree.RelaxNG(relax_parsed)
+        relax_compiled = validator_cache.get_validator("schema", rng_file)
 
         # 2/3 conversion
         if not relax_compiled.validate(element_tree):
@@ -17,6 +17,7 @@ import sys
 
 from fprime_ac.generators.templates.arrays import array_cpp, array_hpp
 from fprime_ac.parsers import XmlArrayParser, XmlParser
+from fprime_ac.utils import output_writer
 
 
 def open_file(name, type):
@@ -36,7 +37,7 @@ def open_file(name, type):
     else:
         filename = name + "ArrayAc." + type
     #
-    fp = open(filename, "w")
+    fp = output_writer.open_output(filename)
     return fp
 
 
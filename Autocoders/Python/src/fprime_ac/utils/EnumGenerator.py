@@ -15,6 +15,7 @@
 import sys
 
 from fprime_ac.parsers import XmlEnumParser, XmlParser
+from fprime_ac.utils import output_writer
 
 try:
     from fprime_ac.generators.templates.enums import enum_cpp, enum_hpp
@@ -29,7 +30,7 @@ def open_file(name, type):
     """
 
     filename = name + "EnumAc." + type
-    fp = open(filename, "w")
+    fp = output_writer.open_output(filename)
     if fp is None:
         print("Could not open file %s" % filename)
         sys.exit(-1)
@@ -0,0 +1,48 @@
+"""
+fprime_ac.utils.cache_files:
+
+File helpers shared by the validator and model caches.
+
+write_atomic() stores a cache file under a temporary name and renames it
+into place, so concurrent codegen processes never read a partial file.
+signature() identifies the version of a set of input files by modification
+time and size without reading them.
+"""
+import logging
+import os
+import tempfile
+
+DEBUG = logging.getLogger("debug")
+
+
+def write_atomic(directory, path, data):
+    """
+    Writes data (bytes) to path inside directory, creating the directory.
+    Returns False, logging why, when the file could not be written.
+    """
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError as exc:
+        DEBUG.debug("Could not write %s: %s" % (path, exc))
+        return False
+    return True
+
+
+def signature(files):
+    """
+    ((path, mtime_ns, size), ...) of files, which may also be the entries
+    of a previous signature; a missing file has None for both.
+    """
+    entries = []
+    for entry in files:
+        name = entry if isinstance(entry, str) else entry[0]
+        try:
+            stat = os.stat(name)
+            entries.append((name, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            entries.append((name, None, None))
+    return tuple(entries)
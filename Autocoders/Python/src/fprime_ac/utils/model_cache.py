@@ -0,0 +1,269 @@
+"""
+fprime_ac.utils.model_cache:
+
+Persistent cache of parsed XML models for codegen.py.
+
+Parsing and validating a component, port, serializable or topology XML is
+most of the work of a codegen run, and the same port and serializable XMLs
+are parsed again by every component importing them. The cache pickles each
+parser object after construction and loads it back on later runs instead.
+
+An entry is found by content, not by path or time: its name hashes the
+parser class, the SHA-1 of the XML file, the schema files, the autocoder
+sources, the configuration and the build roots. Files read during parsing
+other than the XML itself (imported dictionaries, the constants file, the
+component XMLs of a topology) are stored in the entry with their own
+hashes and checked on load, so editing one of them also forces a re-parse.
+
+Only the XML files are hashed on every run. The digest of the schemas and
+sources is remembered in the cache directory and recomputed when one of
+them changes modification time or size.
+
+The cache directory comes from FPRIME_AC_MODEL_CACHE_DIR or the
+--model-cache option of codegen.py; without one nothing is cached.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import pickle
+import sys
+import time
+
+from fprime_ac.utils import ConfigManager
+from fprime_ac.utils.buildroot import get_build_roots
+from fprime_ac.utils.cache_files import signature, write_atomic
+
+DEBUG = logging.getLogger("debug")
+
+CACHE_DIR_ENV = "FPRIME_AC_MODEL_CACHE_DIR"
+
+# Bumped when the entry layout changes
+FORMAT = 1
+
+ROOTDIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "..")
+AC_DIR = os.path.join(os.path.dirname(__file__), "..")
+# (directory, suffix) of the schemas and sources a parsed model depends on
+VERSION_FILES = (
+    (os.path.join(ROOTDIR, "Autocoders", "Python", "schema"), ".rng"),
+    (os.path.join(AC_DIR, "parsers"), ".py"),
+    (os.path.join(AC_DIR, "utils"), ".py"),
+)
+
+
+class _Pickler(pickle.Pickler):
+    """Stores the ConfigManager singleton by reference instead of by value"""
+
+    def persistent_id(self, obj):
+        if obj is ConfigManager.ConfigManager.getInstance():
+            return "ConfigManager"
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        if pid == "ConfigManager":
+            return ConfigManager.ConfigManager.getInstance()
+        raise pickle.UnpicklingError("Unknown persistent id %s" % pid)
+
+
+class ModelCache:
+    """
+    Parsed models stored in cache_dir, see the module docstring. Without a
+    cache_dir, or when disabled, parse() just constructs the parser.
+    """
+
+    def __init__(self, cache_dir=None, enabled=True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        # (ConfigManager instance, digest) of the environment it was taken in
+        self._environment = None
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.parse_time = 0.0
+        self.load_time = 0.0
+
+    def parse(self, parser_class, xml_file):
+        """parser_class(xml_file), loaded from the cache when up to date"""
+        if not (self.enabled and self.cache_dir) or not os.path.isfile(xml_file):
+            return parser_class(xml_file)
+        start = time.perf_counter()
+        path = self._entry_path(parser_class, xml_file)
+        parser = self._load(path)
+        if parser is not None:
+            self.hits += 1
+            self.load_time += time.perf_counter() - start
+            return parser
+
+        start = time.perf_counter()
+        parser = parser_class(xml_file)
+        self.parse_time += time.perf_counter() - start
+        self.misses += 1
+        self._store(path, parser)
+        return parser
+
+    def report(self):
+        return "Model cache: %d loaded (%.1f ms), %d parsed (%.1f ms), %d stale" % (
+            self.hits,
+            self.load_time * 1e3,
+            self.misses,
+            self.parse_time * 1e3,
+            self.stale,
+        )
+
+    def _environment_digest(self):
+        # schemas, autocoder sources and configuration do not change within
+        # a run; their digest is also kept in the cache directory against
+        # the files' modification times and sizes so that each codegen
+        # process does not read them all again. A new ConfigManager (the
+        # next codegen --batch job, possibly with other settings) takes it
+        # again.
+        config = ConfigManager.ConfigManager.getInstance()
+        if self._environment is None or self._environment[0] is not config:
+            files = [
+                name
+                for top, suffix in VERSION_FILES
+                for name in _tree_files(top, suffix)
+            ]
+            settings = repr(
+                [
+                    (section, config.items(section, raw=True))
+                    for section in sorted(config.sections())
+                ]
+            )
+            versions = (FORMAT, sys.version, settings, signature(files))
+            memo = os.path.join(self.cache_dir, "environment.pickle")
+            try:
+                with open(memo, "rb") as f:
+                    stored, digest = pickle.load(f)
+                if stored == versions:
+                    self._environment = (config, digest)
+                    return digest
+            except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+                pass
+            digest = hashlib.sha1(
+                ("%d\0%s\0%s\0" % (FORMAT, sys.version, settings)).encode()
+            )
+            for name in files:
+                digest.update(name.encode() + b"\0")
+                digest.update((_file_digest(name) or "").encode())
+            self._environment = (config, digest.hexdigest())
+            write_atomic(
+                self.cache_dir, memo, pickle.dumps((versions, digest.hexdigest()))
+            )
+        return self._environment[1]
+
+    def _entry_path(self, parser_class, xml_file):
+        digest = hashlib.sha1(self._environment_digest().encode())
+        digest.update(
+            (
+                "%s.%s\0%s\0%s\0"
+                % (
+                    parser_class.__module__,
+                    parser_class.__name__,
+                    os.path.basename(xml_file),
+                    os.pathsep.join(sorted(get_build_roots())),
+                )
+            ).encode()
+        )
+        digest.update(_file_digest(xml_file).encode())
+        name = os.path.splitext(os.path.basename(xml_file))[0]
+        return os.path.join(self.cache_dir, "%s-%s.pickle" % (name, digest.hexdigest()))
+
+    def _load(self, path):
+        try:
+            with open(path, "rb") as f:
+                dependencies, parser = _Unpickler(f).load()
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            DEBUG.debug("Ignoring cached model %s: %s" % (path, exc))
+            return None
+        for name, digest in dependencies:
+            if _file_digest(name) != digest:
+                DEBUG.debug("Cached model %s is stale: %s changed" % (path, name))
+                self.stale += 1
+                return None
+        return parser
+
+    def _store(self, path, parser):
+        buffer = io.BytesIO()
+        try:
+            _Pickler(buffer, pickle.HIGHEST_PROTOCOL).dump(
+                (_dependencies(parser), parser)
+            )
+        except (pickle.PicklingError, TypeError, AttributeError) as exc:
+            DEBUG.debug("Model of %s cannot be cached: %s" % (path, exc))
+            return
+        write_atomic(self.cache_dir, path, buffer.getvalue())
+
+
+def _tree_files(top, suffix):
+    files = []
+    for dirpath, dirnames, filenames in os.walk(top):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.endswith(suffix):
+                files.append(os.path.join(dirpath, name))
+    return files
+
+
+def _file_digest(name):
+    """SHA-1 of a file's contents, None when it does not exist"""
+    try:
+        with open(name, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _located(item):
+    """
+    Every path a BUILD_ROOT relative item may be located at: one appearing
+    or disappearing changes what the parser would find
+    """
+    return [os.path.join(build, item) for build in sorted(get_build_roots())]
+
+
+def _dependencies(parser):
+    """(path, digest) of the files besides the XML itself a parser read"""
+    files = []
+    if hasattr(parser, "get_imported_dictionary_files"):
+        files.extend(_component_files(parser))
+    if hasattr(parser, "get_component_includes"):
+        for item in parser.get_component_includes():
+            files.extend(_located(item))
+        for instance in parser.get_instances():
+            if instance.get_comp_xml() is not None:
+                files.extend(_component_files(instance.get_comp_xml()))
+    return [(name, _file_digest(name)) for name in sorted(set(files))]
+
+
+def _component_files(parser):
+    constants_file = ConfigManager.ConfigManager.getInstance().get(
+        "constants", "constants_file"
+    )
+    if not os.path.isabs(constants_file):
+        constants_file = os.path.join(ROOTDIR, constants_file)
+    files = [constants_file]
+    for item in parser.get_imported_dictionary_files():
+        files.extend(_located(item))
+    return files
+
+
+_CACHE = None
+
+
+def get_cache():
+    """The process-wide ModelCache, created on first use"""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = ModelCache(os.environ.get(CACHE_DIR_ENV) or None)
+    return _CACHE
+
+
+def parse(parser_class, xml_file):
+    """parser_class(xml_file) through the process-wide cache"""
+    return get_cache().parse(parser_class, xml_file)
@@ -0,0 +1,99 @@
+"""
+fprime_ac.utils.output_writer:
+
+Write-if-changed output files for the generators.
+
+open_output() stands in for open(filename, "w") on generated files. The
+returned file collects everything written into memory and on close()
+compares it with the file already on disk: an identical file is left
+alone, keeping its modification time, so make/ninja do not rebuild what
+includes it. Only changed or new files are written.
+
+Counts of written and unchanged files are kept per process; report()
+summarizes them.
+"""
+
+import io
+import logging
+import os
+
+DEBUG = logging.getLogger("debug")
+
+
+class OutputFile(io.StringIO):
+    """
+    In-memory text file written through to path on close(), unless path
+    already holds the same text.
+    """
+
+    def __init__(self, writer, path):
+        super().__init__()
+        self.writer = writer
+        self.path = path
+
+    def close(self):
+        if not self.closed:
+            self.writer.commit(self.path, self.getvalue())
+        super().close()
+
+
+class OutputWriter:
+    """Opens generated files and counts which of them changed"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.written = []
+        self.unchanged = []
+
+    def open(self, path):
+        # resolved now: generators may change directory before closing
+        path = os.path.abspath(path)
+        if not self.enabled:
+            self.written.append(path)
+            return open(path, "w")
+        return OutputFile(self, path)
+
+    def commit(self, path, data):
+        """
+        Writes data (str or bytes) to path unless path already holds it.
+        Returns True if the file was written.
+        """
+        mode = "b" if isinstance(data, bytes) else ""
+        if self.enabled:
+            try:
+                with open(path, "r" + mode) as existing:
+                    if existing.read() == data:
+                        DEBUG.debug("Unchanged, not written: %s" % path)
+                        self.unchanged.append(path)
+                        return False
+            except (OSError, UnicodeDecodeError):
+                pass
+        with open(path, "w" + mode) as output:
+            output.write(data)
+        self.written.append(path)
+        return True
+
+    def report(self):
+        return "Generated files: %d written, %d unchanged and not rewritten" % (
+            len(self.written),
+            len(self.unchanged),
+        )
+
+
+_WRITER = None
+
+
+def get_writer():
+    """The process-wide OutputWriter, created on first use"""
+    global _WRITER
+    if _WRITER is None:
+        _WRITER = OutputWriter()
+    return _WRITER
+
+
+def open_output(path):
+    """Generated file at path, written on close() only if its content changed"""
+    return get_writer().open(path)
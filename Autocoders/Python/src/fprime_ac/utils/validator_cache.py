@@ -0,0 +1,208 @@
+"""
+fprime_ac.utils.validator_cache:
+
+Process-wide cache of compiled XML validators for the fprime_ac parsers.
+
+Every parser validates each XML file against a RelaxNG schema and a few
+ISO Schematron rule sets. Compiling them (Schematron in particular, which
+runs three XSLT passes to build its validating stylesheet) costs far more
+than validating a file, so each validator is compiled once per process and
+reused while neither its file nor any file it includes has changed
+(modification time and size).
+
+With FPRIME_AC_VALIDATOR_CACHE_DIR set, the validating stylesheet of every
+Schematron rule set is also stored there and reloaded by later processes.
+RelaxNG schemas have no serialized compiled form and compile from source
+once per process.
+
+Validation time is recorded per XML file; report() summarizes it.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+
+from fprime_ac.utils.cache_files import signature, write_atomic
+from lxml import etree, isoschematron
+
+DEBUG = logging.getLogger("debug")
+
+CACHE_DIR_ENV = "FPRIME_AC_VALIDATOR_CACHE_DIR"
+
+RNG_NS = "{http://relaxng.org/ns/structure/1.0}"
+SCH_NS = "{http://purl.oclc.org/dsdl/schematron}"
+
+
+class _StoredSchematron(isoschematron.Schematron):
+    """
+    Schematron validator rebuilt from a stored validating stylesheet,
+    skipping the include/expand/compile passes of isoschematron.Schematron.
+    """
+
+    def __init__(self, validator_xslt):
+        etree._Validator.__init__(self)
+        self._store_report = False
+        self._schematron = None
+        self._validator_xslt = validator_xslt
+        self._validation_report = None
+        self._validator = etree.XSLT(validator_xslt)
+
+
+class TimedValidator:
+    """
+    Compiled validator that records how long each validate() takes, per
+    validated file, in its cache.
+    """
+
+    def __init__(self, cache, validator_type, path, validator):
+        self.cache = cache
+        self.validator_type = validator_type
+        self.path = path
+        self.validator = validator
+
+    @property
+    def error_log(self):
+        return self.validator.error_log
+
+    def validate(self, tree):
+        start = time.perf_counter()
+        valid = self.validator.validate(tree)
+        self.cache.record(tree, time.perf_counter() - start)
+        return valid
+
+    __call__ = validate
+
+
+class ValidatorCache:
+    """
+    Compiled validators keyed by validator type and real path, see the
+    module docstring. A disabled cache compiles on every lookup, as the
+    parsers did before it existed, and still records timing.
+    """
+
+    def __init__(self, cache_dir=None, enabled=True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self._validators = {}
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.compile_time = 0.0
+        self.validate_time = 0.0
+        self.files = {}  # XML file -> [validations, seconds]
+
+    def get(self, validator_type, path):
+        """TimedValidator for validator_type ("schema" or "schematron") at path"""
+        path = os.path.realpath(path)
+        key = (validator_type, path)
+        with self._lock:
+            entry = self._validators.get(key)
+            if entry is not None and self.enabled:
+                stored, validator = entry
+                if signature(stored) == stored:
+                    self.hits += 1
+                    return validator
+            start = time.perf_counter()
+            validator, files = self._compile(validator_type, path)
+            self.compile_time += time.perf_counter() - start
+            self.misses += 1
+            timed = TimedValidator(self, validator_type, path, validator)
+            if self.enabled:
+                self._validators[key] = (signature(files), timed)
+            return timed
+
+    def record(self, tree, seconds):
+        name = tree.docinfo.URL or "<tree>"
+        with self._lock:
+            self.validate_time += seconds
+            stats = self.files.setdefault(name, [0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+
+    def clear(self):
+        with self._lock:
+            self._validators.clear()
+
+    def report(self):
+        """One-paragraph summary of compile and per-file validation cost"""
+        count = len(self.files)
+        per_file = (self.compile_time + self.validate_time) / count if count else 0.0
+        lines = [
+            "Validation: %d files, %d validators compiled (%d from disk), "
+            "%d reused" % (count, self.misses, self.disk_hits, self.hits),
+            "  compile %.1f ms, validate %.1f ms, %.2f ms per file"
+            % (self.compile_time * 1e3, self.validate_time * 1e3, per_file * 1e3),
+        ]
+        return "\n".join(lines)
+
+    def _compile(self, validator_type, path):
+        parsed = etree.parse(path)
+        files = [path] + _included_files(parsed, path)
+        if validator_type == "schema":
+            return etree.RelaxNG(parsed), files
+        if validator_type != "schematron":
+            raise ValueError("Unknown validator type %s" % validator_type)
+
+        stored = self._stored_path(files) if self.cache_dir else None
+        if stored is not None and os.path.isfile(stored):
+            try:
+                validator = _StoredSchematron(etree.parse(stored))
+                self.disk_hits += 1
+                return validator, files
+            except (etree.LxmlError, OSError) as exc:
+                DEBUG.debug("Ignoring stored validator %s: %s" % (stored, exc))
+        validator = isoschematron.Schematron(parsed, store_xslt=True)
+        if stored is not None:
+            write_atomic(
+                self.cache_dir, stored, etree.tostring(validator.validator_xslt)
+            )
+        return validator, files
+
+    def _stored_path(self, files):
+        digest = hashlib.sha1()
+        for name, mtime, size in signature(files):
+            digest.update(("%s\0%s\0%s\0" % (name, mtime, size)).encode())
+        digest.update(("%s\0" % (etree.LXML_VERSION,)).encode())
+        name = os.path.splitext(os.path.basename(files[0]))[0]
+        return os.path.join(self.cache_dir, "%s-%s.xsl" % (name, digest.hexdigest()))
+
+
+def _included_files(parsed, path, seen=None):
+    """Files pulled in by RelaxNG include/externalRef or Schematron include"""
+    seen = set() if seen is None else seen
+    found = []
+    base = os.path.dirname(path)
+    for tag in (RNG_NS + "include", RNG_NS + "externalRef", SCH_NS + "include"):
+        for element in parsed.iter(tag):
+            href = element.get("href")
+            if not href:
+                continue
+            included = os.path.realpath(os.path.join(base, href))
+            if included in seen or not os.path.isfile(included):
+                continue
+            seen.add(included)
+            found.append(included)
+            found.extend(_included_files(etree.parse(included), included, seen))
+    return found
+
+
+_CACHE = None
+
+
+def get_cache():
+    """The process-wide ValidatorCache, created on first use"""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = ValidatorCache(os.environ.get(CACHE_DIR_ENV) or None)
+    return _CACHE
+
+
+def get_validator(validator_type, path):
+    """Compiled validator for validator_type at path from the process-wide cache"""
+    return get_cache().get(validator_type, path)
@@ -0,0 +1,58 @@
+"""
+test_codegen_batch.py:
+
+Checks that codegen.py --batch generates the same files as one codegen.py
+run per XML file, and answers every job, failed ones included.
+"""
+
+import json
+import os
+import subprocess
+
+XML_FILES = [
+    os.path.join("enum_xml", "Port1PortAi.xml"),
+    os.path.join("enum_xml", "Serial1SerializableAi.xml"),
+    os.path.join("enum_xml", "Enum1EnumAi.xml"),
+]
+
+
+def outputs(out_dir):
+    return {
+        name: open(os.path.join(out_dir, name), "rb").read()
+        for name in sorted(os.listdir(out_dir))
+    }
+
+
+def test_batch_matches_single_runs(codegen, tmp_path):
+    xml_files = [codegen.xml(name) for name in XML_FILES]
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    for xml_file in xml_files:
+        codegen.run(
+            ["-b", "-p", str(out_dir), xml_file],
+            out_dir,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+    single = outputs(str(out_dir))
+    assert len(single) >= len(xml_files) * 2
+
+    for name in os.listdir(str(out_dir)):
+        os.remove(os.path.join(str(out_dir), name))
+    jobs = [
+        {"id": n, "args": ["-b", "-p", str(out_dir), xml_file], "cwd": str(out_dir)}
+        for n, xml_file in enumerate(xml_files)
+    ]
+    jobs.append({"id": "missing", "args": ["-b", str(tmp_path / "NoneAi.xml")]})
+    proc = codegen.run(
+        ["--batch", "-"],
+        tmp_path,
+        input="".join(json.dumps(job) + "\n" for job in jobs),
+        stderr=None,
+    )
+    results = [json.loads(line) for line in proc.stdout.splitlines()]
+    assert [result["id"] for result in results] == [0, 1, 2, "missing"]
+    assert [result["status"] for result in results[:3]] == [0, 0, 0]
+    assert results[3]["status"] != 0
+    assert proc.returncode == 1
+    assert outputs(str(out_dir)) == single
@@ -0,0 +1,48 @@
+"""
+test_codegen_parallel.py:
+
+Checks that codegen.py -j generates the same files as a sequential run,
+and reports every file's timing and the failed files in input order.
+"""
+
+import os
+
+XML_FILES = [
+    os.path.join("array_xml", "Port1PortAi.xml"),
+    os.path.join("enum_xml", "Enum1EnumAi.xml"),
+    os.path.join("enum_xml", "Port1PortAi.xml"),
+    os.path.join("enum_xml", "Serial1SerializableAi.xml"),
+    os.path.join("serialize1", "QuaternionSerializableAi.xml"),
+]
+
+
+def generate(codegen, tmp_path, name, args):
+    out_dir = tmp_path / name
+    out_dir.mkdir()
+    proc = codegen.run(["-b"] + args, out_dir)
+    files = {
+        name: (out_dir / name).read_text().replace(f"<{out_dir.name}/", "<")
+        for name in sorted(os.listdir(str(out_dir)))
+    }
+    return proc, files
+
+
+def test_parallel_matches_sequential(codegen, tmp_path):
+    xml_files = [codegen.xml(name) for name in XML_FILES]
+    sequential, expected = generate(codegen, tmp_path, "sequential", xml_files)
+    parallel, files = generate(codegen, tmp_path, "parallel", ["-j", "3"] + xml_files)
+    assert sequential.returncode == parallel.returncode == 0
+    assert files == expected
+    timings = parallel.stdout.split("Generation time per file:\n")[1].splitlines()
+    timings = timings[: len(xml_files)]
+    assert [line.split()[-1] for line in timings] == xml_files
+    assert all(line.split()[2] == "ok" for line in timings)
+
+
+def test_parallel_collects_failures(codegen, tmp_path):
+    xml_files = [codegen.xml(name) for name in XML_FILES]
+    missing = str(tmp_path / "MissingPortAi.xml")
+    proc, files = generate(codegen, tmp_path, "out", ["-j", "2", missing] + xml_files)
+    assert proc.returncode == 255
+    assert "ERROR: 1 of 6 XML files failed:\n  %s" % missing in proc.stdout
+    assert "QuaternionSerializableAc.cpp" in files
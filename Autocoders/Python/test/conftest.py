@@ -0,0 +1,52 @@
+"""
+conftest.py:
+
+codegen fixture for the tests running codegen.py as a separate process
+(codegen_batch, codegen_parallel, output_writer).
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+class Codegen:
+    """
+    Runs codegen.py from $BUILD_ROOT with tmp_path added to the build roots,
+    as -b needs the output directories under one of them.
+    """
+
+    def __init__(self, tmp_path):
+        build_root = os.environ["BUILD_ROOT"]
+        self.script = os.path.join(
+            build_root, "Autocoders", "Python", "bin", "codegen.py"
+        )
+        self.test_dir = os.path.join(build_root, "Autocoders", "Python", "test")
+        self.env = dict(os.environ)
+        self.env["BUILD_ROOT"] = os.pathsep.join([build_root, str(tmp_path)])
+
+    def xml(self, name):
+        """Path of a test XML file given relative to the test directory"""
+        return os.path.join(self.test_dir, name)
+
+    def run(self, args, cwd, **kwargs):
+        """
+        subprocess.run() of codegen.py with args in cwd; stdout and stderr
+        are captured together as text unless kwargs say otherwise
+        """
+        options = {
+            "cwd": str(cwd),
+            "env": self.env,
+            "stdout": subprocess.PIPE,
+            "stderr": subprocess.STDOUT,
+            "universal_newlines": True,
+        }
+        options.update(kwargs)
+        return subprocess.run([sys.executable, self.script] + list(args), **options)
+
+
+@pytest.fixture
+def codegen(tmp_path):
+    return Codegen(tmp_path)
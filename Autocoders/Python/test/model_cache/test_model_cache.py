@@ -0,0 +1,88 @@
+"""
+test_model_cache.py:
+
+Checks that parsed models are loaded back from the model cache, and that
+changing the XML file, a dictionary it imports or the configuration parses
+it again.
+"""
+
+import os
+import shutil
+
+import pytest
+
+from fprime_ac.parsers import XmlComponentParser, XmlPortsParser
+from fprime_ac.utils import ConfigManager
+from fprime_ac.utils.buildroot import set_build_roots
+from fprime_ac.utils.model_cache import ModelCache
+
+TEST_DIR = os.path.join("Autocoders", "Python", "test", "ext_dict")
+
+
+@pytest.fixture
+def build_root(tmp_path):
+    """A build root holding a copy of the ext_dict test XMLs"""
+    shutil.copytree(
+        os.path.join(os.environ["BUILD_ROOT"], TEST_DIR), str(tmp_path / TEST_DIR)
+    )
+    set_build_roots(str(tmp_path))
+    yield tmp_path / TEST_DIR
+    set_build_roots(os.environ["BUILD_ROOT"])
+
+
+def test_parsed_port_is_loaded(build_root, tmp_path):
+    xml_file = str(build_root / "ExamplePortAi.xml")
+    cache = ModelCache(str(tmp_path / "cache"))
+    parsed = cache.parse(XmlPortsParser.XmlPortsParser, xml_file)
+    loaded = cache.parse(XmlPortsParser.XmlPortsParser, xml_file)
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert loaded is not parsed
+    assert loaded.get_interface().get_name() == parsed.get_interface().get_name()
+    assert [arg.get_name() for arg in loaded.get_args()] == [
+        arg.get_name() for arg in parsed.get_args()
+    ]
+
+
+def test_changed_xml_is_parsed_again(build_root, tmp_path):
+    xml_file = build_root / "ExamplePortAi.xml"
+    cache = ModelCache(str(tmp_path / "cache"))
+    cache.parse(XmlPortsParser.XmlPortsParser, str(xml_file))
+    xml_file.write_text(xml_file.read_text() + "\n")
+    cache.parse(XmlPortsParser.XmlPortsParser, str(xml_file))
+    assert cache.misses == 2
+
+
+def test_changed_dictionary_is_parsed_again(build_root, tmp_path):
+    xml_file = str(build_root / "ExampleComponentAi.xml")
+    cache = ModelCache(str(tmp_path / "cache"))
+    commands = len(
+        cache.parse(XmlComponentParser.XmlComponentParser, xml_file).get_commands()
+    )
+    assert (
+        len(cache.parse(XmlComponentParser.XmlComponentParser, xml_file).get_commands())
+        == commands
+    )
+    assert cache.hits == 1
+
+    dictionary = build_root / "ExampleCommandDictionary.xml"
+    dictionary.write_text(dictionary.read_text() + "\n")
+    cache.parse(XmlComponentParser.XmlComponentParser, xml_file)
+    assert (cache.stale, cache.misses) == (1, 2)
+
+
+def test_no_cache_dir_always_parses(build_root):
+    xml_file = str(build_root / "ExamplePortAi.xml")
+    cache = ModelCache()
+    cache.parse(XmlPortsParser.XmlPortsParser, xml_file)
+    assert (cache.misses, cache.hits) == (0, 0)
+
+
+def test_new_configuration_changes_the_entry(build_root, tmp_path, monkeypatch):
+    xml_file = str(build_root / "ExamplePortAi.xml")
+    cache = ModelCache(str(tmp_path / "cache"))
+    cache.parse(XmlPortsParser.XmlPortsParser, xml_file)
+    # the next codegen --batch job, with its own constants file
+    monkeypatch.setenv("FPRIME_AC_CONSTANTS_FILE", str(tmp_path / "Other.ini"))
+    monkeypatch.setattr(ConfigManager.ConfigManager, "_ConfigManager__instance", None)
+    cache.parse(XmlPortsParser.XmlPortsParser, xml_file)
+    assert (cache.misses, cache.hits) == (2, 0)
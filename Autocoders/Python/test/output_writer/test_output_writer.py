@@ -0,0 +1,74 @@
+"""
+test_output_writer.py:
+
+Checks that regenerating unchanged XMLs leaves the generated files and
+their modification times alone, that a changed output is written again,
+and that codegen.py reports how many files it did not rewrite.
+"""
+
+import os
+
+from fprime_ac.utils.output_writer import OutputWriter
+
+XML_FILES = [
+    os.path.join("enum_xml", "Enum1EnumAi.xml"),
+    os.path.join("serialize1", "QuaternionSerializableAi.xml"),
+]
+
+
+def generate(codegen, tmp_path, *args):
+    xml_files = [codegen.xml(name) for name in XML_FILES]
+    proc = codegen.run(["-b"] + list(args) + xml_files, tmp_path)
+    assert proc.returncode == 0, proc.stdout
+    return proc.stdout
+
+
+def mtimes(tmp_path):
+    return {
+        path: path.stat().st_mtime_ns for path in tmp_path.rglob("*") if path.is_file()
+    }
+
+
+def test_commit_skips_same_content(tmp_path):
+    path = str(tmp_path / "FooAc.hpp")
+    writer = OutputWriter()
+    with writer.open(path) as f:
+        f.write("same\n")
+    os.utime(path, ns=(0, 0))
+    with writer.open(path) as f:
+        f.write("same\n")
+    assert os.stat(path).st_mtime_ns == 0
+    assert writer.commit(path, b"changed\n")
+    assert open(path).read() == "changed\n"
+    assert (len(writer.written), len(writer.unchanged)) == (2, 1)
+
+
+def test_regenerating_keeps_files(codegen, tmp_path):
+    first = generate(codegen, tmp_path)
+    generated = mtimes(tmp_path)
+    assert "Generated files: %d written, 0 unchanged" % len(generated) in first
+    for path in generated:
+        os.utime(str(path), ns=(0, 0))
+
+    second = generate(codegen, tmp_path)
+    assert all(mtime == 0 for mtime in mtimes(tmp_path).values())
+    assert "Generated files: 0 written, %d unchanged" % len(generated) in second
+
+    edited = tmp_path / "Enum1EnumAc.hpp"
+    edited.write_text("edited\n")
+    os.utime(str(edited), ns=(0, 0))
+    assert "Generated files: 1 written" in generate(codegen, tmp_path, "-j", "2")
+    assert [path.name for path, mtime in mtimes(tmp_path).items() if mtime] == [
+        edited.name
+    ]
+    assert edited.read_text() != "edited\n"
+
+
+def test_no_write_if_changed_rewrites_all(codegen, tmp_path):
+    generate(codegen, tmp_path)
+    generated = mtimes(tmp_path)
+    for path in generated:
+        os.utime(str(path), ns=(0, 0))
+    output = generate(codegen, tmp_path, "--no-write-if-changed")
+    assert "Generated files: %d written, 0 unchanged" % len(generated) in output
+    assert all(mtimes(tmp_path).values())
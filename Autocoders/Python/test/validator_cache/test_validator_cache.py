@@ -0,0 +1,71 @@
+"""
+test_validator_cache.py:
+
+Checks that compiled RelaxNG and Schematron validators are reused across
+lookups, recompiled when the schema or a file it includes changes, and that
+a Schematron stylesheet stored on disk still validates like a fresh compile.
+"""
+
+import os
+import shutil
+
+from lxml import etree
+
+from fprime_ac.utils.validator_cache import ValidatorCache
+
+SCHEMA_DIR = os.path.join(
+    os.environ["BUILD_ROOT"], "Autocoders", "Python", "schema", "default"
+)
+
+CHANNELS = """<telemetry>
+    <channel id="%d" name="a"/>
+    <channel id="%d" name="b"/>
+</telemetry>"""
+
+
+def channels(first, second):
+    return etree.ElementTree(etree.fromstring(CHANNELS % (first, second)))
+
+
+def touch(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_validators_are_reused():
+    cache = ValidatorCache()
+    path = os.path.join(SCHEMA_DIR, "component_schema.rng")
+    first = cache.get("schema", path)
+    assert cache.get("schema", path) is first
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_changed_include_recompiles(tmp_path):
+    for name in ("enum_schema.rng", "common_elements.rng", "common_types.rng"):
+        shutil.copy(os.path.join(SCHEMA_DIR, name), str(tmp_path))
+    path = str(tmp_path / "enum_schema.rng")
+    cache = ValidatorCache()
+    first = cache.get("schema", path)
+    touch(str(tmp_path / "common_elements.rng"))
+    assert cache.get("schema", path) is not first
+    assert cache.misses == 2
+
+
+def test_disabled_cache_always_compiles():
+    cache = ValidatorCache(enabled=False)
+    path = os.path.join(SCHEMA_DIR, "channel_id_schematron.rng")
+    assert cache.get("schematron", path) is not cache.get("schematron", path)
+    assert cache.misses == 2
+
+
+def test_stored_schematron_validates(tmp_path):
+    path = os.path.join(SCHEMA_DIR, "channel_id_schematron.rng")
+    ValidatorCache(cache_dir=str(tmp_path)).get("schematron", path)
+
+    cache = ValidatorCache(cache_dir=str(tmp_path))
+    validator = cache.get("schematron", path)
+    assert cache.disk_hits == 1
+    assert validator.validate(channels(1, 2))
+    assert not validator.validate(channels(1, 1))
+    assert "Channel ID's should be unique." in str(validator.error_log)
+    assert len(cache.files) == 1
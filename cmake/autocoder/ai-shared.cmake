@@ -81,6 +81,7 @@ macro(ai_shared_setup OUTPUT_DIR)
             BUILD_ROOT=${FPRIME_BUILD_LOCATIONS_SEP}:${CMAKE_BINARY_DIR}:${CMAKE_BINARY_DIR}/F-Prime
             FPRIME_AC_CONSTANTS_FILE=${FPRIME_AC_CONSTANTS_FILE}
             PYTHON_AUTOCODER_DIR=${PYTHON_AUTOCODER_DIR}
+            FPRIME_AC_MODEL_CACHE_DIR=${CMAKE_BINARY_DIR}/fprime-ac-model-cache
         ${PYTHON} ${FPRIME_FRAMEWORK_PATH}/Autocoders/Python/bin/codegen.py -p "${OUTPUT_DIR}" --build_root
     )
 endmacro()
@@ -2,40 +2,157 @@
 """
 motor_client_stage9.py
 Client for Stage9MotorBridge Julia TCP server
+
+--binary negotiates the fixed-size binary framing of vesc_tcp_server.py
+(see vesc/vendor/bridge_protocol.py) instead of text lines.
+
+A keepalive PING goes out every --heartbeat seconds so the server's safety
+supervisor keeps the duty applied while you type; its replies are not
+printed.
 """
 
+import argparse
 import socket
+import sys
 import threading
 import time
+from pathlib import Path
+
+VENDOR_DIR = Path(__file__).parent / "vesc" / "vendor"
+sys.path.insert(0, str(VENDOR_DIR))
+
+from bridge_protocol import (
+    ACK_BINARY,
+    BINARY_NAMES,
+    OP_PING,
+    TEXT_OPCODES,
+    BinaryFramer,
+    encode_binary,
+)
 
 HOST = "127.0.0.1"
 PORT = 12345
+HEARTBEAT = 0.25  # s between keepalive PINGs, well inside the server timeout
 
 running = True
+binary = False
+seq = 0
+send_lock = threading.Lock()
+# keepalive PINGs whose replies are not printed yet, guarded by send_lock:
+# counted in text mode (PONG carries no seq), by seq in binary mode
+quiet_pongs = 0
+quiet_seqs = set()
 
 def receive_responses(sock):
     """Receive ACKs and server messages"""
-    global running
+    global running, quiet_pongs
+    framer = BinaryFramer()
     while running:
         try:
             data = sock.recv(1024)
             if not data:
                 print("[INFO] Server closed connection.")
                 break
-            print("[SERVER]", data.decode().strip())
+            if not binary:
+                for line in data.decode().splitlines():
+                    if line == "PONG":
+                        with send_lock:
+                            quiet = quiet_pongs > 0
+                            if quiet:
+                                quiet_pongs -= 1
+                        if quiet:
+                            continue
+                    print("[SERVER]", line)
+                continue
+            for opcode, status, rx_seq, stamp_us, value in framer.feed(data):
+                if opcode == OP_PING:
+                    with send_lock:
+                        quiet = rx_seq in quiet_seqs
+                        quiet_seqs.discard(rx_seq)
+                    if quiet:
+                        continue
+                rtt_us = time.monotonic_ns() // 1000 - stamp_us
+                print(
+                    f"[SERVER] {BINARY_NAMES.get(opcode, opcode)} seq={rx_seq} "
+                    f"status={status} duty={value:.4f} rtt={rtt_us}us"
+                )
         except Exception as e:
             print("[ERROR] Receiver:", e)
             break
 
-def send(sock, msg):
-    print("➡️ ", msg)
-    sock.sendall((msg + "\n").encode())
+def send(sock, msg, echo=True, quiet=False):
+    """Send one command; quiet hides its reply (keepalive PINGs)"""
+    global seq, quiet_pongs
+    if echo:
+        print("➡️ ", msg)
+    if not binary:
+        with send_lock:
+            if quiet:
+                quiet_pongs += 1
+            sock.sendall((msg + "\n").encode())
+        return
+
+    parts = msg.split()
+    name = parts[0].lower()
+    opcode = TEXT_OPCODES.get("duty" if name == "set_duty" else name, 0)
+    value = float(parts[1]) if len(parts) > 1 else 0.0
+    with send_lock:
+        seq += 1
+        if quiet:
+            quiet_seqs.add(seq & 0xFFFF)
+        sock.sendall(encode_binary(opcode, seq, value))
+
+def keepalive(sock, period):
+    """PING the server so its safety supervisor keeps a held duty applied"""
+    while running:
+        time.sleep(period)
+        try:
+            send(sock, "PING", echo=False, quiet=True)
+        except OSError:
+            return
+
+def negotiate_binary(sock):
+    """Switch the connection to binary frames right after the HELLO banner"""
+    banner = b""
+    while not banner.endswith(b"\n"):
+        chunk = sock.recv(1)
+        if not chunk:
+            raise ConnectionError("server closed during HELLO")
+        banner += chunk
+    print("[SERVER]", banner.decode().strip())
+
+    sock.sendall(b"BINARY\n")
+    reply = b""
+    while not reply.endswith(b"\n"):
+        chunk = sock.recv(1)
+        if not chunk:
+            raise ConnectionError("server closed during negotiation")
+        reply += chunk
+    if reply != ACK_BINARY:
+        raise ConnectionError(f"binary mode refused: {reply!r}")
+    print("[INFO] Binary framing enabled")
 
 def main():
-    global running
-
-    with socket.create_connection((HOST, PORT)) as sock:
-        print(f"✅ Connected to Stage9 server at {HOST}:{PORT}")
+    global running, binary
+
+    parser = argparse.ArgumentParser(description="Stage 9 motor bridge client")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--binary", action="store_true", help="use binary framing")
+    parser.add_argument(
+        "--heartbeat",
+        type=float,
+        default=HEARTBEAT,
+        help="seconds between keepalive PINGs (0 = off)",
+    )
+    args = parser.parse_args()
+
+    with socket.create_connection((args.host, args.port)) as sock:
+        print(f"✅ Connected to Stage9 server at {args.host}:{args.port}")
+
+        if args.binary:
+            negotiate_binary(sock)
+            binary = True
 
         rx = threading.Thread(
             target=receive_responses,
@@ -43,6 +160,10 @@ def main():
             daemon=True
         )
         rx.start()
+        if args.heartbeat:
+            threading.Thread(
+                target=keepalive, args=(sock, args.heartbeat), daemon=True
+            ).start()
 
         print("\nCommands:")
         print("  enable")
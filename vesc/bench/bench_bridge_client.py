@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+bench_bridge_client.py
+Command latency through bridge_client against vesc_tcp_server.py on a
+simulated VESC, for the sync and asyncio clients in text and binary mode:
+one request at a time (round trip per command), then --window requests
+kept outstanding (pipelined throughput and the latency it costs).
+
+Usage: python3 vesc/bench/bench_bridge_client.py [--mode asyncio|threaded]
+           [--requests N] [--window N]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+sys.path.insert(0, str(VENDOR_DIR))
+
+from bench_bridge_load import free_port, percentile, start_server
+from bridge_client import AsyncBridgeClient, BridgeClient
+from vesc_simulator import VescSimulator
+
+
+def sync_run(port, binary, requests, window):
+    with BridgeClient("127.0.0.1", port, binary=binary) as client:
+        client.enable()
+        start = time.perf_counter()
+        rtts = [client.ping().rtt for _ in range(requests)]
+        serial_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        outstanding = deque()
+        piped = []
+        for i in range(requests):
+            outstanding.append(client.submit("DUTY", (i % 50) / 1000))
+            if len(outstanding) >= window:
+                piped.append(outstanding.popleft().result().rtt)
+        piped.extend(f.result().rtt for f in outstanding)
+        piped_elapsed = time.perf_counter() - start
+        client.stop()
+    return rtts, serial_elapsed, piped, piped_elapsed
+
+
+def async_run(port, binary, requests, window):
+    async def run():
+        client = await AsyncBridgeClient.connect("127.0.0.1", port, binary=binary)
+        async with client:
+            await client.enable()
+            start = time.perf_counter()
+            rtts = [(await client.ping()).rtt for _ in range(requests)]
+            serial_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            outstanding = deque()
+            piped = []
+            for i in range(requests):
+                outstanding.append(client.submit("DUTY", (i % 50) / 1000))
+                if len(outstanding) >= window:
+                    piped.append((await outstanding.popleft()).rtt)
+            piped.extend(r.rtt for r in await asyncio.gather(*outstanding))
+            piped_elapsed = time.perf_counter() - start
+            await client.stop()
+        return rtts, serial_elapsed, piped, piped_elapsed
+
+    return asyncio.run(run())
+
+
+def report(name, requests, rtts, serial_elapsed, piped, piped_elapsed):
+    rtts.sort()
+    piped.sort()
+    print(
+        f"{name:<14} 1-at-a-time {requests / serial_elapsed:>8.0f} cmd/s  "
+        f"p50 {percentile(rtts, 50) * 1e6:6.0f} us  p99 {percentile(rtts, 99) * 1e6:6.0f} us"
+        f"  | pipelined {requests / piped_elapsed:>8.0f} cmd/s  "
+        f"p50 {percentile(piped, 50) * 1e6:6.0f} us  p99 {percentile(piped, 99) * 1e6:6.0f} us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", choices=("asyncio", "threaded"), default="asyncio")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--window", type=int, default=32, help="pipelined requests")
+    args = parser.parse_args()
+
+    with VescSimulator() as sim:
+        port = free_port()
+        proc = start_server(args.mode, port, sim.port)
+        try:
+            for name, runner, binary in (
+                ("sync text", sync_run, False),
+                ("sync binary", sync_run, True),
+                ("async text", async_run, False),
+                ("async binary", async_run, True),
+            ):
+                results = runner(port, binary, args.requests, args.window)
+                report(name, args.requests, *results)
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+bench_bridge_load.py
+Load test for vesc_tcp_server.py: N concurrent monitoring clients each send
+PING/DUTY commands back to back and the command round-trip latency
+percentiles are reported. A pseudo-terminal stands in for the VESC.
+
+Usage: python3 vesc/bench/bench_bridge_load.py [--mode asyncio|threaded]
+           [--clients N] [--requests N]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import tty
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+SERVER = REPO_ROOT / "vesc_tcp_server.py"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def drain(fd, stop):
+    while not stop.is_set():
+        try:
+            os.read(fd, 4096)
+        except OSError:
+            return
+
+
+def start_server(mode, port, serial_port, extra_args=()):
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            str(SERVER),
+            "--mode",
+            mode,
+            "--port",
+            str(port),
+            "--serial-port",
+            serial_port,
+            "--quiet",
+            *extra_args,
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10.0
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("bridge did not start")
+
+
+def percentile(sorted_values, pct):
+    index = min(
+        len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1)))
+    )
+    return sorted_values[index]
+
+
+async def client(port, requests, latencies, control):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    await reader.readline()  # HELLO
+    if control:
+        writer.write(b"ENABLE\n")
+        await reader.readline()
+    for i in range(requests):
+        cmd = f"DUTY {(i % 10) / 1000.0:.3f}\n" if control else "PING\n"
+        start = time.perf_counter()
+        writer.write(cmd.encode())
+        reply = await reader.readline()
+        latencies.append(time.perf_counter() - start)
+        if not reply:
+            raise RuntimeError("bridge closed the connection")
+    if control:
+        writer.write(b"STOP\n")
+        await reader.readline()
+    writer.close()
+
+
+async def run_clients(port, clients, requests):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[client(port, requests, latencies, i == 0) for i in range(clients)]
+    )
+    return latencies, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", choices=("asyncio", "threaded"), default="asyncio")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    master, slave = os.openpty()
+    tty.setraw(master)
+    stop = threading.Event()
+    threading.Thread(target=drain, args=(master, stop), daemon=True).start()
+
+    port = free_port()
+    proc = start_server(args.mode, port, os.ttyname(slave))
+    try:
+        latencies, elapsed = asyncio.run(run_clients(port, args.clients, args.requests))
+    finally:
+        proc.terminate()
+        proc.wait()
+        stop.set()
+        os.close(slave)
+
+    latencies.sort()
+    print(
+        f"mode={args.mode} clients={args.clients} "
+        f"commands={len(latencies)} in {elapsed:.2f}s "
+        f"({len(latencies) / elapsed:,.0f} cmd/s)"
+    )
+    for pct in (50, 90, 99, 99.9):
+        print(f"  p{pct:<5} {percentile(latencies, pct) * 1e3:8.3f} ms")
+    print(f"  max    {latencies[-1] * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+bench_bridge_pool.py
+Per-use cost of talking to vesc_tcp_server.py the way test cases do: a
+short exchange (--requests PINGs) from --threads workers, with a fresh
+BridgeClient per use (connect + HELLO + close) vs a session from a warm
+BridgePool.
+
+Usage: python3 vesc/bench/bench_bridge_pool.py [--mode asyncio|threaded]
+           [--uses N] [--threads N] [--requests N]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+sys.path.insert(0, str(VENDOR_DIR))
+
+from bench_bridge_load import free_port, percentile, start_server
+from bridge_client import BridgeClient
+from bridge_pool import BridgePool
+from vesc_simulator import VescSimulator
+
+
+def fresh(port, requests):
+    with BridgeClient("127.0.0.1", port) as client:
+        for _ in range(requests):
+            client.ping()
+
+
+def pooled(pool, requests):
+    with pool.session() as session:
+        for _ in range(requests):
+            session.ping()
+
+
+def run(use, uses, threads):
+    times = []
+
+    def worker():
+        for _ in range(uses // threads):
+            start = time.perf_counter()
+            use()
+            times.append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sorted(times), time.perf_counter() - start
+
+
+def report(name, times, elapsed):
+    print(
+        f"{name:<12} {len(times) / elapsed:>8.0f} uses/s  "
+        f"p50 {percentile(times, 50) * 1e6:7.0f} us  "
+        f"p99 {percentile(times, 99) * 1e6:7.0f} us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", choices=("asyncio", "threaded"), default="asyncio")
+    parser.add_argument("--uses", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=3, help="PINGs per use")
+    args = parser.parse_args()
+
+    with VescSimulator() as sim:
+        port = free_port()
+        proc = start_server(args.mode, port, sim.port)
+        try:
+            report(
+                "fresh",
+                *run(lambda: fresh(port, args.requests), args.uses, args.threads),
+            )
+            with BridgePool("127.0.0.1", port, min_size=2) as pool:
+                report(
+                    "pooled",
+                    *run(lambda: pooled(pool, args.requests), args.uses, args.threads),
+                )
+                stats = pool.stats()
+            print(
+                f"{'':<12} pool: {stats['opened']} connections opened for "
+                f"{stats['sessions_opened']} sessions"
+            )
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+bench_can.py
+VescCanController against CanVescSimulator on python-can's virtual bus, for
+a growing number of VESC nodes: setpoint and status frames per second, time
+from set_duties() to each node applying its new duty, and status frame
+receive-to-table latency.
+
+The virtual bus is an in-process queue, so the numbers show the Python
+cost per frame and per node, not CAN wire time (a 1 Mbit/s bus carries
+about 8000 extended frames/s in total).
+
+Usage: python3 vesc/bench/bench_can.py [--nodes 1 4 16 64] [--seconds S]
+           [--rate HZ] [--status-hz HZ] [--step-hz HZ]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import can
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+sys.path.insert(0, str(VENDOR_DIR))
+
+from bench_bridge_load import percentile
+from vesc_can import CanVescSimulator, VescCanController
+
+
+def run(count, args):
+    channel = f"bench_can_{count}"
+    controller_bus = can.Bus(interface="virtual", channel=channel)
+    node_bus = can.Bus(interface="virtual", channel=channel)
+    nodes = list(range(1, count + 1))
+    sim = CanVescSimulator(node_bus, nodes, status_hz=args.status_hz).start()
+    controller = VescCanController(controller_bus, nodes, rate_hz=args.rate).start()
+    setpoint_lat = []
+    try:
+        step = 0
+        period = 1.0 / args.step_hz
+        start = time.monotonic()
+        sent_before = controller.frames_sent
+        received_before = controller.frames_received
+        while time.monotonic() - start < args.seconds:
+            step += 1
+            duty = 0.01 + 0.001 * (step % 50)
+            issued = time.time()
+            controller.set_duties(dict.fromkeys(nodes, duty))
+            time.sleep(period)
+            for node in nodes:
+                changed = sim.changed_at.get(node)
+                if changed is not None and changed >= issued:
+                    setpoint_lat.append(changed - issued)
+        elapsed = time.monotonic() - start
+        sent = controller.frames_sent - sent_before
+        received = controller.frames_received - received_before
+        status_lat = sorted(controller.latencies)
+        ticks = controller.scheduler.stats()
+    finally:
+        controller.close()
+        sim.close()
+        controller_bus.shutdown()
+        node_bus.shutdown()
+
+    setpoint_lat.sort()
+    applied = len(setpoint_lat) / (step * count)
+    print(
+        f"{count:>5} {sent / elapsed:>9.0f} {received / elapsed:>9.0f} "
+        f"{percentile(setpoint_lat, 50) * 1e3:>8.2f} "
+        f"{percentile(setpoint_lat, 99) * 1e3:>8.2f} {applied * 100:>6.1f}% "
+        f"{percentile(status_lat, 50) * 1e6:>8.0f} "
+        f"{percentile(status_lat, 99) * 1e6:>8.0f} "
+        f"{ticks['late_max_us'] / 1e3:>8.2f} {ticks['overruns']:>5}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--rate", type=float, default=100.0, help="setpoint ticks/s")
+    parser.add_argument("--status-hz", type=float, default=50.0, help="per node")
+    parser.add_argument("--step-hz", type=float, default=20.0, help="duty changes/s")
+    args = parser.parse_args()
+
+    print(
+        f"{'nodes':>5} {'tx/s':>9} {'rx/s':>9} {'set p50':>8} {'set p99':>8} "
+        f"{'applied':>7} {'st p50':>8} {'st p99':>8} {'tick max':>8} {'overr':>5}"
+    )
+    print(
+        f"{'':>5} {'frames':>9} {'frames':>9} {'ms':>8} {'ms':>8} {'':>7} "
+        f"{'us':>8} {'us':>8} {'ms':>8}"
+    )
+    for count in args.nodes:
+        run(count, args)
+
+
+if __name__ == "__main__":
+    main()
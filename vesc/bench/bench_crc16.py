@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+bench_crc16.py
+Micro-benchmark: original bit-by-bit crc16 vs the table-driven vesc_crc module.
+
+Usage: python3 vesc/bench/bench_crc16.py [--number N]
+"""
+
+import argparse
+import os
+import struct
+import sys
+import timeit
+from pathlib import Path
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+sys.path.insert(0, str(VENDOR_DIR))
+
+from vesc_crc import check_frames, crc16, crc16_bitwise, crc16_many
+
+PAYLOAD_SIZES = [5, 16, 64, 256, 1024]
+
+
+def bench_single(number):
+    print(f"{'bytes':>6} {'bitwise us':>12} {'table us':>10} {'speedup':>8}")
+    for size in PAYLOAD_SIZES:
+        data = os.urandom(size)
+        assert crc16(data) == crc16_bitwise(data)
+        t_old = timeit.timeit(lambda: crc16_bitwise(data), number=number) / number
+        t_new = timeit.timeit(lambda: crc16(data), number=number) / number
+        print(
+            f"{size:>6} {t_old * 1e6:>12.2f} {t_new * 1e6:>10.2f} {t_old / t_new:>7.1f}x"
+        )
+
+
+def bench_bulk(number):
+    # 1000 duty frames (cmd + f32), the shape the duty sender emits
+    payloads = [bytes([5]) + struct.pack(">f", i / 1000.0) for i in range(1000)]
+    frames = [
+        bytes([2, len(p)]) + p + struct.pack(">H", crc16(p)) + bytes([3])
+        for p in payloads
+    ]
+    reps = max(1, number // 1000)
+
+    t_old = timeit.timeit(lambda: [crc16_bitwise(p) for p in payloads], number=reps)
+    t_many = timeit.timeit(lambda: crc16_many(payloads), number=reps)
+    t_check = timeit.timeit(lambda: check_frames(frames), number=reps)
+    per = reps * len(payloads)
+    print()
+    print(f"bulk, {len(payloads)} duty payloads x {reps}:")
+    print(f"  bitwise loop   {t_old / per * 1e6:8.2f} us/frame")
+    print(f"  crc16_many     {t_many / per * 1e6:8.2f} us/frame")
+    print(f"  check_frames   {t_check / per * 1e6:8.2f} us/frame (incl. framing)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+    bench_single(args.number)
+    bench_bulk(args.number)
+
+
+if __name__ == "__main__":
+    main()
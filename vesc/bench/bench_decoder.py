@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+bench_decoder.py
+Decode rate of the telemetry readers' grow-and-reslice loop
+(buff += sp.read(); buff = buff[consumed:]) vs VescFrameDecoder on a noisy
+stream delivered in chunks of growing read size.
+
+Usage: python3 vesc/bench/bench_decoder.py [--frames N] [--noise P]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+sys.path.insert(0, str(VENDOR_DIR))
+
+from vesc_crc import crc16
+from vescminimal_nov20 import VescFrameDecoder, build_packet
+
+
+def reslice_decode(buff):
+    """Return (payload, consumed) for the first frame in buff, pyvesc style"""
+    i = 0
+    while i < len(buff) and buff[i] != 2:
+        i += 1
+    if len(buff) - i < 2:
+        return None, i
+    length = buff[i + 1]
+    end = i + 2 + length
+    if len(buff) < end + 3:
+        return None, i
+    payload = buff[i + 2 : end]
+    if crc16(payload) != (buff[end] << 8 | buff[end + 1]) or buff[end + 2] != 3:
+        return None, i + 1
+    return payload, end + 3
+
+
+def make_stream(frames, noise):
+    rng = random.Random(1)
+    out = bytearray()
+    for i in range(frames):
+        if rng.random() < noise:
+            out += os.urandom(rng.randint(1, 20))
+        out += build_packet(4, os.urandom(60))
+    return bytes(out)
+
+
+def chunks(stream, size):
+    return [stream[i : i + size] for i in range(0, len(stream), size)]
+
+
+def run_reslice(parts):
+    count = 0
+    buff = b""
+    for part in parts:
+        buff += part
+        while True:
+            payload, consumed = reslice_decode(buff)
+            if consumed:
+                buff = buff[consumed:]
+            if payload is None:
+                if not consumed:
+                    break
+                continue
+            count += 1
+    return count
+
+
+def run_decoder(parts):
+    decoder = VescFrameDecoder()
+    count = 0
+    for part in parts:
+        for _ in decoder.decode(part):
+            count += 1
+    return count, decoder.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--noise", type=float, default=0.2)
+    args = parser.parse_args()
+
+    stream = make_stream(args.frames, args.noise)
+    print(f"{'read size':>9} {'reslice frames/s':>17} {'decoder frames/s':>17}")
+    for size in (256, 1024, 16384, 65536):
+        parts = chunks(stream, size)
+
+        start = time.perf_counter()
+        old = run_reslice(parts)
+        t_old = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new, stats = run_decoder(parts)
+        t_new = time.perf_counter() - start
+
+        assert new >= old
+        print(f"{size:>9} {old / t_old:>17,.0f} {new / t_new:>17,.0f}")
+
+    print(
+        f"decoder: {stats['frames']} frames  resyncs {stats['resyncs']}  "
+        f"crc errors {stats['crc_errors']}  "
+        f"framing errors {stats['framing_errors']}  "
+        f"dropped {stats['bytes_dropped']} B"
+    )
+
+
+if __name__ == "__main__":
+    main()
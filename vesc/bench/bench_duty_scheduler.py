@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+bench_duty_scheduler.py
+Achieved rate, drift and start jitter of the old duty_sender loop
+(write, then time.sleep(period)) vs DeadlineScheduler, with a simulated
+serial write time per frame.
+
+Usage: python3 vesc/bench/bench_duty_scheduler.py [--seconds S] [--write-us N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+sys.path.insert(0, str(VENDOR_DIR))
+
+from duty_scheduler import DeadlineScheduler
+
+
+def fake_write(write_s):
+    end = time.perf_counter() + write_s
+    while time.perf_counter() < end:
+        pass
+
+
+def run_sleep_loop(rate, seconds, write_s):
+    period = 1.0 / rate
+    starts = []
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        starts.append(time.monotonic())
+        fake_write(write_s)
+        time.sleep(period)
+    return starts
+
+
+def run_scheduler(rate, seconds, write_s, spin):
+    sched = DeadlineScheduler(rate, spin=spin)
+    starts = []
+    end = time.monotonic() + seconds
+
+    def tick():
+        starts.append(time.monotonic())
+        fake_write(write_s)
+
+    sched.run(tick, lambda: time.monotonic() < end)
+    return starts, sched.stats()
+
+
+def summarize(name, starts, rate):
+    period = 1.0 / rate
+    achieved = (len(starts) - 1) / (starts[-1] - starts[0])
+    drift = (starts[-1] - starts[0]) - (len(starts) - 1) * period
+    errors = sorted(abs(b - a - period) for a, b in zip(starts, starts[1:]))
+    p99 = errors[int(0.99 * (len(errors) - 1))]
+    print(
+        f"  {name:<22} {achieved:>9.1f} Hz  drift {drift * 1e3:>8.2f} ms  "
+        f"period error p99 {p99 * 1e6:>7.0f} us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--write-us", type=float, default=200.0)
+    args = parser.parse_args()
+    write_s = args.write_us * 1e-6
+
+    for rate in (20, 200, 1000):
+        print(f"target {rate} Hz, write {args.write_us:.0f} us:")
+        summarize("sleep(period)", run_sleep_loop(rate, args.seconds, write_s), rate)
+        starts, _ = run_scheduler(rate, args.seconds, write_s, 0.0)
+        summarize("DeadlineScheduler", starts, rate)
+        starts, stats = run_scheduler(rate, args.seconds, write_s, 200e-6)
+        summarize("DeadlineScheduler+spin", starts, rate)
+        print(f"    overruns {stats['overruns']}  lateness {stats['histogram']}")
+
+
+if __name__ == "__main__":
+    main()
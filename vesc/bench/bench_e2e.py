@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+bench_e2e.py
+End to end: TCP client -> vesc_tcp_server.py -> serial -> simulated VESC.
+Each DUTY command is timed to its ACK and to the moment the simulator
+applies the new duty (bounded by the duty sender period), and the duty
+frame rate arriving at the simulator is compared with the requested rate.
+
+Usage: python3 vesc/bench/bench_e2e.py [--mode threaded|asyncio]
+           [--rate HZ] [--baud N] [--commands N]
+"""
+
+import argparse
+import socket
+import sys
+import time
+from pathlib import Path
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+sys.path.insert(0, str(VENDOR_DIR))
+
+from bench_bridge_load import free_port, percentile, start_server
+from vesc_simulator import VescSimulator
+
+
+def readline(sockfile):
+    line = sockfile.readline()
+    if not line:
+        raise RuntimeError("bridge closed the connection")
+    return line
+
+
+def run(sim, port, commands, gap):
+    sock = socket.create_connection(("127.0.0.1", port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sockfile = sock.makefile("rb")
+    readline(sockfile)  # HELLO
+    sock.sendall(b"ENABLE\n")
+    readline(sockfile)
+
+    acks, applied = [], []
+    for i in range(commands):
+        duty = 0.001 * (1 + i % 40)
+        start = time.perf_counter()
+        sock.sendall(f"DUTY {duty:.3f}\n".encode())
+        readline(sockfile)
+        acks.append(time.perf_counter() - start)
+        if not sim.wait_for(lambda s: abs(s.duty - duty) < 1e-6, timeout=2.0):
+            raise RuntimeError("duty never reached the simulator")
+        applied.append(time.perf_counter() - start)
+        time.sleep(gap)
+
+    sock.sendall(b"STOP\n")
+    readline(sockfile)
+    sock.close()
+    return acks, applied
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", choices=("threaded", "asyncio"), default="threaded")
+    parser.add_argument("--rate", type=float, default=200.0, help="duty frames/s")
+    parser.add_argument("--baud", type=int, default=115200)
+    parser.add_argument("--commands", type=int, default=200)
+    parser.add_argument("--gap-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with VescSimulator(baudrate=args.baud or None, command_timeout=None) as sim:
+        port = free_port()
+        proc = start_server(args.mode, port, sim.port, ("--rate", str(args.rate)))
+        try:
+            start = time.monotonic()
+            frames = sim.duty_commands
+            acks, applied = run(sim, port, args.commands, args.gap_ms / 1e3)
+            elapsed = time.monotonic() - start
+            frames = sim.duty_commands - frames
+        finally:
+            proc.terminate()
+            proc.wait()
+        stats = sim.stats()
+
+    print(
+        f"mode={args.mode} rate={args.rate:g} Hz baud={args.baud} "
+        f"commands={args.commands}"
+    )
+    print(
+        f"  duty frames at VESC {frames / elapsed:8.1f}/s  "
+        f"serial bytes {stats['bytes_rx']}  crc errors {stats['crc_errors']}"
+    )
+    for name, values in (("ACK rtt", acks), ("applied", applied)):
+        values.sort()
+        print(
+            f"  {name:<8} p50 {percentile(values, 50) * 1e3:7.3f} ms  "
+            f"p99 {percentile(values, 99) * 1e3:7.3f} ms  "
+            f"max {values[-1] * 1e3:7.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+bench_frames.py
+Frames per second for the original concatenating packet builder vs the
+cached FrameTemplate used by VESC.set_duty_cycle.
+
+Usage: python3 vesc/bench/bench_frames.py [--frames N]
+"""
+
+import argparse
+import struct
+import sys
+import time
+from pathlib import Path
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+sys.path.insert(0, str(VENDOR_DIR))
+
+from vescminimal_nov20 import COMM_SET_DUTY, FrameTemplate, build_packet
+
+
+def old_builder(duty):
+    return build_packet(COMM_SET_DUTY, struct.pack(">f", duty))
+
+
+def run(name, build, frames):
+    duties = [((i % 200) - 100) / 2000.0 for i in range(frames)]
+    start = time.perf_counter()
+    for duty in duties:
+        build(duty)
+    elapsed = time.perf_counter() - start
+
+    reused = build(0.0) is build(0.0)
+    print(
+        f"{name:<16} {frames / elapsed:>12,.0f} frames/s "
+        f"{elapsed / frames * 1e6:>7.2f} us/frame  reuses buffer: {reused}"
+    )
+    return frames / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200000)
+    args = parser.parse_args()
+
+    template = FrameTemplate(COMM_SET_DUTY, "f")
+    old = run("build_packet", old_builder, args.frames)
+    new = run("FrameTemplate", template.fill, args.frames)
+    print(f"speedup: {new / old:.1f}x (1 kHz duty stream needs 1,000 frames/s)")
+
+
+if __name__ == "__main__":
+    main()
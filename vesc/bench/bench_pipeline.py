@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+bench_pipeline.py
+Duty setpoint throughput through vesc_tcp_server.py when a client pipelines
+commands instead of waiting for each ACK. Every ACK is checked, in order.
+
+Usage: python3 vesc/bench/bench_pipeline.py [--mode threaded|asyncio]
+           [--setpoints N] [--window N]
+"""
+
+import argparse
+import os
+import socket
+import threading
+import time
+import tty
+
+from bench_bridge_load import drain, free_port, start_server
+
+
+def read_lines(sock, buf, count):
+    while buf.count(b"\n") < count:
+        chunk = sock.recv(65536)
+        if not chunk:
+            raise RuntimeError("bridge closed the connection")
+        buf += chunk
+    *lines, rest = buf.split(b"\n", count)
+    return lines, bytearray(rest)
+
+
+def run(port, setpoints, window):
+    sock = socket.create_connection(("127.0.0.1", port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    buf = bytearray()
+    _, buf = read_lines(sock, buf, 1)  # HELLO
+    sock.sendall(b"ENABLE\n")
+    _, buf = read_lines(sock, buf, 1)
+
+    duties = [(i % 100) / 2000.0 for i in range(setpoints)]
+    start = time.perf_counter()
+    sent = acked = 0
+    while acked < setpoints:
+        # keep up to `window` commands in flight (window=1: lock-step)
+        burst = min(window - (sent - acked), setpoints - sent)
+        if burst > 0:
+            sock.sendall(
+                "".join(f"DUTY {d:.4f}\n" for d in duties[sent : sent + burst]).encode()
+            )
+            sent += burst
+        lines, buf = read_lines(sock, buf, 1)
+        expected = f"ACK DUTY {duties[acked]:.4f}".encode()
+        if lines[0] != expected:
+            raise RuntimeError(f"out of order ACK: {lines[0]!r} != {expected!r}")
+        acked += 1
+    elapsed = time.perf_counter() - start
+
+    sock.sendall(b"STOP\n")
+    read_lines(sock, buf, 1)
+    sock.close()
+    return setpoints / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", choices=("threaded", "asyncio"), default="threaded")
+    parser.add_argument("--setpoints", type=int, default=20000)
+    parser.add_argument("--window", type=int, default=64)
+    args = parser.parse_args()
+
+    master, slave = os.openpty()
+    tty.setraw(master)
+    stop = threading.Event()
+    threading.Thread(target=drain, args=(master, stop), daemon=True).start()
+
+    port = free_port()
+    proc = start_server(args.mode, port, os.ttyname(slave))
+    try:
+        lockstep = run(port, args.setpoints // 4, 1)
+        pipelined = run(port, args.setpoints, args.window)
+    finally:
+        proc.terminate()
+        proc.wait()
+        stop.set()
+        os.close(slave)
+
+    print(f"mode={args.mode}")
+    print(f"  lock-step (wait for each ACK) {lockstep:>10,.0f} setpoints/s")
+    print(
+        f"  pipelined (window {args.window:>4})       {pipelined:>10,.0f} setpoints/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
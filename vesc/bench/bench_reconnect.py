@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+bench_reconnect.py
+Cost of a USB blip: a simulated VESC is unplugged and re-enumerates after
+--replug-ms; measured from the unplug to the next good GET_VALUES reply.
+ReconnectingSerial (immediate retry, jittered backoff) vs the readers' old
+loop (reply timeout, close, sleep RECONNECT_DELAY, reopen).
+
+Usage: python3 vesc/bench/bench_reconnect.py [--blips N] [--replug-ms MS]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import serial
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+sys.path.insert(0, str(VENDOR_DIR))
+
+from bench_bridge_load import percentile
+from serial_transport import GET_VALUES_PACKET, ReconnectingSerial
+from vesc_simulator import VescSimulator
+from vescminimal_nov20 import VescFrameDecoder
+
+RECONNECT_DELAY = 2.0  # telemetry_reader_autoreconnect*.py
+
+
+class Device:
+    """A simulator behind a stable symlink that can be unplugged"""
+
+    def __init__(self, path):
+        self.path = path
+        self.sim = VescSimulator().start()
+        os.symlink(self.sim.port, path)
+
+    def blip(self, replug):
+        os.unlink(self.path)
+        self.sim.close()
+
+        def replug_later():
+            time.sleep(replug)
+            self.sim = VescSimulator().start()
+            os.symlink(self.sim.port, self.path)
+
+        threading.Thread(target=replug_later).start()
+
+    def close(self):
+        self.sim.close()
+        os.unlink(self.path)
+
+
+def legacy_get_values(sp, decoder, timeout=2.0):
+    sp.write(GET_VALUES_PACKET)
+    start = time.time()
+    while True:
+        decoder.read_from(sp, 1024)
+        if any(True for _ in decoder.frames()):
+            return
+        if time.time() - start > timeout:
+            raise TimeoutError("No response from VESC")
+
+
+def legacy_open(path):
+    while True:
+        try:
+            return serial.Serial(path, 115200, timeout=0.1)
+        except Exception:
+            time.sleep(RECONNECT_DELAY)
+
+
+def run_legacy(device, blips, replug):
+    sp = legacy_open(device.path)
+    decoder = VescFrameDecoder()
+    costs = []
+    for _ in range(blips):
+        device.blip(replug)
+        start = time.monotonic()
+        while True:
+            try:
+                legacy_get_values(sp, decoder)
+                break
+            except Exception:
+                try:
+                    sp.close()
+                except Exception:
+                    pass
+                time.sleep(RECONNECT_DELAY)
+                sp = legacy_open(device.path)
+                decoder = VescFrameDecoder()
+        costs.append(time.monotonic() - start)
+    sp.close()
+    return costs
+
+
+def run_reconnecting(device, blips, replug):
+    link = ReconnectingSerial(device.path, backoff_initial=0.002, backoff_max=0.5)
+    costs = []
+    for _ in range(blips):
+        device.blip(replug)
+        start = time.monotonic()
+        while True:
+            try:
+                link.get_values(timeout=0.5)
+                break
+            except (TimeoutError, ConnectionError):
+                pass
+        costs.append(time.monotonic() - start)
+    stats = link.stats()
+    link.close()
+    return costs, stats
+
+
+def report(name, costs):
+    costs.sort()
+    print(
+        f"{name:<20} blips {len(costs):>3}  p50 {percentile(costs, 50) * 1e3:8.1f} ms  "
+        f"max {costs[-1] * 1e3:8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blips", type=int, default=20)
+    parser.add_argument("--legacy-blips", type=int, default=2)
+    parser.add_argument("--replug-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    replug = args.replug_ms / 1e3
+
+    with tempfile.TemporaryDirectory() as tmp:
+        device = Device(os.path.join(tmp, "ttyVESC"))
+        try:
+            costs, stats = run_reconnecting(device, args.blips, replug)
+            report("ReconnectingSerial", costs)
+            print(
+                f"{'':<20} attempts {stats['attempts']}  "
+                f"reconnect mean {stats['reconnect_mean_ms']:.1f} ms  "
+                f"max {stats['reconnect_max_ms']:.1f} ms"
+            )
+            report("legacy loop", run_legacy(device, args.legacy_blips, replug))
+        finally:
+            time.sleep(replug * 2)
+            device.close()
+
+
+if __name__ == "__main__":
+    main()
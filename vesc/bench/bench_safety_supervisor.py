@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+bench_safety_supervisor.py
+Per-cycle cost of the duty sender with and without the safety supervisor
+(heartbeat check, timed write, trace record), and how long a silent client
+keeps the motor moving: forever without it, heartbeat timeout plus the
+ramp with it.
+
+Usage: python3 vesc/bench/bench_safety_supervisor.py [--cycles N]
+           [--heartbeat S] [--ramp-rate R]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+sys.path.insert(0, str(VENDOR_DIR))
+
+from bridge_protocol import OP_ENABLE, BridgeState, apply_command
+from duty_scheduler import DeadlineScheduler
+from safety_supervisor import SafetySupervisor
+
+
+def moving_state(duty):
+    state = BridgeState()
+    apply_command(state, OP_ENABLE)
+    state.publish(True, duty)
+    return state
+
+
+def cycle_cost(cycles):
+    state = moving_state(0.05)
+    sent = []
+    write = sent.append
+
+    start = time.perf_counter()
+    for _ in range(cycles):
+        write(state.output_duty())
+    bare = (time.perf_counter() - start) / cycles
+
+    supervisor = SafetySupervisor(state, heartbeat_timeout=3600, verbose=False)
+    start = time.perf_counter()
+    for _ in range(cycles):
+        supervisor.send(write)
+    supervised = (time.perf_counter() - start) / cycles
+
+    start = time.perf_counter()
+    rows = supervisor.trace.rows()
+    dumped = time.perf_counter() - start
+    return bare, supervised, len(rows), dumped
+
+
+def silent_client(heartbeat, ramp_rate, rate_hz, limit):
+    """Seconds a motor keeps a non-zero duty after its client goes quiet"""
+    state = moving_state(0.05)
+    supervisor = SafetySupervisor(
+        state, heartbeat_timeout=heartbeat, ramp_rate=ramp_rate, verbose=False
+    )
+    outputs = []
+    scheduler = DeadlineScheduler(rate_hz)
+    start = time.monotonic()
+
+    def tick():
+        outputs.append((time.monotonic() - start, supervisor.send(lambda d: None)))
+
+    scheduler.run(
+        tick,
+        lambda: time.monotonic() - start < limit
+        and (not outputs or outputs[-1][1] != 0.0),
+    )
+    return outputs[-1][0] if outputs[-1][1] == 0.0 else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument("--cycles", type=int, default=200000)
+    parser.add_argument("--heartbeat", type=float, default=0.5)
+    parser.add_argument("--ramp-rate", type=float, default=0.1)
+    parser.add_argument("--rate", type=float, default=100.0)
+    args = parser.parse_args()
+
+    bare, supervised, rows, dumped = cycle_cost(args.cycles)
+    print(f"duty sender cycle, {args.cycles} cycles")
+    print(f"  bare mailbox read + write   {bare * 1e6:7.2f} us")
+    print(f"  supervised send()           {supervised * 1e6:7.2f} us")
+    print(f"  trace snapshot ({rows} rows)  {dumped * 1e3:7.2f} ms")
+
+    limit = args.heartbeat + 0.05 / args.ramp_rate + 1.0
+    stopped = silent_client(args.heartbeat, args.ramp_rate, args.rate, limit)
+    print(f"\nsilent client at duty 0.05, {args.rate:g} Hz sender")
+    print("  without supervisor          still moving (duty held until DISABLE)")
+    print(
+        f"  heartbeat {args.heartbeat:g} s, ramp {args.ramp_rate:g}/s   "
+        f"zero after {stopped:.3f} s"
+        if stopped is not None
+        else f"  still moving after {limit:.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+bench_serial_io.py
+Duty setpoints plus GET_VALUES polling against a pseudo-terminal VESC that
+answers every GET_VALUES: one ser.write per frame with the poller doing its
+own write/read cycle (VESC.set_duty + reader script loop) vs
+SerialIOScheduler batching both into shared writes.
+
+A pty has no baud rate, so the numbers show write-call and latency
+overhead, not wire time saved.
+
+Usage: python3 vesc/bench/bench_serial_io.py [--seconds S] [--producers N]
+           [--duty-hz HZ] [--poll-hz HZ] [--linger-us US]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import tty
+from pathlib import Path
+
+import serial
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+sys.path.insert(0, str(VENDOR_DIR))
+
+from bench_bridge_load import percentile
+from vescminimal_nov20 import (
+    COMM_GET_VALUES,
+    VESC,
+    VescFrameDecoder,
+    build_packet,
+)
+
+VALUES_REPLY = build_packet(COMM_GET_VALUES, bytes(70))
+GET_VALUES_PACKET = build_packet(COMM_GET_VALUES, b"")
+
+
+class FakeVesc:
+    """Master side of the pty: counts duty frames, answers GET_VALUES"""
+
+    def __init__(self, master):
+        self.master = master
+        self.frames = 0
+        self.reads = 0
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        decoder = VescFrameDecoder()
+        while not self.stop.is_set():
+            try:
+                data = os.read(self.master, 65536)
+            except OSError:
+                return
+            self.reads += 1
+            replies = 0
+            for payload in decoder.decode(data):
+                self.frames += 1
+                if payload[0] == COMM_GET_VALUES:
+                    replies += 1
+            if replies:
+                os.write(self.master, VALUES_REPLY * replies)
+
+
+class CountingSerial(serial.Serial):
+    writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+
+def paced(rate_hz, seconds, action):
+    period = 1.0 / rate_hz
+    start = time.monotonic()
+    deadline = start
+    end = start + seconds
+    while deadline < end:
+        action()
+        deadline += period
+        delay = deadline - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def run_load(args, set_duty, poll):
+    threads = [threading.Thread(target=paced, args=(args.poll_hz, args.seconds, poll))]
+    for _ in range(args.producers):
+        threads.append(
+            threading.Thread(target=paced, args=(args.duty_hz, args.seconds, set_duty))
+        )
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_direct(port, args):
+    vesc = VESC(port)
+    vesc.ser.close()
+    vesc.ser = CountingSerial(port, timeout=0.1)
+    lock = threading.Lock()
+    rtts = []
+    duty_lat = []
+    decoder = VescFrameDecoder()
+
+    def set_duty():
+        start = time.perf_counter()
+        with lock:
+            vesc.set_duty(0.02)
+        duty_lat.append(time.perf_counter() - start)
+
+    def poll():
+        start = time.perf_counter()
+        with lock:
+            vesc.ser.write(GET_VALUES_PACKET)
+        while True:
+            decoder.read_from(vesc.ser, max(1, vesc.ser.in_waiting))
+            if any(True for _ in decoder.frames()):
+                break
+        rtts.append(time.perf_counter() - start)
+
+    run_load(args, set_duty, poll)
+    writes = vesc.ser.writes
+    vesc.ser.close()
+    return writes, duty_lat, rtts, {}
+
+
+def run_scheduled(port, args):
+    vesc = VESC(port)
+    vesc.ser.close()
+    vesc.ser = CountingSerial(port, timeout=0.1)
+    io = vesc.io_scheduler(linger=args.linger_us * 1e-6)
+    rtts = []
+
+    def poll():
+        start = time.perf_counter()
+        io.get_values(timeout=1.0)
+        rtts.append(time.perf_counter() - start)
+
+    run_load(args, lambda: io.set_duty(0.02), poll)
+    io.close()
+    writes = vesc.ser.writes
+    vesc.ser.close()
+    stats = io.stats()
+    return writes, None, rtts, stats
+
+
+def report(name, writes, frames, duty_lat, rtts, stats, seconds):
+    rtts.sort()
+    print(
+        f"{name:<10} writes {writes:>6} ({writes / seconds:>6.0f}/s)  "
+        f"frames at VESC {frames:>6}  "
+        f"poll rtt p50 {percentile(rtts, 50) * 1e3:6.3f} ms  "
+        f"p99 {percentile(rtts, 99) * 1e3:6.3f} ms"
+    )
+    if duty_lat:
+        duty_lat.sort()
+        print(
+            f"{'':<10} setpoint write p50 {percentile(duty_lat, 50) * 1e6:6.0f} us  "
+            f"p99 {percentile(duty_lat, 99) * 1e6:6.0f} us"
+        )
+    if stats:
+        print(
+            f"{'':<10} setpoint to port mean {stats['latency_mean_us']:6.0f} us  "
+            f"max {stats['latency_max_us']:6.0f} us  "
+            f"coalesced {stats['coalesced']}  "
+            f"frames/write {stats['frames_per_write']:.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--producers", type=int, default=4, help="setpoint threads")
+    parser.add_argument("--duty-hz", type=float, default=500.0, help="per producer")
+    parser.add_argument("--poll-hz", type=float, default=100.0)
+    parser.add_argument("--linger-us", type=float, default=500.0)
+    args = parser.parse_args()
+
+    for name, runner in (("direct", run_direct), ("scheduled", run_scheduled)):
+        master, slave = os.openpty()
+        tty.setraw(master)
+        fake = FakeVesc(master)
+        try:
+            writes, duty_lat, rtts, stats = runner(os.ttyname(slave), args)
+            time.sleep(0.1)
+        finally:
+            fake.stop.set()
+            os.close(slave)
+            os.close(master)
+        report(name, writes, fake.frames, duty_lat, rtts, stats, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+bench_telemetry_analysis.py
+Time and peak memory to analyse a long 1 kHz recording (default one hour,
+a duty step every 10 s): load, per-step stats, step responses and a
+100 Hz resample, vs a per-row Python loop computing just the step means.
+
+Usage: python3 vesc/bench/bench_telemetry_analysis.py [--hours H]
+"""
+
+import argparse
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+sys.path.insert(0, str(VENDOR_DIR))
+
+from telemetry_analysis import load, resample, step_responses, step_stats
+from telemetry_recorder import TelemetryRecorder, TelemetryRun
+
+RATE = 1000
+STEP_SECONDS = 10
+
+
+def record(path, rows):
+    with TelemetryRecorder(path) as rec:
+        block = RATE * STEP_SECONDS
+        level = 0.0
+        for start in range(0, rows, block):
+            n = min(block, rows - start)
+            seg = np.arange(n) / RATE
+            duty = 0.01 * (1 + (start // block) % 5)
+            rpm = duty * 1e5 + (level - duty * 1e5) * np.exp(-seg / 0.15)
+            level = rpm[-1]
+            current = 2.0 + 0.3 * np.sin(2 * np.pi * 50 * seg)
+            t = 1.7e9 + (start + np.arange(n)) / RATE
+            for row in zip(t.tolist(), [duty] * n, rpm.tolist(), current.tolist()):
+                rec.append(*row)
+
+
+def python_step_means(path):
+    means = []
+    last, total, count = None, 0.0, 0
+    for _, duty, rpm, *_ in TelemetryRun(path).rows():
+        if duty != last and count:
+            means.append(total / count)
+            total, count = 0.0, 0
+        last = duty
+        total += rpm
+        count += 1
+    means.append(total / count)
+    return means
+
+
+def timed(label, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    print(f"  {label:<28} {time.perf_counter() - start:8.3f} s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hours", type=float, default=1.0)
+    args = parser.parse_args()
+    rows = int(args.hours * 3600 * RATE)
+
+    with tempfile.TemporaryDirectory() as path:
+        print(f"recording {rows:,} rows ...")
+        record(path, rows)
+        base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        tel = timed("load (lazy)", load, path)
+        stats = timed("step_stats", step_stats, tel)
+        timed("step_responses", step_responses, tel)
+        timed("resample rpm to 100 Hz", resample, tel.t, tel.rpm, 100.0)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(
+            f"  {len(stats['duty'])} steps, peak RSS growth {(peak - base) / 1024:.0f} MiB"
+        )
+
+        means = timed("python row loop (means only)", python_step_means, path)
+        assert np.allclose(means, stats["rpm_mean"], rtol=1e-6)
+
+
+if __name__ == "__main__":
+    main()
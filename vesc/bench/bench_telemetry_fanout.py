@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+bench_telemetry_fanout.py
+Telemetry fan-out from vesc_tcp_server.py --telemetry-hz to N subscribers,
+some of which never read. Reports per-subscriber sample rate, sample age
+on arrival and seq gaps for the readers, and the server's drop count.
+
+Usage: python3 vesc/bench/bench_telemetry_fanout.py [--mode threaded|asyncio]
+           [--subscribers N] [--stalled N] [--hz HZ] [--seconds S]
+"""
+
+import argparse
+import json
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+sys.path.insert(0, str(VENDOR_DIR))
+
+from bench_bridge_load import free_port, percentile, start_server
+from vesc_simulator import VescSimulator
+
+
+def subscribe(port):
+    sock = socket.socket()
+    # small window before connect, so a stalled reader backs up quickly
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.connect(("127.0.0.1", port))
+    sock.sendall(b"subscribe\n")
+    return sock
+
+
+def read_samples(sock, until, ages, seqs):
+    sockfile = sock.makefile("rb")
+    while time.monotonic() < until:
+        line = sockfile.readline()
+        if not line:
+            return
+        if line.startswith(b"{"):
+            sample = json.loads(line)
+            ages.append(time.time() - sample["t"])
+            seqs.append(sample["seq"])
+
+
+def server_stats(port):
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        sockfile = sock.makefile("rb")
+        sockfile.readline()  # HELLO
+        sock.sendall(b"stats\n")
+        return json.loads(sockfile.readline().split(b" ", 1)[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", choices=("threaded", "asyncio"), default="threaded")
+    parser.add_argument("--subscribers", type=int, default=20)
+    parser.add_argument("--stalled", type=int, default=5)
+    parser.add_argument("--hz", type=float, default=200.0)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    with VescSimulator(command_timeout=None) as sim:
+        port = free_port()
+        proc = start_server(args.mode, port, sim.port, ("--telemetry-hz", str(args.hz)))
+        try:
+            stalled = [subscribe(port) for _ in range(args.stalled)]
+            readers = [subscribe(port) for _ in range(args.subscribers - args.stalled)]
+            until = time.monotonic() + args.seconds
+            results = [([], []) for _ in readers]
+            threads = [
+                threading.Thread(target=read_samples, args=(sock, until, *result))
+                for sock, result in zip(readers, results)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stats = server_stats(port)
+            for sock in stalled + readers:
+                sock.close()
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    ages = sorted(age for result in results for age in result[0])
+    gaps = sum(sum(b - a - 1 for a, b in zip(seqs, seqs[1:])) for _, seqs in results)
+    rates = [len(seqs) / args.seconds for _, seqs in results]
+    print(
+        f"mode={args.mode} hz={args.hz:g} subscribers={args.subscribers} "
+        f"(stalled {args.stalled})"
+    )
+    print(
+        f"  readers: {min(rates):.0f}-{max(rates):.0f} samples/s, "
+        f"seq gaps {gaps}, age p50 {percentile(ages, 50) * 1e3:.2f} ms "
+        f"p99 {percentile(ages, 99) * 1e3:.2f} ms"
+    )
+    print(f"  server:  {stats['telemetry']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+bench_telemetry_recorder.py
+Samples/s written and read back: automatedTelemetry.py's csv.DictWriter
+row (ISO timestamp + raw JSON line) vs the columnar TelemetryRecorder,
+and reloading the rpm column from each (csv.DictReader vs mmap, plus
+numpy.memmap when numpy is installed).
+
+Usage: python3 vesc/bench/bench_telemetry_recorder.py [--samples N]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+sys.path.insert(0, str(VENDOR_DIR))
+
+from telemetry_recorder import TelemetryRecorder, TelemetryRun, chunk_file, export_csv
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def samples(count):
+    t0 = time.time()
+    for i in range(count):
+        yield {
+            "t": t0 + i * 0.001,
+            "duty": (i % 50) / 1000.0,
+            "rpm": float(i % 5000),
+            "current": (i % 300) / 100.0,
+            "v_in": 24.0,
+            "fault": 0,
+        }
+
+
+def write_csv(path, count):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(
+            f, fieldnames=["timestamp", "duty", "rpm", "current", "raw"]
+        )
+        writer.writeheader()
+        for s in samples(count):
+            line = json.dumps(s)
+            writer.writerow(
+                {
+                    "timestamp": datetime.now().isoformat(),
+                    "duty": s["duty"],
+                    "rpm": s["rpm"],
+                    "current": s["current"],
+                    "raw": line,
+                }
+            )
+
+
+def write_columns(path, count):
+    with TelemetryRecorder(path) as rec:
+        append = rec.append
+        for s in samples(count):
+            append(s["t"], s["duty"], s["rpm"], s["current"], s["v_in"], s["fault"])
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return sum(float(row["rpm"]) for row in csv.DictReader(f))
+
+
+def read_columns(path):
+    return sum(TelemetryRun(path).column("rpm"))
+
+
+def read_numpy(path):
+    run = TelemetryRun(path)
+    return float(
+        sum(
+            np.memmap(
+                chunk_file(path, "rpm", i), dtype="<f4", mode="r", shape=(c["rows"],)
+            )
+            .astype(np.float64)
+            .sum()
+            for i, c in enumerate(run.chunks)
+        )
+    )
+
+
+def du(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, n)) for n in os.listdir(path))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=500000)
+    args = parser.parse_args()
+    n = args.samples
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "telemetry.csv")
+        run_path = os.path.join(tmp, "run")
+
+        elapsed, _ = timed(write_csv, csv_path, n)
+        print(
+            f"write csv.DictWriter   {n / elapsed:>12,.0f} samples/s  {du(csv_path) / n:6.1f} B/sample"
+        )
+        elapsed, _ = timed(write_columns, run_path, n)
+        print(
+            f"write TelemetryRecorder{n / elapsed:>12,.0f} samples/s  {du(run_path) / n:6.1f} B/sample"
+        )
+
+        elapsed, total_csv = timed(read_csv, csv_path)
+        print(f"read rpm csv.DictReader{n / elapsed:>12,.0f} samples/s")
+        elapsed, total_col = timed(read_columns, run_path)
+        print(f"read rpm mmap column   {n / elapsed:>12,.0f} samples/s")
+        assert total_col == total_csv
+        if np is not None:
+            elapsed, total_np = timed(read_numpy, run_path)
+            print(f"read rpm numpy.memmap  {n / elapsed:>12,.0f} samples/s")
+            assert total_np == total_csv
+
+        elapsed, _ = timed(export_csv, run_path, os.path.join(tmp, "export.csv"))
+        print(f"export to CSV          {n / elapsed:>12,.0f} samples/s")
+
+
+if __name__ == "__main__":
+    main()
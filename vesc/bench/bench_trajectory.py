@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+bench_trajectory.py
+The ramp scripts' "send, time.sleep(delay)" loop vs trajectory.play() for
+the same trapezoid, sent over serial to the pty VESC simulator: drift of
+the whole profile and lateness of each setpoint against its planned time.
+--work-us adds per-setpoint work (logging, telemetry) to the send.
+
+Usage: python3 vesc/bench/bench_trajectory.py [--rate HZ] [--ramp S]
+           [--hold S] [--work-us US]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+sys.path.insert(0, str(VENDOR_DIR))
+
+from bench_bridge_load import percentile
+from trajectory import play, trapezoid
+from vesc_simulator import VescSimulator
+from vescminimal_nov20 import VESC
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def sleep_loop(ramp, send):
+    """What motor_ramp_test.py / motor_test_ramp.py / pycan.py did"""
+    origin = time.monotonic()
+    actual = []
+    for duty in ramp.values:
+        actual.append(time.monotonic() - origin)
+        send(duty)
+        time.sleep(ramp.period)
+    return actual
+
+
+def report(name, ramp, late, end, skipped=0):
+    late = sorted(late)
+    drift = end - ramp.duration
+    print(
+        f"{name:<10} end drift {drift * 1e3:+8.1f} ms  "
+        f"late p50 {percentile(late, 50) * 1e3:7.2f} ms  "
+        f"p99 {percentile(late, 99) * 1e3:7.2f} ms  "
+        f"max {late[-1] * 1e3:7.2f} ms  skipped {skipped}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=float, default=100.0, help="setpoints/s")
+    parser.add_argument("--ramp", type=float, default=1.0, help="seconds each way")
+    parser.add_argument("--hold", type=float, default=1.0)
+    parser.add_argument("--work-us", type=float, default=500.0)
+    args = parser.parse_args()
+
+    ramp = trapezoid(0.05, args.ramp, args.hold, args.rate)
+    print(f"{len(ramp)} setpoints, {ramp.duration:.2f} s planned at {args.rate:g} Hz")
+    with VescSimulator() as sim:
+        vesc = VESC(sim.port)
+        work = args.work_us * 1e-6
+
+        def send(duty):
+            vesc.set_duty(duty)
+            busy(work)
+
+        try:
+            actual = sleep_loop(ramp, send)
+            late = [a - k * ramp.period for k, a in enumerate(actual)]
+            report("sleep loop", ramp, late, actual[-1])
+            playback = play(ramp, send)
+            report(
+                "play()", ramp, playback.lateness, playback.actual[-1], playback.skipped
+            )
+        finally:
+            vesc.set_duty(0.0)
+            vesc.ser.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+bench_writer_jitter.py
+Duty-sender lateness while command handlers stall holding state.lock (as a
+handler blocked in sendall to a slow client used to): the old sender took the
+lock every tick, the current one reads the setpoint mailbox without locking.
+
+Usage: python3 vesc/bench/bench_writer_jitter.py [--stallers N] [--stall-ms MS]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import vesc_tcp_server
+from bridge_protocol import BridgeState
+from duty_scheduler import DeadlineScheduler
+
+
+class NullVesc:
+    def set_duty(self, duty):
+        pass
+
+
+def locked_duty_sender(vesc, scheduler, running):
+    """duty_sender as it was before the mailbox"""
+    state = vesc_tcp_server.state
+
+    def send_once():
+        with state.lock:
+            duty = state.output_duty()
+        vesc.set_duty(duty)
+
+    scheduler.run(send_once, running)
+
+
+def staller(state, stall, stop):
+    while not stop.is_set():
+        with state.lock:
+            state.publish(True, 0.01)
+            time.sleep(stall)
+        time.sleep(0.0005)
+
+
+def run(name, sender, args):
+    vesc_tcp_server.state = BridgeState()
+    vesc_tcp_server.running = True
+    stop = threading.Event()
+    for _ in range(args.stallers):
+        threading.Thread(
+            target=staller,
+            args=(vesc_tcp_server.state, args.stall_ms / 1e3, stop),
+            daemon=True,
+        ).start()
+
+    scheduler = DeadlineScheduler(args.rate)
+    timer = threading.Timer(
+        args.seconds, lambda: setattr(vesc_tcp_server, "running", False)
+    )
+    timer.start()
+    sender(NullVesc(), scheduler)
+    stop.set()
+
+    stats = scheduler.stats()
+    print(
+        f"{name:<16} ticks {stats['ticks']:>5}  overruns {stats['overruns']:>4}  "
+        f"missed {stats['missed']:>5}  late mean {stats['late_mean_us']:>8.0f} us  "
+        f"max {stats['late_max_us'] / 1e3:>7.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--stallers", type=int, default=8)
+    parser.add_argument("--stall-ms", type=float, default=20.0)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--rate", type=float, default=200.0)
+    args = parser.parse_args()
+
+    run(
+        "locked (before)",
+        lambda vesc, sched: locked_duty_sender(
+            vesc, sched, lambda: vesc_tcp_server.running
+        ),
+        args,
+    )
+    run("mailbox (now)", vesc_tcp_server.duty_sender, args)
+
+
+if __name__ == "__main__":
+    main()
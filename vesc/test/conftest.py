@@ -0,0 +1,88 @@
+"""
+conftest.py:
+
+Puts the vendored VESC modules and the repository root (vesc_tcp_server.py)
+on sys.path so the bridge tests can import them the way the server does,
+and provides a live bridge on a simulated VESC for the client tests.
+
+Loads the pytest_vesc plugin. Every test here runs against simulators,
+ptys and loopback sockets, so all are marked vesc_sim and hil_runner.py
+may spread them across processes; the ones measuring real-time jitter are
+vesc_exclusive instead and run once the parallel workers are done.
+"""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+REPO_ROOT = VENDOR_DIR.parent.parent
+sys.path.insert(0, str(VENDOR_DIR))
+sys.path.insert(1, str(REPO_ROOT))
+
+
+def pytest_addoption(parser, pluginmanager):
+    # pytest_plugins is only honoured in the rootdir conftest; registering
+    # here replays the plugin's addoption/configure hooks
+    if not pluginmanager.has_plugin("pytest_vesc"):
+        import pytest_vesc
+
+        pluginmanager.register(pytest_vesc, "pytest_vesc")
+
+
+def pytest_collection_modifyitems(items):
+    here = Path(__file__).parent
+    for item in items:
+        if here not in Path(str(item.fspath)).parents:
+            continue
+        if not any(
+            item.get_closest_marker(name)
+            for name in ("vesc_hardware", "vesc_exclusive")
+        ):
+            item.add_marker(pytest.mark.vesc_sim)
+
+
+@pytest.fixture
+def bridge(request):
+    """
+    (host, port) of an AsyncBridgeServer with telemetry, on its own loop;
+    parametrize it indirectly with a dict of extra server arguments
+    """
+    extra = getattr(request, "param", {})
+    from bridge_async import AsyncBridgeServer, AsyncSerialTransport
+    from vesc_simulator import VescSimulator
+
+    with VescSimulator() as sim:
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        holder = {}
+
+        async def start():
+            transport = AsyncSerialTransport(sim.port)
+            server = AsyncBridgeServer(
+                transport,
+                port=0,
+                send_period=0.01,
+                verbose=False,
+                telemetry_hz=100,
+                **extra,
+            )
+            await server.start()
+            holder.update(transport=transport, server=server)
+            ready.set()
+
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        asyncio.run_coroutine_threadsafe(start(), loop)
+        assert ready.wait(2.0)
+        try:
+            yield "127.0.0.1", holder["server"].port
+        finally:
+            asyncio.run_coroutine_threadsafe(holder["server"].close(), loop).result(2)
+            holder["transport"].close()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(2.0)
+            loop.close()
@@ -0,0 +1,130 @@
+"""
+test_binary_protocol.py:
+
+Runs the same command scripts through the text and binary encodings and
+checks that both leave the bridge in the same state with equivalent replies.
+"""
+
+import math
+import socket
+import struct
+import threading
+
+import vesc_tcp_server
+from bridge_protocol import (
+    ACK_BINARY,
+    BINARY,
+    BINARY_FRAME,
+    HELLO,
+    OP_DUTY,
+    OP_ENABLE,
+    OP_PING,
+    OP_STOP,
+    ST_BAD_VALUE,
+    ST_NOT_ENABLED,
+    ST_OK,
+    ST_UNKNOWN_CMD,
+    TEXT,
+    TEXT_OPCODES,
+    BinaryFramer,
+    BridgeSession,
+    BridgeState,
+    encode_binary,
+)
+
+# (text line, opcode, value); values are exact in F32
+SCRIPT = [
+    ("duty 0.03125", OP_DUTY, 0.03125),
+    ("ping", OP_PING, 0.0),
+    ("enable", OP_ENABLE, 0.0),
+    ("duty 0.03125", OP_DUTY, 0.03125),
+    ("duty -0.5", OP_DUTY, -0.5),
+    ("duty nan", OP_DUTY, math.nan),
+    ("duty inf", OP_DUTY, math.inf),
+    ("spin", 99, 0.0),
+    ("duty 0.015625", OP_DUTY, 0.015625),
+    ("disable", TEXT_OPCODES["disable"], 0.0),
+    ("duty 0.01", OP_DUTY, 0.01),
+    ("enable", OP_ENABLE, 0.0),
+    ("duty 0.25", OP_DUTY, 0.25),
+    ("stop", OP_STOP, 0.0),
+]
+
+TEXT_FOR_STATUS = {
+    ST_NOT_ENABLED: b"ERR NOT_ENABLED",
+    ST_BAD_VALUE: b"ERR BAD_VALUE",
+    ST_UNKNOWN_CMD: b"ERR UNKNOWN_CMD",
+}
+
+
+def _f32(value):
+    return struct.unpack("<f", struct.pack("<f", value))[0]
+
+
+def _binary_session():
+    session = BridgeSession(BridgeState())
+    assert session.feed(b"BINARY\n") == ACK_BINARY
+    assert session.mode == BINARY
+    return session
+
+
+def test_encodings_behave_identically():
+    text = BridgeSession(BridgeState())
+    binary = _binary_session()
+    framer = BinaryFramer()
+
+    for seq, (line, opcode, value) in enumerate(SCRIPT):
+        text_reply = text.feed(line.encode() + b"\n").strip()
+        frames = framer.feed(binary.feed(encode_binary(opcode, seq, value)))
+        assert len(frames) == 1
+        r_opcode, status, r_seq, _, duty = frames[0]
+
+        assert (r_opcode, r_seq) == (opcode, seq)
+        assert text.state.enabled == binary.state.enabled, line
+        assert text.state.last_duty == binary.state.last_duty, line
+        assert duty == _f32(binary.state.last_duty)
+        if status == ST_OK:
+            assert not text_reply.startswith(b"ERR"), line
+        else:
+            assert text_reply == TEXT_FOR_STATUS[status], line
+        if opcode == OP_DUTY and status == ST_OK:
+            assert text_reply == f"ACK DUTY {duty:.4f}".encode()
+    assert text.mode == TEXT
+
+
+def test_binary_frames_split_and_pipelined():
+    session = BridgeSession(BridgeState())
+    stream = b"BINARY\n" + b"".join(
+        encode_binary(op, i, v)
+        for i, (_, op, v) in enumerate(SCRIPT[2:5])  # enable, duty, duty
+    )
+    out = b""
+    for i in range(0, len(stream), 5):
+        out += session.feed(stream[i : i + 5])
+    assert out.startswith(ACK_BINARY)
+    replies = list(BINARY_FRAME.iter_unpack(out[len(ACK_BINARY) :]))
+    assert [r[2] for r in replies] == [0, 1, 2]
+    assert replies[-1][4] == _f32(-0.05)
+
+
+def test_negotiation_over_socket():
+    vesc_tcp_server.verbose = False
+    vesc_tcp_server.state.enabled = False
+    client, server = socket.socketpair()
+    worker = threading.Thread(
+        target=vesc_tcp_server.handle_client, args=(server, "test"), daemon=True
+    )
+    worker.start()
+    try:
+        client.sendall(b"binary\n" + encode_binary(OP_PING, 7, timestamp_us=1234))
+        want = len(HELLO) + len(ACK_BINARY) + BINARY_FRAME.size
+        data = b""
+        while len(data) < want:
+            data += client.recv(4096)
+        assert data[: len(HELLO)] == HELLO
+        assert data[len(HELLO) : len(HELLO) + len(ACK_BINARY)] == ACK_BINARY
+        frame = BINARY_FRAME.unpack(data[-BINARY_FRAME.size :])
+        assert frame == (OP_PING, ST_OK, 7, 1234, 0.0)
+    finally:
+        client.close()
+        worker.join(2.0)
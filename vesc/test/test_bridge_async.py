@@ -0,0 +1,71 @@
+"""
+test_bridge_async.py:
+
+Runs the asyncio bridge against a pseudo-terminal standing in for the VESC.
+"""
+
+import asyncio
+import os
+import struct
+import tty
+
+from bridge_async import AsyncBridgeServer, AsyncSerialTransport
+from bridge_protocol import HELLO
+from vescminimal_nov20 import COMM_SET_DUTY, VescFrameDecoder
+
+
+def _duties(master):
+    decoder = VescFrameDecoder()
+    try:
+        while True:
+            decoder.feed(os.read(master, 4096))
+    except BlockingIOError:
+        pass
+    return [
+        struct.unpack(">f", p[1:])[0] for p in decoder.frames() if p[0] == COMM_SET_DUTY
+    ]
+
+
+async def _session(port, lines):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    assert await reader.readline() == HELLO
+    replies = []
+    for line in lines:
+        writer.write(line.encode() + b"\n")
+        replies.append(await reader.readline())
+    writer.close()
+    return replies
+
+
+def test_async_bridge():
+    master, slave = os.openpty()
+    tty.setraw(master)
+    os.set_blocking(master, False)
+
+    async def run():
+        transport = AsyncSerialTransport(os.ttyname(slave))
+        bridge = AsyncBridgeServer(transport, port=0, send_period=0.01, verbose=False)
+        await bridge.start()
+        try:
+            replies = await _session(bridge.port, ["duty 0.01", "enable", "duty 0.5"])
+            assert replies == [
+                b"ERR NOT_ENABLED\n",
+                b"ACK ENABLED\n",
+                b"ACK DUTY 0.0500\n",
+            ]
+            monitors = await asyncio.gather(
+                *[_session(bridge.port, ["ping"]) for _ in range(50)]
+            )
+            assert monitors == [[b"PONG\n"]] * 50
+            await asyncio.sleep(0.05)
+            assert abs(_duties(master)[-1] - 0.05) < 1e-6
+        finally:
+            await bridge.close()
+            transport.close()
+        assert _duties(master)[-1] == 0.0
+
+    try:
+        asyncio.run(run())
+    finally:
+        os.close(master)
+        os.close(slave)
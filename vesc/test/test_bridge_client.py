@@ -0,0 +1,101 @@
+"""
+test_bridge_client.py:
+
+Runs the sync and asyncio clients against the asyncio bridge on a
+simulated VESC: pipelined requests resolve in order with their own
+replies, ERR fails the future, binary replies match by sequence number,
+a cancelled request does not stop the reader and pushed telemetry comes
+out of the iterator.
+"""
+
+import asyncio
+
+import pytest
+
+from bridge_client import AsyncBridgeClient, BridgeClient, BridgeError, ClientProtocol
+
+
+def test_protocol_matches_text_fifo_and_binary_by_seq():
+    text = ClientProtocol()
+    text.encode("enable", token="a")
+    text.encode("duty", 0.5, token="b")
+    completed = text.feed(b"ACK ENABLED\nACK DU")
+    assert [(t, r.seq) for t, r in completed] == [("a", 1)]
+    completed = text.feed(b'TY 0.0500\n{"seq":1,"rpm":5}\n')
+    assert completed[0][0] == "b" and completed[0][1].duty == 0.05
+    assert list(text.samples) == [{"seq": 1, "rpm": 5}]
+
+    binary = ClientProtocol(binary=True)
+    first = binary.encode("PING", token="x")
+    second = binary.encode("DUTY", 0.01, token="y")
+    # replies out of order still find their requests
+    completed = binary.feed(second + first)
+    assert [(t, r.command) for t, r in completed] == [("y", "DUTY"), ("x", "PING")]
+    with pytest.raises(ValueError):
+        binary.encode("STATS")
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_sync_client_pipelines(bridge, binary):
+    with BridgeClient(*bridge, binary=binary) as client:
+        with pytest.raises(BridgeError) as err:
+            client.duty(0.01)
+        assert err.value.reply.error == "NOT_ENABLED"
+        client.enable()
+        futures = [client.submit("DUTY", i / 10000) for i in range(200)]
+        replies = [f.result(2.0) for f in futures]
+        assert [r.duty for r in replies] == pytest.approx(
+            [min(i / 10000, 0.05) for i in range(200)], abs=1e-4
+        )
+        assert [r.seq for r in replies] == sorted(r.seq for r in replies)
+        assert client.ping().ok
+        client.stop()
+
+
+def test_sync_client_survives_cancelled_requests(bridge):
+    with BridgeClient(*bridge) as client:
+        futures = [client.submit("PING") for _ in range(50)]
+        cancelled = [f.cancel() for f in futures]
+        assert any(cancelled)
+        assert client.ping().ok
+
+
+def test_sync_client_streams_telemetry(bridge):
+    with BridgeClient(*bridge) as client:
+        client.subscribe()
+        samples = []
+        for sample in client.telemetry(timeout=1.0):
+            samples.append(sample)
+            if len(samples) == 5:
+                break
+        assert [s["seq"] for s in samples] == sorted(s["seq"] for s in samples)
+        # replies still match while samples interleave
+        assert client.stats()["telemetry"]["subscribers"] == 1
+        assert client.unsubscribe().text == "ACK UNSUBSCRIBED"
+
+
+def test_async_client(bridge):
+    async def run():
+        async with await AsyncBridgeClient.connect(*bridge) as client:
+            await client.enable()
+            replies = await asyncio.gather(
+                *[client.submit("DUTY", i / 10000) for i in range(100)]
+            )
+            assert replies[-1].duty == pytest.approx(0.0099)
+            await client.subscribe()
+            seen = []
+            async for sample in client.telemetry():
+                seen.append(sample)
+                if len(seen) == 3:
+                    break
+            assert seen[0]["v_in"] == pytest.approx(24.0)
+            await client.stop()
+
+    asyncio.run(run())
+
+
+def test_connection_loss_fails_outstanding(bridge):
+    client = BridgeClient(*bridge)
+    client.close()
+    with pytest.raises(ConnectionError):
+        client.submit("PING")
@@ -0,0 +1,100 @@
+"""
+test_bridge_pool.py:
+
+Checks the bridge connection pool against a live bridge: sessions reuse
+warm connections, spread once one is full, share telemetry through one
+subscription, and maintenance drops dead and idle connections.
+"""
+
+import time
+
+import pytest
+
+from bridge_pool import BridgePool, close_pools, get_pool
+
+
+@pytest.fixture
+def pool(bridge):
+    host, port = bridge
+    pool = BridgePool(host, port, health_interval=60, idle_timeout=60)
+    yield pool
+    pool.close()
+
+
+def test_sessions_reuse_a_warm_connection(pool):
+    for i in range(10):
+        with pool.session() as session:
+            assert session.ping().ok
+    stats = pool.stats()
+    assert stats["opened"] == 1
+    assert stats["sessions_opened"] == 10
+    assert stats["sessions"] == 0
+
+
+def test_sessions_spread_then_share(bridge):
+    with BridgePool(*bridge, max_sessions=2, max_size=3, health_interval=60) as pool:
+        sessions = [pool.session() for _ in range(8)]
+        assert pool.size == 3
+        assert sorted(c.sessions for c in pool._connections) == [2, 3, 3]
+        sessions[0].enable()
+        futures = [s.submit("DUTY", 0.01) for s in sessions]
+        assert all(f.result(2.0).duty == pytest.approx(0.01) for f in futures)
+        sessions[0].stop()
+        for session in sessions:
+            session.release()
+        with pytest.raises(ConnectionError):
+            sessions[0].ping()
+
+
+def test_sessions_share_one_subscription(pool):
+    first = pool.session()
+    second = pool.session()
+    assert first.connection is second.connection
+    a = next(first.telemetry(timeout=1.0))
+    b = next(second.telemetry(timeout=1.0))
+    assert a["v_in"] == pytest.approx(24.0) and b["v_in"] == pytest.approx(24.0)
+    with pool.session() as observer:
+        assert observer.stats()["telemetry"]["subscribers"] == 1
+        first.release()
+        second.release()
+        time.sleep(0.05)
+        assert observer.stats()["telemetry"]["subscribers"] == 0
+
+
+def test_maintenance_drops_dead_and_idle(bridge):
+    # the maintainer thread checks every 30 s: only check() below runs
+    with BridgePool(*bridge, min_size=1, idle_timeout=60, health_interval=60) as pool:
+        pool.idle_timeout = 0.05
+        sessions = [pool.session() for _ in range(3)]
+        pool.max_sessions = 1  # force more connections for the next sessions
+        sessions += [pool.session(), pool.session()]
+        assert pool.size == 3
+        for session in sessions:
+            session.release()
+
+        pool._connections[0].client.close()
+        time.sleep(0.1)
+        pool.check()
+        stats = pool.stats()
+        assert stats["evicted_dead"] == 1
+        assert stats["evicted_idle"] == 1
+        assert pool.size == 1
+
+        pool.health_interval = 0.0
+        pool.idle_timeout = 60
+        pool.check()
+        assert pool.stats()["health_checks"] == 1
+        with pool.session() as session:
+            assert session.ping().ok
+
+
+def test_get_pool_is_shared(bridge):
+    try:
+        pool = get_pool(*bridge)
+        assert get_pool(*bridge) is pool
+        with pool.session() as session:
+            assert session.ping().ok
+    finally:
+        close_pools()
+    assert get_pool(*bridge) is not pool
+    close_pools()
@@ -0,0 +1,81 @@
+"""
+test_bridge_protocol.py:
+
+Checks the bridge command handling and its safety rules.
+"""
+
+from bridge_protocol import (
+    ACK_DISABLED,
+    ACK_ENABLED,
+    ACK_STOPPED,
+    ERR_BAD_VALUE,
+    ERR_LINE_TOO_LONG,
+    ERR_NOT_ENABLED,
+    ERR_UNKNOWN_CMD,
+    PONG,
+    BridgeState,
+    LineFramer,
+    handle_command,
+    handle_lines,
+)
+
+
+def test_duty_requires_enable():
+    state = BridgeState()
+    assert handle_command(state, "duty 0.01") == ERR_NOT_ENABLED
+    assert state.output_duty() == 0.0
+    assert handle_command(state, "ENABLE") == ACK_ENABLED
+    assert handle_command(state, "duty 0.01") == b"ACK DUTY 0.0100\n"
+    assert state.output_duty() == 0.01
+
+
+def test_clamp_and_bad_values():
+    state = BridgeState(max_duty=0.05)
+    handle_command(state, "enable")
+    assert handle_command(state, "duty 0.9") == b"ACK DUTY 0.0500\n"
+    assert handle_command(state, "duty -0.9") == b"ACK DUTY -0.0500\n"
+    assert handle_command(state, "duty") == ERR_BAD_VALUE
+    assert handle_command(state, "duty abc") == ERR_BAD_VALUE
+    assert handle_command(state, "duty nan") == ERR_BAD_VALUE
+    assert handle_command(state, "duty inf") == ERR_BAD_VALUE
+    assert state.last_duty == -0.05
+
+
+def test_stop_and_disable_force_zero():
+    for cmd, ack in (("stop", ACK_STOPPED), ("disable", ACK_DISABLED)):
+        state = BridgeState()
+        handle_command(state, "enable")
+        handle_command(state, "duty 0.03")
+        assert handle_command(state, cmd) == ack
+        assert not state.enabled
+        assert state.output_duty() == 0.0
+
+
+def test_misc():
+    state = BridgeState()
+    assert handle_command(state, "ping") == PONG
+    assert handle_command(state, "   ") is None
+    assert handle_command(state, "spin") == ERR_UNKNOWN_CMD
+
+
+def test_line_framer_splits_and_joins():
+    framer = LineFramer()
+    assert framer.feed(b"duty 0.01\nduty 0.") == ["duty 0.01"]
+    assert framer.feed(b"02\r\n\nping") == ["duty 0.02", ""]
+    assert framer.feed(b"\n") == ["ping"]
+
+
+def test_line_framer_overflow():
+    framer = LineFramer(max_line=16)
+    assert framer.feed(b"x" * 20) == [None]
+    assert framer.feed(b"y" * 20) == []
+    assert framer.feed(b"zz\nping\n") == ["ping"]
+    assert framer.overflows == 1
+
+
+def test_handle_lines_in_order():
+    state = BridgeState()
+    replies = handle_lines(state, ["enable", "", "duty 0.01", None, "duty 0.02"])
+    assert replies == (
+        ACK_ENABLED + b"ACK DUTY 0.0100\n" + ERR_LINE_TOO_LONG + b"ACK DUTY 0.0200\n"
+    )
@@ -0,0 +1,80 @@
+"""
+test_duty_scheduler.py:
+
+Checks deadline bookkeeping with a fake clock and drift on the real one.
+"""
+
+import time
+
+import pytest
+
+from duty_scheduler import DeadlineScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_deadlines_do_not_drift():
+    clock = FakeClock()
+    sched = DeadlineScheduler(100, clock=clock)
+    sched.start()
+    for _ in range(10):
+        clock.now += sched.delay()
+        sched.mark()
+        clock.now += 0.004  # write time inside the period
+    assert sched.delay() == pytest.approx(0.006)
+    assert sched.overruns == 0
+    assert sched.ticks == 10
+
+
+def test_overrun_skips_missed_deadlines():
+    clock = FakeClock()
+    sched = DeadlineScheduler(1000, clock=clock)
+    sched.start()
+    sched.mark()
+    clock.now += 0.0035  # stalled 3.5 periods
+    late = sched.mark()
+    assert late == pytest.approx(0.0025)
+    assert sched.overruns == 1
+    assert sched.missed == 2
+    assert sched.delay() == pytest.approx(0.0005)
+    stats = sched.stats()
+    assert stats["ticks"] == 2
+    assert sum(stats["histogram"].values()) == 2
+
+
+def test_resync_drops_deadlines_a_stalled_tick_passed():
+    clock = FakeClock()
+    sched = DeadlineScheduler(1000, clock=clock)
+    sched.start()
+    sched.mark()
+    clock.now += 0.0005
+    assert sched.resync() == 0
+    clock.now += 0.003  # stalled inside the tick
+    assert sched.resync() == 2
+    assert sched.missed == 2
+    assert sched.delay() == 0.0
+    assert sched.mark() == pytest.approx(0.0005)
+    assert sched.overruns == 0
+
+
+def test_rate_limits():
+    with pytest.raises(ValueError):
+        DeadlineScheduler(0)
+    with pytest.raises(ValueError):
+        DeadlineScheduler(1001)
+
+
+@pytest.mark.vesc_exclusive
+def test_real_clock_rate():
+    sched = DeadlineScheduler(500)
+    ticks = []
+    end = time.monotonic() + 0.2
+    sched.run(lambda: ticks.append(time.monotonic()), lambda: time.monotonic() < end)
+    # ~100 ticks in 0.2 s, independent of per-tick cost
+    assert 90 <= len(ticks) <= 102
@@ -0,0 +1,107 @@
+"""
+test_frame_decoder.py:
+
+Checks the streaming VESC frame decoder on split, long and corrupted input.
+"""
+
+import os
+import struct
+import tty
+
+import serial
+
+from vesc_crc import crc16
+from vescminimal_nov20 import VescFrameDecoder, build_packet
+
+
+def _long_frame(payload):
+    return (
+        bytes([3])
+        + struct.pack(">H", len(payload))
+        + payload
+        + struct.pack(">H", crc16(payload))
+        + bytes([3])
+    )
+
+
+def _decode(decoder):
+    return [bytes(p) for p in decoder.frames()]
+
+
+def test_byte_at_a_time():
+    stream = build_packet(5, b"\x01\x02\x03\x04") + build_packet(4, b"")
+    decoder = VescFrameDecoder()
+    out = []
+    for b in stream:
+        decoder.feed(bytes([b]))
+        out += _decode(decoder)
+    assert out == [b"\x05\x01\x02\x03\x04", b"\x04"]
+    assert decoder.resyncs == 0
+    assert len(decoder) == 0
+
+
+def test_long_frame_and_raw():
+    payload = os.urandom(600)
+    frame = _long_frame(payload)
+    decoder = VescFrameDecoder()
+    decoder.feed(frame[:100])
+    assert _decode(decoder) == []
+    decoder.feed(frame[100:])
+    assert [bytes(f) for f in decoder.frames(raw=True)] == [frame]
+
+    decoder = VescFrameDecoder()
+    decoder.feed(b"".join(_long_frame(os.urandom(300)) for _ in range(5)))
+    assert len(_decode(decoder)) == 5
+    assert (decoder.resyncs, decoder.bytes_dropped) == (0, 0)
+
+
+def test_resync_after_garbage_and_bad_crc():
+    good = build_packet(5, b"\xaa\xbb")
+    bad = bytearray(build_packet(5, b"\x11\x22"))
+    bad[-2] ^= 0xFF
+    stream = b"\x00\xff\x02" + bytes(bad) + b"\x00" + good + b"\x07\x03\x00" + good
+    decoder = VescFrameDecoder()
+    decoder.feed(stream)
+    assert _decode(decoder) == [b"\x05\xaa\xbb", b"\x05\xaa\xbb"]
+    assert decoder.crc_errors >= 1
+    assert decoder.resyncs == 2
+    stats = decoder.stats()
+    assert stats["frames"] == 2
+    assert stats["bytes_in"] == len(stream)
+
+
+def test_buffer_reuse_over_many_frames():
+    frame = build_packet(5, b"\x00" * 40)
+    decoder = VescFrameDecoder(capacity=256, max_payload=64)
+    count = 0
+    for _ in range(1000):
+        decoder.feed(frame[:17])
+        count += len(_decode(decoder))
+        decoder.feed(frame[17:])
+        count += len(_decode(decoder))
+    assert count == 1000
+    assert decoder.bytes_dropped == 0
+
+
+def test_read_from_serial():
+    master, slave = os.openpty()
+    tty.setraw(master)
+    try:
+        ser = serial.Serial(os.ttyname(slave), timeout=0.5)
+        frame = build_packet(4, b"\x10\x20")
+        os.write(master, b"\x99" + frame)
+        decoder = VescFrameDecoder()
+        while decoder.bytes_in < len(frame) + 1:
+            decoder.read_from(ser, len(frame) + 1 - decoder.bytes_in)
+        assert _decode(decoder) == [b"\x04\x10\x20"]
+        ser.close()
+    finally:
+        os.close(master)
+        os.close(slave)
+
+
+def test_decode_larger_than_capacity():
+    frame = build_packet(5, b"\x01" * 40)
+    decoder = VescFrameDecoder(capacity=256, max_payload=64)
+    assert sum(1 for _ in decoder.decode(frame * 100)) == 100
+    assert decoder.bytes_dropped == 0
@@ -0,0 +1,52 @@
+"""
+test_frame_template.py:
+
+Checks that cached frame templates produce the same bytes as the original
+packet builder and reuse one buffer per command.
+"""
+
+import os
+import struct
+import tty
+
+from vescminimal_nov20 import COMM_SET_DUTY, VESC, FrameTemplate, build_packet
+
+
+def test_template_matches_build_packet():
+    template = FrameTemplate(COMM_SET_DUTY, "f")
+    for duty in (0.0, 0.05, -0.05, 0.123456, 1.0, -1.0):
+        expected = build_packet(COMM_SET_DUTY, struct.pack(">f", duty))
+        assert bytes(template.fill(duty)) == expected
+
+
+def test_template_reuses_buffer():
+    template = FrameTemplate(COMM_SET_DUTY, "f")
+    assert template.fill(0.1) is template.fill(0.2)
+
+
+def test_vesc_writes_template_frames():
+    master, slave = os.openpty()
+    tty.setraw(master)
+    try:
+        vesc = VESC(os.ttyname(slave))
+        template = vesc.frame_template(COMM_SET_DUTY, "f")
+        frame = vesc.set_duty(0.02)
+        assert frame == build_packet(COMM_SET_DUTY, struct.pack(">f", 0.02))
+        # no copy per frame: the next setpoint reuses the buffer
+        assert vesc.set_duty_cycle(0.03) is frame
+        assert vesc.frame_template(COMM_SET_DUTY, "f") is template
+        assert vesc.frame_template(COMM_SET_DUTY, "h").fill(7) == build_packet(
+            COMM_SET_DUTY, struct.pack(">h", 7)
+        )
+
+        expected = build_packet(COMM_SET_DUTY, struct.pack(">f", 0.02)) + build_packet(
+            COMM_SET_DUTY, struct.pack(">f", 0.03)
+        )
+        got = b""
+        while len(got) < len(expected):
+            got += os.read(master, 64)
+        assert got == expected
+        vesc.ser.close()
+    finally:
+        os.close(master)
+        os.close(slave)
@@ -0,0 +1,172 @@
+"""
+test_pytest_vesc.py:
+
+Checks the pytest_vesc plugin and hil_runner: the vesc fixture hands out
+simulators configured by the marker, port locks exclude each other, and
+the runner spreads simulation files over workers while keeping every test
+of a hardware port in one process, and vesc_exclusive only changes when a
+test runs, not what it runs on.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+from pathlib import Path
+
+import pytest
+
+from hil_runner import SERIAL, plan
+from pytest_vesc import HARDWARE, SIM, PortLock, VescResourcePool
+from vesc_simulator import VescSimulator
+from vescminimal_nov20 import VESC
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "vendor"
+HIL_RUNNER = str(VENDOR_DIR / "hil_runner.py")
+
+
+def test_fixture_gives_a_simulator(vesc):
+    assert vesc.kind == SIM
+    client = VESC(vesc.port)
+    try:
+        client.set_duty(0.05)
+        assert vesc.sim.wait_for(lambda s: s.duty == pytest.approx(0.05))
+    finally:
+        client.ser.close()
+
+
+@pytest.mark.vesc_sim(command_timeout=0.05)
+def test_marker_configures_the_simulator(vesc):
+    assert vesc.sim.command_timeout == 0.05
+
+
+def test_hardware_needs_a_port(tmp_path):
+    with pytest.raises(LookupError):
+        VescResourcePool(lock_dir=str(tmp_path)).hardware()
+
+
+def test_port_lock_is_exclusive(tmp_path):
+    first = PortLock("/dev/ttyACM0", str(tmp_path))
+    second = PortLock("/dev/ttyACM0", str(tmp_path))
+    assert first.acquire()
+    assert not second.acquire(blocking=False)
+
+    acquired = threading.Event()
+    waiter = threading.Thread(target=lambda: second.acquire() and acquired.set())
+    waiter.start()
+    assert not acquired.wait(0.1)
+    first.release()
+    assert acquired.wait(2.0)
+    waiter.join()
+    second.release()
+
+
+def test_pool_falls_back_to_waiting_for_a_busy_port(tmp_path):
+    pool = VescResourcePool(["/dev/ttyACM0"], lock_dir=str(tmp_path))
+    held = pool.hardware()
+    threading.Timer(0.1, held.release).start()
+    resource = pool.hardware()
+    try:
+        assert resource.kind == HARDWARE
+        assert resource.wait >= 0.05
+    finally:
+        resource.release()
+
+
+SUITE = {
+    "conftest.py": 'pytest_plugins = ("pytest_vesc",)\n',
+    "test_hw.py": """
+        import pytest
+
+        @pytest.mark.vesc_hardware
+        def test_one(vesc):
+            assert vesc.kind == "hardware"
+
+        @pytest.mark.vesc_hardware
+        def test_two(vesc):
+            assert vesc.kind == "hardware"
+    """,
+    "test_plain.py": """
+        def test_plain():
+            pass
+    """,
+}
+for n in range(4):
+    SUITE[f"test_sim_{n}.py"] = """
+        import time
+        import pytest
+
+        @pytest.mark.vesc_sim
+        def test_sleep(vesc):
+            time.sleep(0.2)
+    """
+
+
+def test_runner_spreads_sim_files_and_serialises_hardware(tmp_path):
+    for name, source in SUITE.items():
+        (tmp_path / name).write_text(textwrap.dedent(source))
+    out = tmp_path / "timings.json"
+    with VescSimulator() as sim:
+        proc = subprocess.run(
+            [sys.executable, HIL_RUNNER, "--workers", "2", "--vesc-port", sim.port]
+            + ["--out", str(out), str(tmp_path)],
+            cwd=str(tmp_path),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            timeout=60,
+        )
+    assert proc.returncode == 0, proc.stdout
+    timings = json.loads(out.read_text())
+    assert len(timings) == 7
+    assert all(t["outcome"] == "passed" for t in timings)
+
+    def workers(kind):
+        return {t["worker"] for t in timings if t["resource"] == kind}
+
+    assert len(workers(SIM)) == 2
+    assert len(workers(HARDWARE)) == 1
+    assert {t["port"] for t in timings if t["resource"] == HARDWARE} == {sim.port}
+
+
+EXCLUSIVE_HARDWARE_TEST = """
+    import pytest
+
+    @pytest.mark.vesc_exclusive
+    @pytest.mark.vesc_hardware
+    def test_timing(vesc):
+        assert vesc.kind == "hardware"
+"""
+
+
+def test_exclusive_hardware_test_gets_its_port(tmp_path):
+    source = textwrap.dedent(EXCLUSIVE_HARDWARE_TEST)
+    (tmp_path / "test_exclusive.py").write_text(source)
+    out = tmp_path / "timings.json"
+    with VescSimulator() as sim:
+        proc = subprocess.run(
+            [sys.executable, "-m", "pytest", "-p", "pytest_vesc", "-q"]
+            + ["--vesc-port", sim.port, "--vesc-timing", str(out), str(tmp_path)],
+            cwd=str(tmp_path),
+            env=dict(os.environ, PYTHONPATH=str(VENDOR_DIR)),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            timeout=60,
+        )
+    assert proc.returncode == 0, proc.stdout
+    [timing] = json.loads(out.read_text())
+    assert (timing["resource"], timing["port"]) == (HARDWARE, sim.port)
+
+    tests = [
+        {"nodeid": "t.py::a", "kind": HARDWARE, "port": None, "exclusive": True},
+        {"nodeid": "t.py::b", "kind": HARDWARE, "port": None, "exclusive": False},
+        {"nodeid": "u.py::c", "kind": SIM, "port": None, "exclusive": True},
+    ]
+    groups = plan(tests, 2, ["/dev/ttyACM0"])
+    assert groups == [
+        ("hw /dev/ttyACM0", ["t.py::b"], ["/dev/ttyACM0"]),
+        (SERIAL, ["t.py::a", "u.py::c"], ["/dev/ttyACM0"]),
+    ]
@@ -0,0 +1,206 @@
+"""
+test_safety_supervisor.py:
+
+Checks the duty sender's safety supervisor: a silent client (whatever
+other clients send) or an overrun serial write (also one made by the
+serial I/O scheduler's writer) trips it, the trip is published under the
+state lock, the duty ramps down instead of stepping, commands after the
+trip take over, and the timing trace keeps the latest cycles.
+"""
+
+import threading
+import time
+
+import pytest
+
+from bridge_client import BridgeClient, BridgeError
+from bridge_protocol import (
+    OP_DUTY,
+    OP_ENABLE,
+    OP_PING,
+    OP_STOP,
+    ST_OK,
+    BridgeState,
+    apply_command,
+)
+from safety_supervisor import SafetySupervisor, TimingTrace, summarize
+from vescminimal_nov20 import SerialIOScheduler
+
+
+def moving_state(duty=0.05):
+    state = BridgeState()
+    apply_command(state, OP_ENABLE)
+    state.publish(True, duty)
+    return state
+
+
+def test_silent_client_trips_and_ramps_down():
+    state = moving_state()
+    supervisor = SafetySupervisor(
+        state, heartbeat_timeout=0.05, ramp_rate=1.0, verbose=False
+    )
+    sent = []
+    assert supervisor.send(sent.append) == 0.05
+
+    time.sleep(0.06)
+    supervisor.send(sent.append)
+    assert supervisor.trips["heartbeat"] == 1
+    assert not state.enabled
+    while supervisor.ramping:
+        time.sleep(0.005)
+        supervisor.send(sent.append)
+    assert sent[-1] == 0.0
+    ramp = sent[1:]
+    assert len(ramp) > 3
+    assert ramp == sorted(ramp, reverse=True)
+
+
+def test_other_sessions_do_not_feed_the_heartbeat():
+    state = BridgeState()
+    driver, monitor = object(), object()
+    apply_command(state, OP_ENABLE, session=driver)
+    apply_command(state, OP_DUTY, 0.05, session=driver)
+    supervisor = SafetySupervisor(
+        state, heartbeat_timeout=0.05, ramp_rate=1.0, verbose=False
+    )
+    for _ in range(8):
+        time.sleep(0.01)
+        # a health check or a second client's keepalive
+        assert apply_command(state, OP_PING, session=monitor)[0] == ST_OK
+        supervisor.send(lambda duty: None)
+    assert supervisor.trips["heartbeat"] == 1
+    assert state.controller is driver
+
+
+def test_commands_after_a_trip_take_over():
+    state = moving_state()
+    supervisor = SafetySupervisor(
+        state, heartbeat_timeout=0.01, ramp_rate=0.01, verbose=False
+    )
+    time.sleep(0.02)
+    supervisor.send(lambda duty: None)
+    assert supervisor.ramping
+    assert supervisor.send(lambda duty: None) > 0.0
+
+    apply_command(state, OP_STOP)
+    assert supervisor.send(lambda duty: None) == 0.0
+    assert not supervisor.ramping
+
+    apply_command(state, OP_ENABLE)
+    state.publish(True, 0.02)
+    assert supervisor.send(lambda duty: None) == 0.02
+
+
+def test_slow_write_trips_once_it_returns():
+    state = moving_state()
+    supervisor = SafetySupervisor(state, write_deadline=0.01, verbose=False)
+    supervisor.send(lambda duty: time.sleep(0.02))
+    assert supervisor.trips["write_deadline"] == 1
+    assert supervisor.ramping
+    # ramp frames on the same slow port do not restart the ramp
+    supervisor.send(lambda duty: time.sleep(0.02))
+    assert supervisor.trips["write_deadline"] == 1
+
+
+class SlowPort:
+    """Serial port whose writes take 30 ms and that never answers"""
+
+    in_waiting = 0
+
+    def write(self, data):
+        time.sleep(0.03)
+        return len(data)
+
+    def readinto(self, buffer):
+        time.sleep(0.01)
+        return 0
+
+
+def test_scheduler_writes_are_timed_against_the_deadline():
+    state = moving_state()
+    supervisor = SafetySupervisor(state, write_deadline=0.01, verbose=False)
+    supervisor.timed_writes = False
+    io = SerialIOScheduler(SlowPort(), linger=0.0, write_monitor=supervisor)
+    try:
+        # handing the duty over is quick; the port write behind it is not
+        supervisor.send(io.set_duty)
+        deadline = time.monotonic() + 1.0
+        while not supervisor.trips["write_deadline"] and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert supervisor.trips["write_deadline"] == 1
+        assert not state.enabled
+        assert supervisor.stats()["write_max_us"] >= 30000
+    finally:
+        io.close()
+
+
+def test_trip_is_published_under_the_state_lock():
+    state = moving_state()
+    supervisor = SafetySupervisor(state, heartbeat_timeout=0.01, verbose=False)
+    time.sleep(0.02)
+    with state.lock:
+        # a command handler is applying a command
+        sender = threading.Thread(target=supervisor.send, args=(lambda d: None,))
+        sender.start()
+        time.sleep(0.05)
+        assert state.enabled
+    sender.join(1.0)
+    assert supervisor.trips["heartbeat"] == 1
+    assert not state.enabled
+
+
+def test_watchdog_aborts_a_blocked_write():
+    state = moving_state()
+    unblock = threading.Event()
+    supervisor = SafetySupervisor(
+        state, write_deadline=0.02, on_stall=unblock.set, verbose=False
+    )
+    sender = threading.Thread(target=supervisor.send, args=(lambda d: unblock.wait(2),))
+    sender.start()
+    assert not supervisor.check()
+    time.sleep(0.05)
+    assert supervisor.check()
+    assert unblock.is_set()
+    sender.join(1.0)
+    assert supervisor.trips == {"heartbeat": 0, "write_deadline": 0, "write_stall": 1}
+    assert supervisor.ramping
+
+
+def test_trace_ring_keeps_the_latest_cycles(tmp_path):
+    trace = TimingTrace(4)
+    for n in range(6):
+        trace.record(float(n), n * 1e-6, 0.0, 2e-6, 0.01, False)
+    rows = trace.rows()
+    assert [row[0] for row in rows] == [2.0, 3.0, 4.0, 5.0]
+    assert rows[0][1] == pytest.approx(2.0)
+
+    path = tmp_path / "trace.csv"
+    assert trace.dump(str(path)) == 4
+    lines = path.read_text().splitlines()
+    assert lines[0] == "t,late_us,lock_us,write_us,duty,tripped"
+    assert len(lines) == 5
+    summary = summarize(rows)
+    assert summary["cycles"] == 4
+    assert summary["late"]["max_us"] == pytest.approx(5.0)
+
+
+def _supervised():
+    state = BridgeState()
+    supervisor = SafetySupervisor(
+        state, heartbeat_timeout=0.1, ramp_rate=0.5, verbose=False
+    )
+    return {"state": state, "supervisor": supervisor}
+
+
+@pytest.mark.parametrize("bridge", [_supervised()], indirect=True)
+def test_bridge_ramps_down_a_hung_client(bridge):
+    with BridgeClient(*bridge) as client:
+        client.enable()
+        client.duty(0.05)
+        time.sleep(0.3)
+        with pytest.raises(BridgeError) as err:
+            client.duty(0.05)
+        assert err.value.reply.error == "NOT_ENABLED"
+        stats = client.stats()["supervisor"]
+    assert stats["trips"]["heartbeat"] == 1
+    assert stats["trace"]["cycles"] > 0
@@ -0,0 +1,158 @@
+"""
+test_serial_io_scheduler.py:
+
+Checks that the serial I/O scheduler coalesces setpoints, pipelines
+GET_VALUES with the duty frame in one write and matches replies to
+requests, drops late replies and skips cancelled requests, and writes the
+last setpoint on close, using a pseudo-terminal as the VESC.
+"""
+
+import os
+import select
+import struct
+import tty
+
+import pytest
+import serial
+
+from vescminimal_nov20 import (
+    COMM_GET_VALUES,
+    COMM_SET_DUTY,
+    SerialIOScheduler,
+    VescFrameDecoder,
+    build_packet,
+)
+
+VALUES_PAYLOAD = bytes([COMM_GET_VALUES]) + bytes(range(60))
+
+
+@pytest.fixture
+def pty_port():
+    master, slave = os.openpty()
+    tty.setraw(master)
+    ser = serial.Serial(os.ttyname(slave), timeout=0.05)
+    yield master, ser
+    ser.close()
+    os.close(master)
+    os.close(slave)
+
+
+def read_frames(master, count):
+    decoder = VescFrameDecoder()
+    frames = []
+    while len(frames) < count:
+        assert select.select([master], [], [], 2.0)[0], "no frame written"
+        frames += [bytes(f) for f in decoder.decode(os.read(master, 4096), raw=True)]
+    return frames
+
+
+def test_setpoints_coalesce_into_one_write(pty_port):
+    master, ser = pty_port
+    io = SerialIOScheduler(ser, linger=0.05)
+    try:
+        for duty in (0.01, 0.02, 0.03):
+            io.set_duty(duty)
+        io.send(COMM_SET_DUTY, struct.pack(">f", 0.0))
+        first = io.request_values()
+        second = io.request_values()
+
+        frames = read_frames(master, 3)
+        assert frames == [
+            build_packet(COMM_SET_DUTY, struct.pack(">f", 0.0)),
+            build_packet(COMM_SET_DUTY, struct.pack(">f", 0.03)),
+            build_packet(COMM_GET_VALUES, b""),
+        ]
+
+        os.write(master, build_packet(COMM_GET_VALUES, VALUES_PAYLOAD[1:]))
+        assert first.result(1.0) == VALUES_PAYLOAD
+        assert second.result(1.0) == VALUES_PAYLOAD
+
+        stats = io.stats()
+        assert stats["writes"] == 1
+        assert stats["frames"] == 3
+        assert stats["coalesced"] == 2
+        assert stats["value_requests"] == 2 and stats["value_replies"] == 1
+    finally:
+        io.close()
+
+
+def test_replies_resolve_in_request_order(pty_port):
+    master, ser = pty_port
+    io = SerialIOScheduler(ser, linger=0.0)
+    try:
+        for i in range(3):
+            future = io.request_values()
+            read_frames(master, 1)
+            os.write(master, build_packet(COMM_GET_VALUES, bytes([i])))
+            assert future.result(1.0) == bytes([COMM_GET_VALUES, i])
+    finally:
+        io.close()
+
+
+def test_unanswered_request_times_out(pty_port):
+    master, ser = pty_port
+    io = SerialIOScheduler(ser, linger=0.0, reply_timeout=0.05)
+    try:
+        with pytest.raises(TimeoutError):
+            io.get_values(timeout=1.0)
+        assert io.stats()["value_timeouts"] == 1
+    finally:
+        io.close()
+
+
+def test_close_fails_outstanding_and_later_requests(pty_port):
+    master, ser = pty_port
+    io = SerialIOScheduler(ser, linger=0.0, reply_timeout=10.0)
+    pending = io.request_values()
+    io.close()
+    with pytest.raises(ConnectionError):
+        pending.result(1.0)
+    late = io.request_values()
+    assert late.done()
+    with pytest.raises(ConnectionError):
+        late.result(0)
+
+
+def test_late_reply_does_not_answer_the_next_request(pty_port):
+    master, ser = pty_port
+    io = SerialIOScheduler(ser, linger=0.0, reply_timeout=0.2)
+    try:
+        first = io.request_values()
+        read_frames(master, 1)
+        with pytest.raises(TimeoutError):
+            first.result(1.0)
+        second = io.request_values()
+        os.write(master, build_packet(COMM_GET_VALUES, bytes([1])))
+        read_frames(master, 1)
+        os.write(master, build_packet(COMM_GET_VALUES, bytes([2])))
+        assert second.result(1.0) == bytes([COMM_GET_VALUES, 2])
+        assert io.stats()["value_stale"] == 1
+    finally:
+        io.close()
+
+
+def test_cancelled_request_is_skipped(pty_port):
+    master, ser = pty_port
+    io = SerialIOScheduler(ser, linger=0.05)
+    try:
+        cancelled = io.request_values()
+        assert cancelled.cancel()
+        for i in range(2):
+            future = io.request_values()
+            read_frames(master, 1)
+            os.write(master, build_packet(COMM_GET_VALUES, bytes([i])))
+            assert future.result(1.0) == bytes([COMM_GET_VALUES, i])
+    finally:
+        io.close()
+
+
+def test_close_writes_the_last_setpoint(pty_port):
+    master, ser = pty_port
+    io = SerialIOScheduler(ser, linger=0.0)
+    io.set_duty(0.5)
+    read_frames(master, 1)
+    io.set_duty(0.0)
+    io.close()
+    assert read_frames(master, 1) == [
+        build_packet(COMM_SET_DUTY, struct.pack(">f", 0.0))
+    ]
@@ -0,0 +1,115 @@
+"""
+test_serial_transport.py:
+
+Unplugs a simulated VESC under a ReconnectingSerial (the port is a symlink,
+re-pointed at a new simulator like a re-enumerated USB device) and checks
+the link comes back by itself, keeps its decoder and reports the
+reconnect latency; after giving up, later calls retry the port and still
+only raise ConnectionError.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from serial_transport import ReconnectingSerial
+from vesc_simulator import VescSimulator
+from vescminimal_nov20 import COMM_GET_VALUES
+
+
+def test_reconnects_after_unplug(tmp_path):
+    link_path = str(tmp_path / "ttyVESC")
+    first = VescSimulator().start()
+    os.symlink(first.port, link_path)
+    link = ReconnectingSerial(link_path, backoff_initial=0.005, backoff_max=0.02)
+    second = None
+    try:
+        assert link.get_values(timeout=1.0)[0] == COMM_GET_VALUES
+        decoder = link.decoder
+
+        # unplug, and re-enumerate 50 ms later
+        os.unlink(link_path)
+        first.close()
+        second = VescSimulator()
+
+        def replug():
+            time.sleep(0.05)
+            second.start()
+            os.symlink(second.port, link_path)
+
+        threading.Thread(target=replug).start()
+        assert link.get_values(timeout=2.0)[0] == COMM_GET_VALUES
+
+        stats = link.stats()
+        assert stats["disconnects"] == 1
+        assert stats["failed_attempts"] >= 1
+        assert 40.0 <= stats["reconnect_last_ms"] < 1000.0
+        assert link.decoder is decoder
+        assert stats["decoder"]["frames"] == 2
+    finally:
+        link.close()
+        if second is not None:
+            second.close()
+
+
+def test_timeouts_keep_the_port_until_the_limit():
+    with VescSimulator(drop_rate=1.0) as sim:
+        link = ReconnectingSerial(sim.port, timeouts_before_reconnect=2)
+        try:
+            start = time.monotonic()
+            with pytest.raises(TimeoutError):
+                link.get_values(timeout=0.05)
+            assert time.monotonic() - start < 0.5
+            assert link.stats()["disconnects"] == 0
+            with pytest.raises(TimeoutError):
+                link.get_values(timeout=0.05)
+            assert link.stats()["disconnects"] == 1
+            assert link.stats()["reconnect_last_ms"] < 100.0
+        finally:
+            link.close()
+
+
+def test_gives_up_after_max_attempts(tmp_path):
+    with pytest.raises(ConnectionError):
+        ReconnectingSerial(
+            str(tmp_path / "missing"), backoff_initial=0.001, max_attempts=3
+        )
+
+
+def test_calls_after_giving_up_retry_the_port(tmp_path):
+    link_path = str(tmp_path / "ttyVESC")
+    first = VescSimulator().start()
+    os.symlink(first.port, link_path)
+    link = ReconnectingSerial(link_path, backoff_initial=0.001, max_attempts=2)
+    second = VescSimulator()
+    try:
+        os.unlink(link_path)
+        first.close()
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                link.get_values(timeout=0.2)
+        assert link.ser is None
+
+        second.start()
+        os.symlink(second.port, link_path)
+        assert link.get_values(timeout=1.0)[0] == COMM_GET_VALUES
+    finally:
+        link.close()
+        second.close()
+
+
+def test_backoff_grows_and_is_capped():
+    with VescSimulator() as sim:
+        link = ReconnectingSerial(
+            sim.port, backoff_initial=0.01, backoff_max=0.05, jitter=0.0
+        )
+        try:
+            assert [link.backoff(n) for n in range(1, 6)] == pytest.approx(
+                [0.01, 0.02, 0.04, 0.05, 0.05]
+            )
+            link.jitter = 1.0
+            assert all(0.0 <= link.backoff(4) <= 0.05 for _ in range(100))
+        finally:
+            link.close()
@@ -0,0 +1,111 @@
+"""
+test_setpoint_mailbox.py:
+
+Checks that the duty sender reads setpoints without ever waiting on command
+handlers, including slow clients that never read their ACKs.
+"""
+
+import socket
+import threading
+import time
+
+import pytest
+
+import vesc_tcp_server
+from bridge_protocol import BridgeState, SetpointMailbox
+from duty_scheduler import DeadlineScheduler
+
+
+class RecordingVesc:
+    """Stands in for VESC: records every duty the sender writes"""
+
+    def __init__(self):
+        self.duties = []
+
+    def set_duty(self, duty):
+        self.duties.append((time.monotonic(), duty))
+
+
+def test_snapshot_is_never_torn():
+    mailbox = SetpointMailbox()
+    stop = threading.Event()
+    torn = []
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            i += 1
+            mailbox.publish(True, (i % 50) / 1000.0)
+            mailbox.publish(False, 0.0)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    end = time.monotonic() + 0.2
+    versions = []
+    while time.monotonic() < end:
+        setpoint = mailbox.read()
+        versions.append(setpoint.version)
+        if not setpoint.enabled and setpoint.duty != 0.0:
+            torn.append(setpoint)
+    stop.set()
+    thread.join()
+    assert not torn
+    assert versions == sorted(versions)
+
+
+def _slow_client(stop):
+    """Pipelines commands but never reads, so the server's sendall blocks"""
+    client, server = socket.socketpair()
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+    worker = threading.Thread(
+        target=vesc_tcp_server.handle_client, args=(server, "slow"), daemon=True
+    )
+    worker.start()
+
+    def spam():
+        client.setblocking(False)
+        while not stop.is_set():
+            try:
+                client.send(b"ping\nduty 0.01\n" * 64)
+            except BlockingIOError:
+                time.sleep(0.001)
+            except OSError:
+                return
+
+    threading.Thread(target=spam, daemon=True).start()
+    return client
+
+
+@pytest.mark.vesc_exclusive
+def test_writer_jitter_with_slow_clients_and_held_lock(monkeypatch):
+    monkeypatch.setattr(vesc_tcp_server, "verbose", False)
+    monkeypatch.setattr(vesc_tcp_server, "state", BridgeState(vesc_tcp_server.MAX_DUTY))
+    monkeypatch.setattr(vesc_tcp_server, "running", True)
+    vesc = RecordingVesc()
+    sched = DeadlineScheduler(200)
+    sender = threading.Thread(
+        target=vesc_tcp_server.duty_sender, args=(vesc, sched), daemon=True
+    )
+
+    stop = threading.Event()
+    clients = [_slow_client(stop) for _ in range(8)]
+    sender.start()
+    try:
+        time.sleep(0.2)
+        # a command handler stuck inside the state lock must not stop frames
+        with vesc_tcp_server.state.lock:
+            held_from = time.monotonic()
+            time.sleep(0.3)
+            held_to = time.monotonic()
+        time.sleep(0.1)
+    finally:
+        vesc_tcp_server.running = False
+        stop.set()
+        sender.join(1.0)
+        for client in clients:
+            client.close()
+
+    during = [t for t, _ in vesc.duties if held_from <= t <= held_to]
+    assert len(during) >= 40  # ~60 expected at 200 Hz
+    stats = sched.stats()
+    assert stats["missed"] <= stats["ticks"] // 10
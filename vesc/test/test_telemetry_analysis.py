@@ -0,0 +1,85 @@
+"""
+test_telemetry_analysis.py:
+
+Checks the vectorised run analysis on a synthetic first-order motor with
+known rise and settling times, recorded through telemetry_recorder.
+"""
+
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from telemetry_analysis import (
+    duty_steps,
+    load,
+    resample,
+    step_responses,
+    step_stats,
+)
+from telemetry_recorder import TelemetryRecorder, export_csv
+
+TAU = 0.1
+RATE = 1000.0
+DUTIES = (0.1, 0.2, 0.3)
+
+
+def _record(path):
+    t = np.arange(len(DUTIES) * int(RATE)) / RATE
+    duty = np.repeat(DUTIES, int(RATE))
+    rpm = np.zeros_like(t)
+    level = 0.0
+    for i, (start, target) in enumerate(zip(range(0, len(t), int(RATE)), DUTIES)):
+        seg = t[start : start + int(RATE)] - t[start]
+        rpm[start : start + int(RATE)] = target * 1e4 + (level - target * 1e4) * np.exp(
+            -seg / TAU
+        )
+        level = rpm[start + int(RATE) - 1]
+    current = 2.0 + 0.5 * np.sin(2 * math.pi * 50 * t)
+    with TelemetryRecorder(path, chunk_rows=700) as rec:
+        for row in zip(t + 1.7e9, duty, rpm, current):
+            rec.append(*row)
+    return t, duty, rpm
+
+
+def test_steps_and_stats(tmp_path):
+    _record(str(tmp_path))
+    tel = load(str(tmp_path))
+    assert len(tel) == 3000
+
+    starts, ends = duty_steps(tel.duty)
+    assert list(starts) == [0, 1000, 2000] and list(ends) == [1000, 2000, 3000]
+
+    stats = step_stats(tel)
+    assert stats["duty"] == pytest.approx(DUTIES)
+    # the last half of each 10 tau step is within 1% of the asymptote
+    assert stats["rpm_steady"] == pytest.approx([1000, 2000, 3000], rel=1e-2)
+    assert stats["current_ripple_pp"] == pytest.approx([1.0] * 3, abs=1e-3)
+    assert stats["current_ripple_std"] == pytest.approx(
+        [0.5 / math.sqrt(2)] * 3, rel=1e-2
+    )
+
+
+def test_step_response_matches_first_order(tmp_path):
+    _record(str(tmp_path))
+    responses = step_responses(load(str(tmp_path)))
+    for response in responses[1:]:
+        assert response["rise_time"] == pytest.approx(TAU * math.log(9), abs=2e-3)
+        assert response["settling_time"] == pytest.approx(TAU * math.log(20), abs=2e-3)
+        assert response["overshoot"] == pytest.approx(0.0, abs=1e-3)
+
+
+def test_resample_and_csv(tmp_path):
+    run = str(tmp_path / "run")
+    t, duty, rpm = _record(run)
+    out = str(tmp_path / "run.csv")
+    export_csv(run, out, iso_time=False)
+    tel = load(out)
+    assert tel.rpm[:10] == pytest.approx(rpm[:10], rel=1e-5)
+
+    grid, held = resample(tel.t, tel.duty, 100.0, hold=True)
+    assert len(grid) == 300
+    assert held[:100] == pytest.approx([0.1] * 100)
+    grid, smooth = resample(tel.t, tel.rpm, 100.0)
+    assert smooth[150] == pytest.approx(np.interp(grid[150], tel.t, tel.rpm))
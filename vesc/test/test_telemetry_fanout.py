@@ -0,0 +1,141 @@
+"""
+test_telemetry_fanout.py:
+
+Checks the telemetry fan-out: drop-oldest queues per subscriber, and
+SUBSCRIBE on both server modes with the simulated VESC behind them, where a
+subscriber that never reads must not hold up the poller or the others.
+"""
+
+import asyncio
+import json
+import socket
+import threading
+
+import vesc_tcp_server
+from bridge_async import AsyncBridgeServer, AsyncSerialTransport
+from bridge_protocol import BridgeSession, BridgeState
+from duty_scheduler import DeadlineScheduler
+from telemetry_fanout import TelemetryBroadcaster, telemetry_poller
+from vesc_simulator import VescSimulator
+from vescminimal_nov20 import VESC
+
+
+def test_slow_subscriber_drops_only_its_own_samples():
+    broadcaster = TelemetryBroadcaster(maxlen=4)
+    fast = broadcaster.subscribe()
+    slow = broadcaster.subscribe()
+    received = []
+    for i in range(100):
+        broadcaster.publish(b"%d\n" % i)
+        received.append(fast.get(timeout=0))
+    assert received == [b"%d\n" % i for i in range(100)]
+    assert fast.dropped == 0
+    assert slow.dropped == 96
+    assert slow.drain() == b"96\n97\n98\n99\n"
+    slow.close()
+    assert broadcaster.stats()["subscribers"] == 1
+    assert broadcaster.stats()["dropped"] == 96
+
+
+def test_subscribe_needs_telemetry():
+    session = BridgeSession(BridgeState())
+    session.feed(b"ping\n")
+    assert session.feed(b"subscribe\n") == b"ERR UNKNOWN_CMD\n"
+
+    session = BridgeSession(BridgeState(), telemetry=TelemetryBroadcaster())
+    replies = session.feed(b"ping\nsubscribe\nenable\nunsubscribe\nstop\n")
+    assert replies == (
+        b"PONG\nACK SUBSCRIBED\nACK ENABLED\nACK UNSUBSCRIBED\nACK STOPPED\n"
+    )
+    assert session.subscription is None
+
+
+def _samples(sockfile, count):
+    samples = []
+    while len(samples) < count:
+        line = sockfile.readline()
+        assert line
+        if line.startswith(b"{"):
+            samples.append(json.loads(line))
+    return samples
+
+
+def test_threaded_fanout_with_a_stalled_subscriber():
+    vesc_tcp_server.verbose = False
+    vesc_tcp_server.state = BridgeState()
+    vesc_tcp_server.telemetry = TelemetryBroadcaster(maxlen=8)
+    running = [True]
+
+    with VescSimulator() as sim:
+        vesc = VESC(sim.port)
+        io = vesc.io_scheduler(linger=0.0)
+        poller = threading.Thread(
+            target=telemetry_poller,
+            args=(
+                io,
+                vesc_tcp_server.telemetry,
+                DeadlineScheduler(500),
+                lambda: running[0],
+            ),
+            daemon=True,
+        )
+        poller.start()
+
+        pairs = [socket.socketpair() for _ in range(2)]
+        for _, server in pairs:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+            threading.Thread(
+                target=vesc_tcp_server.handle_client, args=(server, "t"), daemon=True
+            ).start()
+        (reader, _), (stalled, _) = pairs
+        try:
+            stalled.sendall(b"subscribe\n")
+            reader.sendall(b"subscribe\n")
+            sockfile = reader.makefile("rb")
+            assert sockfile.readline().startswith(b"HELLO")
+            assert sockfile.readline() == b"ACK SUBSCRIBED\n"
+
+            samples = _samples(sockfile, 300)
+            seqs = [s["seq"] for s in samples]
+            assert seqs == list(range(seqs[0], seqs[0] + 300))
+            assert {"duty", "rpm", "current"} <= set(samples[0])
+            assert vesc_tcp_server.telemetry.stats()["dropped"] > 0
+        finally:
+            running[0] = False
+            poller.join(2.0)
+            for client, _ in pairs:
+                client.close()
+            io.close()
+            vesc.ser.close()
+    vesc_tcp_server.telemetry = None
+
+
+def test_async_fanout():
+    async def run(sim):
+        transport = AsyncSerialTransport(sim.port)
+        bridge = AsyncBridgeServer(
+            transport, port=0, send_period=0.01, verbose=False, telemetry_hz=200
+        )
+        await bridge.start()
+        try:
+            streams = [
+                await asyncio.open_connection("127.0.0.1", bridge.port)
+                for _ in range(3)
+            ]
+            for reader, writer in streams:
+                await reader.readline()  # HELLO
+                writer.write(b"subscribe\n")
+                assert await reader.readline() == b"ACK SUBSCRIBED\n"
+
+            for reader, _ in streams[:2]:
+                seqs = [json.loads(await reader.readline())["seq"] for _ in range(20)]
+                assert seqs == list(range(seqs[0], seqs[0] + 20))
+            for _, writer in streams:
+                writer.close()
+            assert bridge.telemetry.stats()["poll_errors"] == 0
+        finally:
+            await bridge.close()
+            transport.close()
+
+    with VescSimulator() as sim:
+        asyncio.run(run(sim))
@@ -0,0 +1,95 @@
+"""
+test_telemetry_recorder.py:
+
+Round-trips rows through the columnar recorder across chunk boundaries,
+reopens a recording with a torn tail or a stray chunk and exports it to CSV.
+"""
+
+import csv
+import os
+
+import pytest
+
+from telemetry_recorder import (
+    COLUMN_NAMES,
+    TelemetryRecorder,
+    TelemetryRun,
+    chunk_file,
+    export_csv,
+)
+
+
+def _rows(count, start=0):
+    return [
+        (1700000000.0 + i * 0.001, i / 1000.0, float(i * 10), i / 100.0, 24.0, i % 3)
+        for i in range(start, start + count)
+    ]
+
+
+def test_round_trip_across_chunks(tmp_path):
+    rows = _rows(2500)
+    with TelemetryRecorder(str(tmp_path), chunk_rows=1000, flush_rows=300) as rec:
+        for row in rows:
+            rec.append(*row)
+        assert len(rec) == 2500
+
+    run = TelemetryRun(str(tmp_path))
+    assert len(run) == 2500
+    assert [c["rows"] for c in run.chunks] == [1000, 1000, 500]
+    assert run.time_range == (rows[0][0], rows[-1][0])
+    assert list(run.column("t")) == [r[0] for r in rows]
+    assert list(run.column("rpm")) == [r[2] for r in rows]
+    got = list(run.rows())
+    assert [g[5] for g in got] == [r[5] for r in rows]
+    assert [g[1] for g in got] == pytest.approx([r[1] for r in rows])
+
+
+def test_reopen_discards_unindexed_tail_and_appends(tmp_path):
+    path = str(tmp_path)
+    with TelemetryRecorder(path, chunk_rows=1000) as rec:
+        for row in _rows(10):
+            rec.append(*row)
+    # a crash after data reached the files but before the index did
+    with open(chunk_file(path, "t", 0), "ab") as f:
+        f.write(b"\x00" * 12)
+
+    with TelemetryRecorder(path) as rec:
+        assert len(rec) == 10
+        rec.append_sample({"t": 2e9, "duty": 0.05, "rpm": 900, "current": 1.5})
+    run = TelemetryRun(path)
+    assert len(run) == 11
+    assert os.path.getsize(chunk_file(path, "t", 0)) == 11 * 8
+    assert list(run.rows())[-1][:3] == (2e9, pytest.approx(0.05), 900.0)
+
+
+def test_reopen_drops_unindexed_chunk_files(tmp_path):
+    path = str(tmp_path)
+    with TelemetryRecorder(path, chunk_rows=10) as rec:
+        for row in _rows(10):
+            rec.append(*row)
+    # a crash after the first bytes of a new chunk reached the files
+    for name in COLUMN_NAMES:
+        with open(chunk_file(path, name, 1), "wb") as f:
+            f.write(b"\xff" * 6)
+
+    with TelemetryRecorder(path) as rec:
+        assert len(rec) == 10
+        rec.append(2e9, 99.0, 900.0, 1.5)
+    run = TelemetryRun(path)
+    assert [c["rows"] for c in run.chunks] == [10, 1]
+    assert list(run.rows())[-1][:3] == (2e9, 99.0, 900.0)
+    assert os.path.getsize(chunk_file(path, "duty", 1)) == 4
+
+
+def test_export_csv(tmp_path):
+    run_dir = str(tmp_path / "run")
+    with TelemetryRecorder(run_dir) as rec:
+        for row in _rows(5):
+            rec.append(*row)
+    out = str(tmp_path / "out.csv")
+    assert export_csv(run_dir, out, iso_time=False) == 5
+    with open(out) as f:
+        records = list(csv.DictReader(f))
+    assert list(records[0]) == ["timestamp"] + list(COLUMN_NAMES[1:])
+    assert float(records[3]["timestamp"]) == _rows(5)[3][0]
+    assert float(records[3]["rpm"]) == 30.0
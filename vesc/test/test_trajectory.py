@@ -0,0 +1,156 @@
+"""
+test_trajectory.py:
+
+Checks the precomputed profiles (shapes, joins, CSV resampling) and that
+play() keeps to the planned grid: a late wakeup or a stalled send skips
+stale setpoints instead of stretching the run, and the last setpoint
+always goes out.
+"""
+
+import time
+import types
+
+import pytest
+
+import duty_scheduler
+from trajectory import PlaybackReport, Trajectory, play, trapezoid
+from vesc_simulator import VescSimulator
+from vescminimal_nov20 import VESC
+
+
+def test_linear_and_s_curve_ramps():
+    ramp = Trajectory.linear(0.0, 0.5, 1.0, rate_hz=10)
+    assert len(ramp) == 11
+    assert ramp.duration == pytest.approx(1.0)
+    assert list(ramp.values) == pytest.approx([0.05 * k for k in range(11)])
+
+    s = Trajectory.s_curve(0.0, 1.0, 1.0, rate_hz=10)
+    assert s[0] == 0.0 and s[-1] == pytest.approx(1.0)
+    assert s[5] == pytest.approx(0.5)
+    # starts and ends flatter than the linear ramp
+    assert s[1] < 0.1 and s[9] > 0.9
+
+
+def test_trapezoid_matches_the_ramp_scripts():
+    steps, delay, peak = 10, 0.2, 0.5
+    ramp = trapezoid(peak, steps * delay, 2.0, 1 / delay)
+    up = [peak * i / steps for i in range(0, steps + 1)]
+    hold = [peak] * 10
+    down = [peak * i / steps for i in reversed(range(steps))]
+    assert list(ramp.values) == pytest.approx(up + hold + down)
+    assert ramp.duration == pytest.approx(6.0)
+    assert ramp.at(3.0) == pytest.approx(peak)
+    assert ramp.at(100.0) == 0.0
+
+
+def test_chaining_and_joining():
+    profile = Trajectory.constant(0.1, 20, duration=0.5).ramp_to(0.3, 0.25)
+    assert len(profile) == 11 + 5
+    other = Trajectory.linear(0.3, 0.0, 0.5, 20)
+    assert len(profile.extend(other)) == 16 + 10
+    with pytest.raises(ValueError):
+        profile.extend(Trajectory.constant(0.0, 50))
+    with pytest.raises(ValueError):
+        Trajectory([], 10)
+
+
+def test_from_csv(tmp_path):
+    timed = tmp_path / "timed.csv"
+    timed.write_text("t,duty\n10.0,0.0\n10.5,0.1\n11.0,0.1\n")
+    profile = Trajectory.from_csv(timed, rate_hz=4)
+    assert list(profile.values) == pytest.approx([0.0, 0.05, 0.1, 0.1, 0.1])
+    stepped = Trajectory.from_csv(timed, rate_hz=4, interpolate=False)
+    assert list(stepped.values) == pytest.approx([0.0, 0.0, 0.1, 0.1, 0.1])
+
+    iso = tmp_path / "telemetry.csv"
+    iso.write_text(
+        "timestamp,duty,rpm\n"
+        "2025-11-20T10:00:00,0.0,0\n2025-11-20T10:00:01,0.2,100\n"
+    )
+    assert Trajectory.from_csv(iso, rate_hz=2)[1] == pytest.approx(0.1)
+
+    bare = tmp_path / "bare.csv"
+    bare.write_text("duty\n0.0\n0.2\n")
+    assert list(Trajectory.from_csv(bare, rate_hz=50).values) == [0.0, 0.2]
+    with pytest.raises(ValueError):
+        Trajectory.from_csv(bare, rate_hz=50, column="current")
+
+
+@pytest.mark.vesc_exclusive
+def test_play_keeps_the_planned_grid():
+    ramp = Trajectory.linear(0.0, 1.0, 0.2, rate_hz=50)
+    sent = []
+    report = play(ramp, sent.append)
+    assert isinstance(report, PlaybackReport)
+    assert sent == list(ramp.values)
+    stats = report.stats()
+    assert stats["completed"] and stats["skipped"] == 0
+    assert stats["actual_s"] == pytest.approx(0.2, abs=0.02)
+    assert abs(stats["drift_ms"]) < 20
+
+
+@pytest.mark.vesc_exclusive
+def test_stalled_send_skips_stale_setpoints():
+    ramp = Trajectory.linear(0.0, 1.0, 0.2, rate_hz=200)
+    sent = []
+
+    def send(duty):
+        sent.append(duty)
+        if len(sent) == 10:
+            time.sleep(0.03)  # six periods
+
+    report = play(ramp, send)
+    assert report.skipped >= 4
+    assert len(sent) + report.skipped == len(ramp)
+    assert sent[-1] == 1.0
+    # the setpoint after the stall is the one due when it ended, not the
+    # next one on the grid
+    resumed = report.indices[10]
+    assert resumed >= 15
+    assert sent[10] == ramp.values[resumed]
+    assert report.lateness[10] < ramp.period
+    # the profile is not stretched by the stall
+    assert report.stats()["actual_s"] == pytest.approx(0.2, abs=0.02)
+
+
+def test_late_wakeup_sends_the_setpoint_due(monkeypatch):
+    ramp = Trajectory.linear(0.0, 1.0, 1.0, rate_hz=10)
+    clock = types.SimpleNamespace(now=0.0)
+    sent = []
+
+    def sleep(seconds):
+        clock.now += seconds
+        if len(sent) == 2:
+            clock.now += 0.25  # woke up 2.5 periods late
+
+    monkeypatch.setattr(duty_scheduler, "time", types.SimpleNamespace(sleep=sleep))
+    report = play(ramp, sent.append, clock=lambda: clock.now)
+    assert list(report.indices[:4]) == [0, 1, 4, 5]
+    assert sent[2] == ramp.values[4]
+    assert report.skipped == 2
+    assert report.lateness[2] == pytest.approx(0.05)
+    assert report.completed and sent[-1] == 1.0
+
+
+def test_stops_when_no_longer_running():
+    ramp = Trajectory.constant(0.1, 100, duration=1.0)
+    sent = []
+    report = play(ramp, sent.append, running=lambda: len(sent) < 5)
+    assert len(sent) == 5
+    assert not report.completed
+
+
+@pytest.mark.vesc_exclusive
+def test_plays_through_serial_to_simulator():
+    with VescSimulator() as sim:
+        vesc = VESC(sim.port)
+        try:
+            ramp = trapezoid(0.05, 0.1, 0.05, rate_hz=100)
+            report = play(ramp, vesc.set_duty)
+            assert report.completed
+            assert sim.wait_for(lambda s: len(s.duty_history) >= len(ramp))
+            duties = [duty for _, duty in sim.duty_history]
+            assert max(duties) == pytest.approx(0.05)
+            assert duties[-1] == 0.0
+        finally:
+            vesc.ser.close()
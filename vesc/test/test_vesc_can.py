@@ -0,0 +1,122 @@
+"""
+test_vesc_can.py:
+
+Drives several simulated VESCs on python-can's virtual bus: setpoints for
+every node go out in each tick, status frames land in the shared table,
+nodes only heard on the bus are never commanded and the frame layouts
+round-trip.
+"""
+
+import itertools
+import time
+
+import pytest
+
+can = pytest.importorskip("can")
+
+from vesc_can import (
+    CAN_PACKET_SET_DUTY,
+    CAN_PACKET_STATUS,
+    CanVescSimulator,
+    VescCanController,
+    can_id,
+    decode_status,
+    encode_status,
+    setpoint_message,
+    split_id,
+)
+
+_channels = itertools.count()
+
+
+@pytest.fixture
+def buses():
+    channel = f"test_vesc_can_{next(_channels)}"
+    controller_bus = can.Bus(interface="virtual", channel=channel)
+    node_bus = can.Bus(interface="virtual", channel=channel)
+    yield controller_bus, node_bus
+    controller_bus.shutdown()
+    node_bus.shutdown()
+
+
+def test_frame_layout():
+    msg = setpoint_message(CAN_PACKET_SET_DUTY, 7, 0.25)
+    assert msg.is_extended_id
+    assert msg.arbitration_id == can_id(CAN_PACKET_SET_DUTY, 7) == 7
+    assert msg.data == (25000).to_bytes(4, "big")
+    assert split_id(can_id(CAN_PACKET_STATUS, 42)) == (CAN_PACKET_STATUS, 42)
+
+    status = encode_status(
+        CAN_PACKET_STATUS, 3, {"erpm": -12000, "current": 4.2, "duty": 0.25}
+    )
+    assert decode_status(CAN_PACKET_STATUS, status.data) == pytest.approx(
+        {"erpm": -12000, "current": 4.2, "duty": 0.25}
+    )
+    assert decode_status(CAN_PACKET_SET_DUTY, msg.data) is None
+    assert decode_status(CAN_PACKET_STATUS, status.data[:5]) is None
+
+
+def test_drives_every_node_and_fills_status_table(buses):
+    controller_bus, node_bus = buses
+    nodes = (1, 2, 3, 10)
+    with CanVescSimulator(node_bus, nodes, status_hz=100) as sim:
+        with VescCanController(controller_bus, nodes, rate_hz=100) as controller:
+            controller.set_duties({node: 0.01 * node for node in nodes})
+            assert sim.wait_for(
+                lambda s: all(
+                    s.models[n].duty == pytest.approx(0.01 * n) for n in nodes
+                )
+            )
+            assert sim.wait_for(
+                lambda s: all(
+                    (controller.status[n].erpm or 0) > 0
+                    and controller.status[n].duty == pytest.approx(0.01 * n, abs=1e-3)
+                    for n in nodes
+                )
+            )
+            snapshot = controller.snapshot()
+            assert set(snapshot) == set(nodes)
+            assert snapshot[10]["v_in"] == pytest.approx(24.0)
+            assert all(s["latency_last"] is not None for s in snapshot.values())
+            # one frame per node per tick, however often the duty changed
+            ticks = controller.scheduler.ticks
+            assert controller.frames_sent <= ticks * len(nodes)
+        # closing zeroes every motor
+        assert sim.wait_for(lambda s: all(m.duty == 0.0 for m in s.models.values()))
+
+
+def test_released_node_times_out(buses):
+    controller_bus, node_bus = buses
+    with CanVescSimulator(node_bus, (1, 2), status_hz=200, command_timeout=0.05) as sim:
+        with VescCanController(controller_bus, (1, 2), rate_hz=100) as controller:
+            controller.set_duties({1: 0.1, 2: 0.1})
+            assert sim.wait_for(lambda s: s.models[2].duty == pytest.approx(0.1))
+            controller.release(2)
+            assert sim.wait_for(lambda s: s.timeouts == 1)
+            assert sim.models[2].duty == 0.0
+            assert sim.models[1].duty == pytest.approx(0.1)
+
+
+def test_heard_node_is_not_commanded(buses):
+    controller_bus, node_bus = buses
+    with CanVescSimulator(node_bus, (1, 2), status_hz=100) as sim:
+        with VescCanController(controller_bus, (1,), rate_hz=100) as controller:
+            assert sim.wait_for(lambda s: 2 in controller.status)
+            assert controller.nodes == (1,)
+            controller.stop_all()
+            controller.set_duties(dict.fromkeys(controller.nodes, 0.2))
+            assert sim.wait_for(lambda s: s.models[1].duty == pytest.approx(0.2))
+            time.sleep(0.05)
+            assert sim.models[2].duty == 0.0
+            assert 2 not in sim.changed_at
+            # a truncated status frame is counted, not raised in the notifier
+            node_bus.send(
+                can.Message(
+                    arbitration_id=can_id(CAN_PACKET_STATUS, 2),
+                    data=b"\x00",
+                    is_extended_id=True,
+                )
+            )
+            assert sim.wait_for(lambda s: controller.unknown_frames >= 1)
+            frames = controller.status[1].frames
+            assert sim.wait_for(lambda s: controller.status[1].frames > frames)
@@ -0,0 +1,60 @@
+"""
+test_vesc_crc.py:
+
+Checks the table-driven CRC16 against the original bit-by-bit loop.
+"""
+
+import os
+import struct
+
+from vesc_crc import Crc16, check_frames, crc16, crc16_bitwise, crc16_many
+
+
+def _frame(payload):
+    return (
+        bytes([2, len(payload)])
+        + payload
+        + struct.pack(">H", crc16_bitwise(payload))
+        + bytes([3])
+    )
+
+
+def test_matches_bitwise():
+    for size in (0, 1, 5, 64, 255, 1024):
+        data = os.urandom(size)
+        assert crc16(data) == crc16_bitwise(data)
+
+
+def test_known_vector():
+    # CRC-16/XMODEM check value
+    assert crc16(b"123456789") == 0x31C3
+
+
+def test_incremental_update():
+    data = os.urandom(300)
+    crc = Crc16()
+    for i in range(0, len(data), 7):
+        crc.update(data[i : i + 7])
+    assert crc.value == crc16(data)
+    assert crc.digest() == struct.pack(">H", crc16(data))
+    assert Crc16(data).value == crc.value
+
+
+def test_bulk():
+    payloads = [os.urandom(n) for n in range(20)]
+    assert crc16_many(payloads) == [crc16_bitwise(p) for p in payloads]
+
+    frames = [_frame(p) for p in payloads[1:]]
+    assert all(check_frames(frames))
+
+    bad = bytearray(frames[3])
+    bad[2] ^= 0xFF
+    long_payload = os.urandom(300)
+    long_frame = (
+        bytes([3])
+        + struct.pack(">H", 300)
+        + long_payload
+        + struct.pack(">H", crc16(long_payload))
+        + bytes([3])
+    )
+    assert check_frames([bytes(bad), b"\x02\x01", long_frame]) == [False, False, True]
@@ -0,0 +1,115 @@
+"""
+test_vesc_simulator.py:
+
+Checks the pty VESC simulator against the real client code: duty frames
+move the motor model (short ones are ignored), GET_VALUES replies decode,
+the link honours the baud limit and injected faults show up as decoder
+errors and timeouts.
+"""
+
+import time
+
+import pytest
+
+from vesc_simulator import MotorModel, VescSimulator
+from vescminimal_nov20 import COMM_SET_DUTY, VESC, decode_values
+
+
+@pytest.fixture
+def sim():
+    with VescSimulator(seed=1) as sim:
+        yield sim
+
+
+def test_duty_frames_drive_the_model(sim):
+    vesc = VESC(sim.port)
+    try:
+        vesc.set_duty(0.05)
+        assert sim.wait_for(lambda s: s.duty == pytest.approx(0.05))
+        assert sim.wait_for(lambda s: s.model.erpm > 100.0)
+        assert sim.duty_history[-1][1] == pytest.approx(0.05)
+    finally:
+        vesc.ser.close()
+
+
+def test_short_duty_frame_is_ignored(sim):
+    vesc = VESC(sim.port)
+    try:
+        vesc.send_packet(COMM_SET_DUTY, b"\x01")
+        vesc.set_duty(0.05)
+        assert sim.wait_for(lambda s: s.duty == pytest.approx(0.05))
+        stats = sim.stats()
+        assert (stats["malformed_commands"], stats["duty_commands"]) == (1, 1)
+    finally:
+        vesc.ser.close()
+
+
+def test_get_values_reply_decodes(sim):
+    vesc = VESC(sim.port)
+    io = vesc.io_scheduler(linger=0.0)
+    try:
+        io.set_duty(0.05)
+        sim.wait_for(lambda s: s.model.erpm > 500.0)
+        values = decode_values(io.get_values(timeout=1.0))
+        assert values["duty_cycle_now"] == pytest.approx(0.05)
+        assert values["rpm"] > 500
+        assert values["v_in"] == pytest.approx(24.0)
+    finally:
+        io.close()
+        vesc.ser.close()
+
+
+def test_command_timeout_stops_the_motor():
+    with VescSimulator(command_timeout=0.05) as sim:
+        vesc = VESC(sim.port)
+        try:
+            vesc.set_duty(0.05)
+            assert sim.wait_for(lambda s: s.duty == pytest.approx(0.05))
+            assert sim.wait_for(lambda s: s.timeouts == 1)
+            assert sim.duty == 0.0
+        finally:
+            vesc.ser.close()
+
+
+def test_baud_limit_paces_the_link():
+    baud = 9600
+    with VescSimulator(baudrate=baud) as sim:
+        vesc = VESC(sim.port)
+        try:
+            start = time.monotonic()
+            for _ in range(20):
+                vesc.set_duty(0.01)  # 9-byte frames
+            assert sim.wait_for(lambda s: s.duty_commands == 20, timeout=2.0)
+            assert time.monotonic() - start >= 20 * 9 * 10 / baud * 0.9
+        finally:
+            vesc.ser.close()
+
+
+def test_injected_faults():
+    with VescSimulator(drop_rate=0.5, corrupt_rate=0.3, noise_rate=0.3, seed=7) as sim:
+        vesc = VESC(sim.port)
+        io = vesc.io_scheduler(linger=0.0, reply_timeout=0.05)
+        try:
+            answered = 0
+            for _ in range(40):
+                try:
+                    io.get_values(timeout=1.0)
+                    answered += 1
+                except TimeoutError:
+                    pass
+            assert 0 < answered < 40
+            assert sim.replies_dropped > 0
+            assert io.decoder.crc_errors + io.decoder.framing_errors > 0
+            assert io.stats()["value_timeouts"] == 40 - answered
+        finally:
+            io.close()
+            vesc.ser.close()
+
+
+def test_motor_model_settles_to_duty_times_kv():
+    model = MotorModel(v_in=20.0, kv_erpm=1000.0, tau=0.1)
+    model.duty = 0.5
+    for _ in range(1000):
+        model.step(0.001)
+    assert model.erpm == pytest.approx(10000.0, rel=1e-3)
+    assert abs(model.motor_current) < 0.1
@@ -0,0 +1,51 @@
+"""
+test_vesc_tcp_server.py:
+
+Drives the threaded handle_client over a socket pair with pipelined and
+arbitrarily split commands.
+"""
+
+import socket
+import threading
+
+import vesc_tcp_server
+from bridge_protocol import HELLO, BridgeState
+
+
+def _read_lines(sock, count):
+    data = b""
+    while data.count(b"\n") < count:
+        chunk = sock.recv(65536)
+        assert chunk
+        data += chunk
+    return data.split(b"\n")[:count]
+
+
+def test_pipelined_commands_ack_in_order(monkeypatch):
+    monkeypatch.setattr(vesc_tcp_server, "verbose", False)
+    monkeypatch.setattr(vesc_tcp_server, "state", BridgeState(vesc_tcp_server.MAX_DUTY))
+    client, server = socket.socketpair()
+    worker = threading.Thread(
+        target=vesc_tcp_server.handle_client, args=(server, "test"), daemon=True
+    )
+    worker.start()
+    try:
+        assert _read_lines(client, 1) == [HELLO.strip()]
+
+        duties = [f"duty {i / 10000.0:.4f}\n" for i in range(300)]
+        stream = ("enable\n" + "".join(duties) + "stop\n").encode()
+        # split at awkward points, mid-line and mid-number
+        for i in range(0, len(stream), 7):
+            client.sendall(stream[i : i + 7])
+
+        lines = _read_lines(client, 302)
+        assert lines[0] == b"ACK ENABLED"
+        expected = [
+            f"ACK DUTY {min(i / 10000.0, 0.05):.4f}".encode() for i in range(300)
+        ]
+        assert lines[1:301] == expected
+        assert lines[301] == b"ACK STOPPED"
+        assert not vesc_tcp_server.state.enabled
+    finally:
+        client.close()
+        worker.join(2.0)
@@ -7,21 +7,51 @@ Safety rules enforced:
 - STOP always forces duty = 0 immediately
 - duty ignored unless enabled
 - duty clamped to ±0.05
+
+Modes:
+- threaded (default): one thread per client + duty_sender thread
+- asyncio:            one event loop for all clients and the duty sender
+
+With --telemetry-hz, one GET_VALUES poller feeds every client that sends
+SUBSCRIBE (JSON sample lines, bounded drop-oldest queue per client).
+
+A safety supervisor (safety_supervisor.py) ramps the motor down when no
+command arrives for --heartbeat-timeout or a serial write overruns
+--write-deadline; clients holding a duty keep it alive with PING. The
+sender's per-cycle timing trace is written to --trace-file on SIGUSR1 and
+at shutdown.
 """
 
+import argparse
+import asyncio
+import signal
 import sys
 import socket
 import threading
-import time
 from pathlib import Path
 
 # -------------------------------------------------
 # Vendored VESC module (NO pyvesc dependency)
 # -------------------------------------------------
-VENDOR_DIR = Path(__file__).parent / "vendor"
+VENDOR_DIR = Path(__file__).parent / "vesc" / "vendor"
 sys.path.insert(0, str(VENDOR_DIR))
 
-from vescminimal_nov20 import VESC
+from bridge_protocol import (
+    HELLO,
+    MAX_DUTY,
+    SEND_PERIOD,
+    BridgeSession,
+    BridgeState,
+    log_command,
+)
+from duty_scheduler import MAX_RATE_HZ, DeadlineScheduler
+from safety_supervisor import (
+    HEARTBEAT_TIMEOUT,
+    RAMP_RATE,
+    WRITE_DEADLINE,
+    SafetySupervisor,
+)
+from telemetry_fanout import TelemetryBroadcaster, telemetry_poller
 
 # -------------------------------------------------
 # Configuration
@@ -29,137 +59,282 @@ from vescminimal_nov20 import VESC
 HOST = "127.0.0.1"
 PORT = 12345
 SERIAL_PORT = "/dev/ttyACM0"
-
-MAX_DUTY = 0.05          # HARD SAFETY LIMIT
-SEND_PERIOD = 0.05      # 20 Hz
+RECV_SIZE = 65536
+TRACE_FILE = "/tmp/vesc_duty_trace.csv"
 
 # -------------------------------------------------
-# Global state (guarded by lock)
+# Global state (commands under state.lock, sender reads the mailbox)
 # -------------------------------------------------
-enabled = False
-last_duty = 0.0
-state_lock = threading.Lock()
+state = BridgeState(MAX_DUTY)
 running = True
-
-# -------------------------------------------------
-# Open VESC (NO MOTION HERE)
-# -------------------------------------------------
-vesc = VESC(SERIAL_PORT)
-print("✅ VESC opened (SAFE MODE, duty locked at 0.0)")
+verbose = True
+telemetry = None  # TelemetryBroadcaster while the poller runs
+supervisor = None  # SafetySupervisor wrapping the duty sender's writes
 
 # -------------------------------------------------
 # Async duty sender (HARD SAFETY LOOP)
 # -------------------------------------------------
-def duty_sender():
-    global last_duty, enabled
-
-    while running:
-        with state_lock:
-            if enabled:
-                duty = max(-MAX_DUTY, min(MAX_DUTY, last_duty))
-            else:
-                duty = 0.0
-
+def duty_sender(vesc, scheduler):
+    def send_once():
         try:
-            vesc.set_duty(duty)
+            if supervisor is not None:
+                supervisor.send(vesc.set_duty, scheduler.late)
+            else:
+                # lock-free snapshot: a stalled command handler never
+                # delays a frame
+                vesc.set_duty(state.output_duty())
         except Exception as e:
             print("❌ VESC send error:", e)
 
-        time.sleep(SEND_PERIOD)
-
-threading.Thread(target=duty_sender, daemon=True).start()
+    # absolute monotonic deadlines: write time never drifts the period
+    scheduler.run(send_once, lambda: running)
 
 # -------------------------------------------------
-# TCP Server
+# Client handler
 # -------------------------------------------------
-server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-server.bind((HOST, PORT))
-server.listen()
+def push_telemetry(conn, subscription, send_lock):
+    # a slow client blocks only this thread; its queue drops oldest samples
+    try:
+        while True:
+            sample = subscription.get(timeout=0.5)
+            if sample is None:
+                if subscription.closed:
+                    return
+                continue
+            with send_lock:
+                conn.sendall(sample + subscription.drain())
+    except OSError:
+        pass
 
-print(f"🚀 VESC TCP server listening on {HOST}:{PORT}")
 
-# -------------------------------------------------
-# Client handler
-# -------------------------------------------------
 def handle_client(conn, addr):
-    global enabled, last_duty
-
     print(f"✅ Client connected: {addr}")
-    conn.sendall(b"HELLO VESC SAFE MODE\n")
+    conn.sendall(HELLO)
+
+    session = BridgeSession(
+        state, state.lock, log_command if verbose else None, telemetry
+    )
+    send_lock = threading.Lock()
+    pushing = None
 
     try:
         while True:
-            data = conn.recv(1024)
+            data = conn.recv(RECV_SIZE)
             if not data:
                 break
 
-            line = data.decode(errors="ignore").strip()
-            if not line:
-                continue
+            # one recv may carry many pipelined commands, or part of one;
+            # replies for the whole batch come back in order
+            replies = session.feed(data)
+            if replies:
+                with send_lock:
+                    conn.sendall(replies)
+
+            if session.subscription is not pushing:
+                pushing = session.subscription
+                if pushing is not None:
+                    threading.Thread(
+                        target=push_telemetry,
+                        args=(conn, pushing, send_lock),
+                        daemon=True
+                    ).start()
+
+    except Exception as e:
+        print("⚠️ Client error:", e)
 
-            print("⬅️  CMD:", line)
-            parts = line.split(maxsplit=1)
-            cmd = parts[0].lower()
+    finally:
+        session.close()
+        print(f"🔌 Client disconnected: {addr}")
+        conn.close()
 
-            with state_lock:
+# -------------------------------------------------
+# Threaded server
+# -------------------------------------------------
+def serve_threaded(host, port, serial_port, scheduler, telemetry_hz=0.0):
+    global running, telemetry
 
-                if cmd == "enable":
-                    enabled = True
-                    conn.sendall(b"ACK ENABLED\n")
+    from vescminimal_nov20 import VESC
 
-                elif cmd == "disable":
-                    enabled = False
-                    last_duty = 0.0
-                    conn.sendall(b"ACK DISABLED\n")
+    # Open VESC (NO MOTION HERE)
+    vesc = VESC(serial_port)
+    print("✅ VESC opened (SAFE MODE, duty locked at 0.0)")
 
-                elif cmd == "stop":
-                    enabled = False
-                    last_duty = 0.0
-                    conn.sendall(b"ACK STOPPED\n")
+    if supervisor is not None:
+        # a duty frame stuck in a blocking write is aborted by the watchdog
+        supervisor.on_stall = vesc.ser.cancel_write
+        state.stats_sources["supervisor"] = supervisor.stats
+        threading.Thread(
+            target=supervisor.watch, args=(lambda: running,), daemon=True
+        ).start()
 
-                elif cmd == "duty":
-                    if not enabled:
-                        conn.sendall(b"ERR NOT_ENABLED\n")
-                        continue
+    if telemetry_hz:
+        # the I/O scheduler owns the port: duty frames and GET_VALUES
+        # requests share its writes, replies come back on its reader
+        vesc = vesc.io_scheduler()
+        if supervisor is not None:
+            # set_duty only hands the duty over: the scheduler's writer
+            # reports the port writes to time against the deadline
+            supervisor.timed_writes = False
+            vesc.write_monitor = supervisor
+        telemetry = TelemetryBroadcaster()
+        state.stats_sources["telemetry"] = telemetry.stats
+        threading.Thread(
+            target=telemetry_poller,
+            args=(vesc, telemetry, DeadlineScheduler(telemetry_hz), lambda: running),
+            daemon=True
+        ).start()
 
-                    try:
-                        val = float(parts[1])
-                    except Exception:
-                        conn.sendall(b"ERR BAD_VALUE\n")
-                        continue
+    state.stats_sources["sender"] = scheduler.stats
+    threading.Thread(
+        target=duty_sender, args=(vesc, scheduler), daemon=True
+    ).start()
 
-                    last_duty = max(-MAX_DUTY, min(MAX_DUTY, val))
-                    conn.sendall(
-                        f"ACK DUTY {last_duty:.4f}\n".encode()
-                    )
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind((host, port))
+    server.listen()
 
-                elif cmd == "ping":
-                    conn.sendall(b"PONG\n")
+    print(f"🚀 VESC TCP server listening on {host}:{port}")
 
-                else:
-                    conn.sendall(b"ERR UNKNOWN_CMD\n")
+    try:
+        while True:
+            conn, addr = server.accept()
+            threading.Thread(
+                target=handle_client,
+                args=(conn, addr),
+                daemon=True
+            ).start()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down safely...")
+    finally:
+        running = False
+        server.close()
+        print("📊 Duty sender:", scheduler.stats())
 
-    except Exception as e:
-        print("⚠️ Client error:", e)
+# -------------------------------------------------
+# Asyncio server
+# -------------------------------------------------
+async def _serve_asyncio(host, port, serial_port, scheduler, telemetry_hz=0.0):
+    from bridge_async import AsyncBridgeServer, AsyncSerialTransport
+
+    # Open VESC (NO MOTION HERE)
+    transport = AsyncSerialTransport(serial_port)
+    print("✅ VESC opened (SAFE MODE, duty locked at 0.0)")
+
+    bridge = AsyncBridgeServer(
+        transport,
+        host,
+        port,
+        state=state,
+        verbose=verbose,
+        scheduler=scheduler,
+        telemetry_hz=telemetry_hz,
+        supervisor=supervisor,
+    )
+    await bridge.start()
+    print(f"🚀 VESC TCP server (asyncio) listening on {host}:{bridge.port}")
 
+    try:
+        await bridge.serve_forever()
     finally:
-        print(f"🔌 Client disconnected: {addr}")
-        conn.close()
+        await bridge.close()
+        transport.close()
+        print("📊 Duty sender:", scheduler.stats())
+
+
+def serve_asyncio(host, port, serial_port, scheduler, telemetry_hz=0.0):
+    try:
+        asyncio.run(_serve_asyncio(host, port, serial_port, scheduler, telemetry_hz))
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down safely...")
 
 # -------------------------------------------------
-# Accept loop
+# Main
 # -------------------------------------------------
-try:
-    while True:
-        conn, addr = server.accept()
-        threading.Thread(
-            target=handle_client,
-            args=(conn, addr),
-            daemon=True
-        ).start()
-except KeyboardInterrupt:
-    print("\n🛑 Shutting down safely...")
-finally:
-    running = False
-    server.close()
+def dump_trace(path):
+    if supervisor is not None:
+        count = supervisor.trace.dump(path)
+        print(f"📝 Duty sender trace: {count} cycles written to {path}")
+
+
+def main():
+    global verbose, supervisor
+
+    parser = argparse.ArgumentParser(description="Stage 9 VESC TCP server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--serial-port", default=SERIAL_PORT)
+    parser.add_argument("--mode", choices=("threaded", "asyncio"), default="threaded")
+    parser.add_argument("--quiet", action="store_true", help="do not echo every command")
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=1.0 / SEND_PERIOD,
+        help=f"duty frames per second (max {MAX_RATE_HZ:g})",
+    )
+    parser.add_argument(
+        "--spin-us",
+        type=float,
+        default=0.0,
+        help="busy-wait this long before each deadline for tighter jitter",
+    )
+    parser.add_argument(
+        "--telemetry-hz",
+        type=float,
+        default=0.0,
+        help="poll GET_VALUES this often for SUBSCRIBE clients (0 = off)",
+    )
+    parser.add_argument(
+        "--heartbeat-timeout",
+        type=float,
+        default=HEARTBEAT_TIMEOUT,
+        help="ramp down when no command arrives this long while moving (0 = off)",
+    )
+    parser.add_argument(
+        "--write-deadline",
+        type=float,
+        default=WRITE_DEADLINE,
+        help="ramp down when a duty frame write takes longer (seconds)",
+    )
+    parser.add_argument(
+        "--ramp-rate",
+        type=float,
+        default=RAMP_RATE,
+        help="duty per second the motor is ramped down at after a trip",
+    )
+    parser.add_argument(
+        "--trace-file",
+        default=TRACE_FILE,
+        help="duty sender timing trace, written on SIGUSR1 and at exit",
+    )
+    args = parser.parse_args()
+
+    try:
+        scheduler = DeadlineScheduler(args.rate, spin=args.spin_us * 1e-6)
+        if args.telemetry_hz:
+            DeadlineScheduler(args.telemetry_hz)
+    except ValueError as e:
+        parser.error(str(e))
+
+    verbose = not args.quiet
+    supervisor = SafetySupervisor(
+        state,
+        heartbeat_timeout=args.heartbeat_timeout,
+        write_deadline=args.write_deadline,
+        ramp_rate=args.ramp_rate,
+    )
+    signal.signal(signal.SIGUSR1, lambda *_: dump_trace(args.trace_file))
+    try:
+        if args.mode == "asyncio":
+            serve_asyncio(
+                args.host, args.port, args.serial_port, scheduler, args.telemetry_hz
+            )
+        else:
+            serve_threaded(
+                args.host, args.port, args.serial_port, scheduler, args.telemetry_hz
+            )
+    finally:
+        dump_trace(args.trace_file)
+
+if __name__ == "__main__":
+    main()